@@ -6,6 +6,8 @@
 # You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
 """Top-level package for *polyvers* version-configuration tool."""
 
+import sys
+
 from polyversion import polyversion, polytime  # @UnresolvedImport
 from .utils import logconfutils as lcu
 
@@ -14,8 +16,32 @@ __all__ = ['polyversion', 'polytime']
 
 APPNAME = __name__.split('.')[0]
 
-__version__ = polyversion(default_version='0.0.0')
-__updated__ = polytime(no_raise=True)
+
+#: Engraved with static values on releases, else computed lazily by :func:`__getattr__()`.
+__version__ = None
+__updated__ = None
+
+
+def __getattr__(name):
+    """Compute version-attributes on first access, not on import (:pep:`562`)."""
+    if name == '__version__':
+        value = polyversion(default_version='0.0.0')
+    elif name == '__updated__':
+        value = polytime(no_raise=True)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+
+    return value
+
+
+for _name in ('__version__', '__updated__'):
+    if globals()[_name] is None:  # not engraved
+        del globals()[_name]
+        if sys.version_info < (3, 7):  # no module `__getattr__()`
+            __getattr__(_name)
+del _name
+
 __title__ = APPNAME
 __summary__ = "Bump independently versions on multi-project git repos"
 __uri__ = "https://github.com/ankostis/polyvers"
@@ -13,7 +13,7 @@ from boltons.setutils import IndexedSet as iset
 
 import polyversion as pvlib
 
-from . import NOTICE, pvtags, pvproject, cli
+from . import NOTICE, engrave, pvtags, pvproject, cli
 from ._vendor.traitlets.traitlets import Bool, Unicode
 from .cmdlet import cmdlets
 from .utils import fileutil as fu
@@ -89,7 +89,8 @@ class BumpCmd(cli._SubCmd):
        - see PEP440 for the grammar of <pre>, <post>, <dev>, <local>
     """
 
-    classes = [pvproject.Project, pvproject.Engrave, pvproject.Graft]  # type: ignore
+    classes = [pvproject.Project, pvproject.Engrave, pvproject.Graft,  # type: ignore
+               engrave.FileProcessor]
 
     amend = Bool(
         config=True,
@@ -127,6 +128,19 @@ class BumpCmd(cli._SubCmd):
             the version-ids.
     """)
 
+    off_worktree_releases = Bool(
+        config=True,
+        help="""
+        Build *out-of-trunk* release-commits without checking them out.
+
+        - The engraved files are committed with git plumbing commands on
+          a temporary index, and the `release_branch` is moved with `update-ref`,
+          so the working-tree and HEAD are never touched.
+        - No git hooks run for the release-commits.
+        - Ignored if the `release_branch` is the one currently checked out.
+        """
+    )
+
     release_branch = Unicode(
         'latest',
         config=True,
@@ -247,6 +261,47 @@ class BumpCmd(cli._SubCmd):
         if self.dry_run:
             self.log.warning('PRETEND commit: %s' % out)
 
+    def _tag_projects(self, projects: Sequence[pvproject.Project], msg,
+                      is_release=False):
+        ## All tags in one ref-transaction: either all projects get tagged, or none.
+        pvtags.tag_projects_commit(projects, msg,
+                                   is_release=is_release, amend=self.amend,
+                                   sign_tag=self.sign_tags,
+                                   sign_user=self.sign_user,
+                                   dry_run=self.dry_run)
+
+    def _bump_off_worktree(self, bump_projects: Sequence[pvproject.Project],
+                           fproc, git_root):
+        """Engrave in memory & commit with git plumbing, leaving work-tree & HEAD intact."""
+        with fu.chdir(git_root):
+            fproc.engrave_matches(write_files=False)
+            files = {f.relative_to(git_root).as_posix(): fbytes
+                     for f, fbytes in fproc.engraved_files().items()}
+
+            with pvtags.git_restore_point(heads=True, tags=True,
+                                          restore_worktree=False):
+                msg = self._make_commit_message(*bump_projects, is_release=False)
+                self._tag_projects(bump_projects, msg, is_release=False)
+
+                msg = self._make_commit_message(*bump_projects, is_release=True)
+                commit_id = pvtags.commit_files_off_worktree(
+                    files, msg,
+                    sign=self.sign_commmits, sign_user=self.sign_user)
+                if self.dry_run:
+                    self.log.warning('PRETEND commit: %s' % commit_id)
+
+                ## The branch moves along with the *rtags*, in one ref-transaction.
+                branch_cmds = ([pvtags.ref_update_cmd(
+                    'refs/heads/%s' % self.release_branch, commit_id)]
+                    if self.release_branch else [])
+                pvtags.tag_projects_commit(bump_projects, msg,
+                                           rev=commit_id,
+                                           is_release=True, amend=self.amend,
+                                           sign_tag=self.sign_tags,
+                                           sign_user=self.sign_user,
+                                           dry_run=self.dry_run,
+                                           extra_ref_cmds=branch_cmds)
+
     def _prepare_project_for_bump(self, prj: pvproject.Project,
                                   version_bump: Optional[str],
                                   is_to_bump: bool):
@@ -295,8 +350,6 @@ class BumpCmd(cli._SubCmd):
                 enfiles_desc)
 
     def run(self, *version_and_pnames):
-        from . import engrave
-
         projects = self.bootstrapp_projects()
         if version_and_pnames:
             if self.amend:
@@ -346,18 +399,25 @@ class BumpCmd(cli._SubCmd):
         #  (but only after havin run some validation to run, above).
         self._stop_if_git_dirty()
 
+        if self.out_of_trunk_releases and self.off_worktree_releases:
+            if (self.release_branch and
+                    self.release_branch == pvtags._git_current_branch()):
+                self.log.warning(
+                    "Release-branch '%s' is checked out, cannot release off-worktree.",
+                    self.release_branch)
+            else:
+                self._bump_off_worktree(bump_projects, fproc, git_root)
+                self._log_action_completed(bump_projects, fproc)
+                return
+
         with pvtags.git_restore_point(restore_head=self.dry_run):
             with fu.chdir(git_root):
                 fproc.engrave_matches()
 
             ## TODO: move all git-cmds to pvtags?
             if self.out_of_trunk_releases:
-                for proj in bump_projects:
-                    msg = self._make_commit_message(*bump_projects, is_release=False)
-                    proj.tag_version_commit(
-                        msg, is_release=False, amend=self.amend,
-                        sign_tag=self.sign_tags,
-                        sign_user=self.sign_user)
+                msg = self._make_commit_message(*bump_projects, is_release=False)
+                self._tag_projects(bump_projects, msg, is_release=False)
 
                 with pvtags.git_restore_point(restore_head=True,
                                               heads=False, tags=False):
@@ -369,24 +429,13 @@ class BumpCmd(cli._SubCmd):
                     msg = self._make_commit_message(*bump_projects, is_release=True)
                     self._commit_new_release(msg, bump_projects)
 
-                    for proj in bump_projects:
-                        msg = self._make_commit_message(*bump_projects, is_release=True)
-                        proj.tag_version_commit(
-                            msg, is_release=True, amend=self.amend,
-                            sign_tag=self.sign_tags,
-                            sign_user=self.sign_user)
+                    self._tag_projects(bump_projects, msg, is_release=True)
 
             else:  # In-trunk plain *vtags* for mono-project repos.
                 msg = self._make_commit_message(*bump_projects, is_release=False)
                 self._commit_new_release(msg, bump_projects)
 
-                for proj in bump_projects:
-                    proj.tag_version_commit(
-                        self,
-                        msg, is_release=False,
-                        amend=self.amend,
-                        sign_tag=self.sign_tags,
-                        sign_user=self.sign_user)
+                self._tag_projects(bump_projects, msg, is_release=False)
 
         self._log_action_completed(bump_projects, fproc)
 
@@ -413,6 +462,10 @@ BumpCmd.flags = {  # type: ignore
         {'BumpCmd': {'engrave_only': True}},
         BumpCmd.engrave_only.help
     ),
+    'off-worktree': (
+        {'BumpCmd': {'off_worktree_releases': True}},
+        BumpCmd.off_worktree_releases.help
+    ),
     ('t', 'tag'): (
         {'Project': {'tag': True}},
         pvproject.Project.tag.help
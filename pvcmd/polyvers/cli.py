@@ -19,7 +19,7 @@ import os.path as osp
 import polyversion as pvlib
 import textwrap as tw
 
-from . import APPNAME, __version__, __updated__, pvtags, pvproject
+from . import APPNAME, engrave, pvtags, pvproject, vermath
 from ._vendor import traitlets as trt
 from ._vendor.traitlets import config as trc
 from ._vendor.traitlets.traitlets import (
@@ -64,7 +64,6 @@ class PolyversCmd(cmdlets.Cmd, yu.YAMLable):
     SYNTAX:
       {cmd_chain} <sub-cmd> ...
     """
-    version = __version__  # type: ignore  # mypy complains with engraved value??g.
     examples = Unicode("""
         - Let it guess the configurations for your monorepo::
               {cmd_chain} init
@@ -77,12 +76,18 @@ class PolyversCmd(cmdlets.Cmd, yu.YAMLable):
               {cmd_chain} bump 0.0.1.dev0 -c '1st commit, untagged'
               {cmd_chain} bump -t 'Mostly model changes, tagged'
     """)
-    classes = [pvproject.Project]
+    classes = [pvproject.Project, engrave.FileProcessor]
 
     projects = ListTrait(
         autotrait.AutoInstance(pvproject.Project),
         config=True)
 
+    @trt.default('version')
+    def _version(self):
+        from . import __version__
+
+        return __version__
+
     @trt.default('subcommands')
     def _subcommands(self):
         subcmds = OrderedDict()
@@ -97,6 +102,8 @@ class PolyversCmd(cmdlets.Cmd, yu.YAMLable):
 
     def collect_app_infos(self):
         """Provide extra infos to `config infos` subcommand."""
+        from . import __version__, __updated__
+
         return {
             'version': __version__,
             'updated': __updated__,
@@ -110,6 +117,7 @@ class PolyversCmd(cmdlets.Cmd, yu.YAMLable):
                 pvproject.Project,
                 InitCmd, StatusCmd, bumpcmd.BumpCmd, LogconfCmd,
                 pvproject.Engrave, pvproject.Graft,
+                engrave.FileProcessor,
                 ]
 
     @trt.default('config_paths')
@@ -244,8 +252,6 @@ class PolyversCmd(cmdlets.Cmd, yu.YAMLable):
         :return:
             a mapping of {pnames: basepaths}
         """
-        from . import engrave
-
         if not self.autodiscover_subproject_projects:
             raise cmdlets.CmdException(
                 "No `Polyvers.autodiscover_subproject_projects` param given!")
@@ -500,11 +506,13 @@ _status_all_help = """
 """
 
 
-def _git_desc_without_screams(proj):
-    try:
-        return proj.git_describe()
-    except pvtags.GitVoidError as _:
-        return None
+_status_versions_help = """
+    Report only version-tags within `[<low>]..[<high>]` (or below `<high>`), by version.
+
+    - Without `--all`, report the latest tag in range for each project,
+      instead of `git describe`.
+    - The <low> bound is inclusive, the <high> is exclusive.
+"""
 
 
 class StatusCmd(_SubCmd):
@@ -518,19 +526,47 @@ class StatusCmd(_SubCmd):
         config=True,
         help=_status_all_help)
 
+    versions = Unicode(
+        config=True,
+        help=_status_versions_help)
+
     flags = {('a', 'all'): ({'StatusCmd': {'all': True}}, _status_all_help)}  # type: ignore
+    aliases = {'versions': 'StatusCmd.versions'}  # type: ignore
+
+    def _history_in_range(self, proj) -> List[str]:
+        "Tags of `proj` within :attr:`versions` range, latest version first."
+        low, high = vermath.parse_version_range(self.versions)
+        return [t for _v, t in reversed(proj.version_history.in_range(low, high))]
+
+    def _git_describe_all(self, projects) -> List[Optional[str]]:
+        """
+        Describe all `projects` walking history once, `None` for those not yet tagged.
+        """
+        pvtags_or_errors = pvtags.describe_projects(*projects)
+        for res in pvtags_or_errors:
+            if isinstance(res, Exception) and not isinstance(res, pvtags.GitVoidError):
+                raise res
+
+        return [None if isinstance(res, Exception) else res
+                for res in pvtags_or_errors]
 
     def _describe_projects(self, projects):
-        return [_git_desc_without_screams(p) or p.pname
-                for p in projects]
+        if self.versions:
+            return [(self._history_in_range(p) or [p.pname])[0]
+                    for p in projects]
+
+        return [gitver or p.pname
+                for p, gitver in zip(projects, self._git_describe_all(projects))]
 
     def _fetch_all(self, projects):
         ## TODO: YAMLable Project (apart from Printable) with metadata Print/header
         return [{'pname': p.pname,
                  'basepath': str(p.basepath),
-                 'gitver': _git_desc_without_screams(p),
-                 'history': p.pvtags_history}
-                for p in projects]
+                 'gitver': gitver,
+                 'history': (self._history_in_range(p)
+                             if self.versions else
+                             p.pvtags_history)}
+                for p, gitver in zip(projects, self._git_describe_all(projects))]
 
     def run(self, *pnames):
         projects = self.bootstrapp_projects()
@@ -597,6 +633,11 @@ PolyversCmd.flags = {  # type: ignore
         cmdlets.Spec.debug.help
     ),
 
+    'merge-grafts': (
+        {'FileProcessor': {'merge_grafts': True}},
+        "Scan each file once for all its grafts, merged into a single regex."
+    ),
+
     'monorepo': (
         {'Project': {  # type: ignore
             'pname': pvtags.MONOREPO,
@@ -629,6 +670,7 @@ PolyversCmd.aliases = {  # type: ignore
     ('C', 'curdir'): 'PolyversCmd.curdir',
     ('f', 'force'): 'Spec.force',
     ('p', 'pdata'): 'PolyversCmd.pdata',
+    'file-source': 'FileProcessor.file_source',
 }
 
 
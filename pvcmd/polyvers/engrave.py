@@ -9,16 +9,21 @@
 """Search and replace version-ids in files."""
 
 from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Sequence, Set, Match, Dict
+from typing import (
+    Callable, Iterable, List, Optional, Pattern, Tuple, Sequence, Set, Match, Dict)
 import logging
+import os
+import re
+
+import os.path as osp
 
 from . import pvproject
 from ._vendor.traitlets.traitlets import (
     Dict as DictTrait, Bool as BoolTrait, Tuple as TupleTrait)
-from ._vendor.traitlets.traitlets import Bytes, Instance
+from ._vendor.traitlets.traitlets import Bytes, CaselessStrEnum, Instance
 from .cmdlet import cmdlets
-from .utils import fileutil as fu
 
 
 log = logging.getLogger(__name__)
@@ -60,80 +65,413 @@ def _prepare_glob_pairs(patterns):
     return pat_pairs
 
 
-def _glob_find_files(pattern_pairs: Tuple[str, str], mybase: Path):
-    from boltons.setutils import IndexedSet as iset
-
-    files = iset()
-    notfiles = set()  # type: ignore
-    for positive, negative in pattern_pairs:
-        if positive:
-            new_files = iset(mybase.glob(positive))
-            cleared_files = [f for f in new_files
-                             if not any(nf in f.parents for nf in notfiles)]
-            files.update(cleared_files)
-        elif negative:
-            new_notfiles = mybase.glob(negative)
-            notfiles.update(new_notfiles)
+def _glob_segment_regex(segment: str) -> str:
+    "Translate an :mod:`fnmatch` `segment` into a regex not crossing ``/``."
+    i, n = 0, len(segment)
+    res = []
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            res.append('[^/]*')
+        elif c == '?':
+            res.append('[^/]')
+        elif c == '[':
+            j = i
+            if segment[j:j + 1] == '!':
+                j += 1
+            if segment[j:j + 1] == ']':
+                j += 1
+            j = segment.find(']', j)
+            if j < 0:
+                res.append(re.escape(c))
+            else:
+                stuff = segment[i:j].replace('\\', '\\\\')
+                if stuff.startswith('!'):
+                    stuff = '^' + stuff[1:]
+                elif stuff.startswith('^'):
+                    stuff = '\\' + stuff
+                res.append('[%s]' % stuff)
+                i = j + 1
         else:
-            raise AssertionError("Both in (positive, negative) pair are None!")
+            res.append(re.escape(c))
 
-    return files
+    return ''.join(res)
 
 
-def _glob_filter_in_mybase(files: pvproject.FPaths,
-                           mybase: Path):
-    assert all(isinstance(f, Path) for f in files)
-    nfiles = []
-    for f in files:
+@lru_cache()
+def _compile_glob(pattern: str) -> Tuple[Pattern, bool]:
+    """
+    Translate a :meth:`Path.glob()` `pattern` into a regex for relative posix-paths.
+
+    :return:
+        a 2-tuple ``(regex, dirs_only)``;  like :meth:`Path.glob()`,
+        patterns ending in ``**`` match only dirs (but never the base-dir itself);
+        the regex captures what each ``**`` matched, for :func:`_glob_fullmatch()`
+    """
+    parts = [p for p in pattern.split('/') if p and p != '.']
+    dirs_only = bool(parts) and parts[-1] == '**'
+    if dirs_only:
+        parts = parts[:-1]
+
+    regex = ''.join('((?:[^/]+/)*)' if p == '**' else _glob_segment_regex(p) + '/'
+                    for p in parts)
+    if dirs_only:
+        if regex.endswith('/'):
+            regex = regex[:-1] + '((?:/[^/]+)*)'
+        else:  # Empty, or ending in another ``**``.
+            regex += '([^/]+(?:/[^/]+)*)'
+    else:
+        regex = regex[:-1]  # Drop trailing '/'.
+    flags = re.IGNORECASE if os.name == 'nt' else 0
+
+    return re.compile(regex, flags), dirs_only
+
+
+#: The ``(start, end)`` spans of the symlinked dirs in a relative path.
+Links = Tuple[Tuple[int, int], ...]
+#: A listed ``(relpath, is_dir, links)``.
+Entry = Tuple[str, bool, Links]
+
+
+def _glob_fullmatch(regex: Pattern, rpath: str, pos=0, links: Links = ()) -> bool:
+    """
+    Match `rpath` (from `pos`) like :meth:`Path.glob()` does.
+
+    :param regex:
+        as returned by :func:`_compile_glob()`
+    :param links:
+        the ``(start, end)`` spans in `rpath` of any symlinked dirs in it,
+        which (like :meth:`Path.glob()`) a ``**`` never crosses
+    """
+    m = regex.fullmatch(rpath, pos)
+    if not m or not links:
+        return bool(m)
+
+    return not any(gstart <= lstart and lend <= gend
+                   for gstart, gend in m.regs[1:]
+                   for lstart, lend in links)
+
+
+def _walk_tree(rootdir: str, descend: Callable[[str], bool]) -> List[Entry]:
+    """
+    List all entries below `rootdir` with a single :func:`os.scandir()` traversal.
+
+    :param descend:
+        decides whether to list a dir, given its relative posix-path
+    :return:
+        a ``(relpath, is_dir, links)`` tuple for each entry, in the order
+        :meth:`Path.glob()` visits them (dir-entries before sub-dirs);
+        symlinked dirs are descended into (unless looping back into
+        a dir above them), and the spans of them (and of themselves)
+        are in the `links` of their entries
+    """
+    entries: List[Entry] = []
+
+    def is_below(path, dpath):
+        return path == dpath or path.startswith(dpath.rstrip(os.sep) + os.sep)
+
+    def scan(dpath, prefix, links, link_reals):
         try:
-            rpath = f.relative_to(mybase)
-            if '..' not in str(rpath):
-                nfiles.append(f)
-        except ValueError as _:
-            "Skip it, outside mybase"
+            with os.scandir(dpath) as it:
+                children = [(e.name, e.is_dir(), e.is_symlink()) for e in it]
+        except OSError:
+            return  # Like `Path.glob()`, ignore unreadable dirs.
+
+        subdirs = []
+        for name, is_dir, is_link in children:
+            rpath = prefix + name
+            if not is_dir:
+                entries.append((rpath, is_dir, links))
+            elif not is_link:
+                entries.append((rpath, is_dir, links))
+                if descend(rpath):
+                    subdirs.append((osp.join(dpath, name), rpath + '/',
+                                    links, link_reals))
+            else:
+                sublinks = links + ((len(prefix), len(rpath)), )
+                entries.append((rpath, is_dir, sublinks))
+                subpath = osp.join(dpath, name)
+                real = osp.realpath(subpath)
+                if descend(rpath) and not any(
+                        is_below(r, real)
+                        for r in (osp.realpath(dpath), ) + link_reals):
+                    subdirs.append((subpath, rpath + '/',
+                                    sublinks, link_reals + (real, )))
+        for subdir in subdirs:
+            scan(*subdir)
+
+    scan(rootdir, '', (), ())
+
+    return entries
+
+
+def _git_tree(rootdir: str, untracked=False) -> List[Entry]:
+    """
+    List the files below `rootdir` known to git, with a single ``git ls-files``.
+
+    :param untracked:
+        if true, list also untracked files not ignored (e.g. by ``.gitignore``)
+    :return:
+        like :func:`_walk_tree()`, with the dirs derived from the files listed;
+        tracked files deleted from the work-tree are still listed,
+        and symlinks are listed as files (git never descends into them)
+    """
+    from .utils.oscmd import PopenCmd
 
-    return nfiles
+    args = ['-z', '--cached']
+    if untracked:
+        args.extend(['--others', '--exclude-standard'])
+    out = PopenCmd(cwd=rootdir).git.ls_files(*args)
 
+    entries: List[Entry] = []
+    seen_dirs: Set[str] = set()
+    for rpath in (out or '').split('\0'):
+        if not rpath:
+            continue
+        i = rpath.find('/')
+        while i > 0:
+            dpath = rpath[:i]
+            if dpath not in seen_dirs:
+                seen_dirs.add(dpath)
+                entries.append((dpath, True, ()))
+            i = rpath.find('/', i + 1)
+        entries.append((rpath, False, ()))
+
+    return entries
+
+
+def _path_parts(path: pvproject.FLike) -> Tuple[str, ...]:
+    ":return: the parts of the resolved `path`, case-normalized for the OS"
+    return tuple(osp.normcase(p) for p in Path(path).resolve().parts)
+
+
+class _BasesTrie:
+    """
+    A trie of (resolved) basepaths, answering which base owns a path in O(depth).
+
+    Nodes are nested dicts keyed by path-parts;  the ``None`` key marks
+    the node of a base, holding the value given when added.
+    """
+    def __init__(self) -> None:
+        self._root: Dict = {}
+
+    @classmethod
+    def of_bases(cls, bases: Iterable[pvproject.FLike], value=True) -> '_BasesTrie':
+        "A trie with all `bases` resolved, marked with the same `value`."
+        trie = cls()
+        for base in bases:
+            trie.add(_path_parts(base), value)
+
+        return trie
+
+    def add(self, parts: Sequence[str], value):
+        "Mark a base, the first `value` given for it wins."
+        node = self._root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node.setdefault(None, value)
+
+    def owner(self, parts: Sequence[str]) -> Tuple[int, object]:
+        """
+        :return:
+            a 2-tuple ``(depth, value)`` of the deepest base containing
+            (or same as) the path `parts`, or ``(-1, None)`` if none
+        """
+        depth, value = -1, None
+        node = self._root
+        for i, part in enumerate(parts):
+            if None in node:
+                depth, value = i, node[None]
+            node = node.get(part)
+            if node is None:
+                return depth, value
+        if None in node:
+            depth, value = len(parts), node[None]
+
+        return depth, value
+
+    def leads_to_base(self, parts: Sequence[str]) -> bool:
+        ":return: true if some base is below (or same as) the path `parts`"
+        node = self._root
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                return False
+
+        return True
+
+
+GlobJob = Tuple[List[str], pvproject.FLike, Optional[pvproject.FLikeList]]
+
+
+#: The values for :attr:`FileProcessor.file_source`.
+file_sources = ('fs', 'git', 'git+untracked')
+
+
+def _bases_key(bases: Optional[pvproject.FLikeList]) -> Tuple[str, ...]:
+    return tuple(str(b) for b in bases or ())
+
+
+class _ListedEntries:
+    """
+    The entries listed once below `rootdir`, globbed in memory.
+
+    Hits are memoized per ``(prefix, pattern)``, to be shared among the jobs.
+    """
+
+    def __init__(self, rootdir: str, entries: List[Entry],
+                 check_exists=False) -> None:
+        self.rootdir = rootdir
+        #: A list of ``(rootdir-relative-path, is_dir, links)`` 3-tuples.
+        self.entries = entries
+        #: When true, drop entries not in the work-tree (listed by git).
+        self.check_exists = check_exists
+        #: {(prefix, pattern): [prefix-relative-path, ...]}
+        self._hits: Dict[Tuple[str, str], List[str]] = {}
+
+    def hits(self, prefix: str, pattern: str) -> List[str]:
+        """
+        :param prefix:
+            the ``/``-terminated path (relative to `rootdir`) of the base
+            of the `pattern`, or empty
+        :return:
+            the paths (relative to the `prefix`) of entries matching `pattern`
+        """
+        key = (prefix, pattern)
+        rpaths = self._hits.get(key)
+        if rpaths is None:
+            regex, dirs_only = _compile_glob(pattern)
+            n = len(prefix)
+            rootdir, check_exists = self.rootdir, self.check_exists
+            rpaths = self._hits[key] = [
+                rpath[n:] for rpath, is_dir, links in self.entries
+                if rpath.startswith(prefix) and
+                (is_dir or not dirs_only) and
+                _glob_fullmatch(regex, rpath, n, links) and
+                (not check_exists or osp.lexists(osp.join(rootdir, rpath)))]
+
+        return rpaths
+
+    def glob(self, patterns: Sequence[str], prefix: str):
+        """
+        :return:
+            an :class:`IndexedSet` with the paths (relative to `prefix`) matched
+        """
+        from boltons.setutils import IndexedSet as iset
+
+        ## Negatives exclude the contents of dirs matched,
+        #  from the positives that follow them.
+        files = iset()
+        notdirs: List[str] = []
+        for positive, negative in _prepare_glob_pairs(patterns):
+            if positive:
+                files.update(rpath for rpath in self.hits(prefix, positive)
+                             if not any(rpath.startswith(nd) for nd in notdirs))
+            elif negative:
+                notdirs.extend(rpath + '/' for rpath in self.hits(prefix, negative))
+            else:
+                raise AssertionError("Both in (positive, negative) pair are None!")
 
-def _glob_filter_out_other_bases(files: pvproject.FPaths,
-                                 other_bases: pvproject.FPaths):
-    if not other_bases:
         return files
 
-    assert all(isinstance(f, Path) for f in files)
-    assert all(isinstance(f, Path) for f in other_bases)
 
-    nfiles = [f for f in files
-              if not any(fu._is_base_or_same(obase, f) in (None, True)
-                         for obase in other_bases)]
+def glob_many_files(jobs: Sequence[GlobJob],
+                    file_source='fs') -> List[pvproject.FPaths]:
+    """
+    Like :func:`glob_files()` for many ``(patterns, mybase, other_bases)``, listing files once.
+
+    All entries below the common dir of all `mybase` (e.g. the git-root
+    for a monorepo) are listed once, and each distinct ``(mybase, pattern)``
+    is matched against them in memory.  Files owned by `other_bases` nested
+    in `mybase` are dropped with a :class:`_BasesTrie` of the bases, resolved
+    once each, and the walk does not descend into bases excluded by all jobs.
+
+    :param file_source:
+        one of :data:`file_sources`:
+
+        - ``fs``: a single :func:`_walk_tree()` of the file-system;
+        - ``git``: a single :func:`_git_tree()` of the files tracked,
+          so dirs ignored by git (e.g. ``.tox/``, ``build/``) are never walked;
+        - ``git+untracked``: like ``git``, plus untracked files not ignored.
+    :return:
+        the files for each job, in the same order
+    :raise CalledProcessError:
+        on git errors, for the git sources
+    """
+    if not jobs:
+        return []
+
+    abs_bases = [osp.abspath(mybase) for _patterns, mybase, _obases in jobs]
+    rootdir = osp.commonpath(abs_bases)
+    prefixes = [osp.relpath(b, rootdir).replace(os.sep, '/') for b in abs_bases]
+    prefixes = ['' if pfx == '.' else pfx + '/' for pfx in prefixes]
+
+    ## All paths below `rootdir` are keyed by their parts relative to it,
+    #  and only the `other_bases` get resolved, once each.
+    root_parts = _path_parts(rootdir)
+
+    def rpath_parts(rpath):
+        return root_parts + tuple(osp.normcase(p) for p in rpath.split('/') if p)
+
+    ## One trie per distinct `other_bases` of jobs.
+    obases_tries: Dict[Tuple[str, ...], _BasesTrie] = {}
+    for _patterns, _mybase, other_bases in jobs:
+        key = _bases_key(other_bases)
+        if key not in obases_tries:
+            obases_tries[key] = _BasesTrie.of_bases(key)
+
+    ## Prune dirs of bases excluded by all jobs (e.g. nested projects),
+    #  unless they lead to some job's base.
+    job_bases = _BasesTrie()
+    owners = _BasesTrie()
+    for pfx in prefixes:
+        parts = rpath_parts(pfx)
+        job_bases.add(parts, True)
+        owners.add(parts, True)
+    for ob in set.intersection(*(set(key) for key in obases_tries)):
+        owners.add(_path_parts(ob), False)
+
+    def descend(rpath):
+        parts = rpath_parts(rpath)
+        return job_bases.leads_to_base(parts) or owners.owner(parts)[1] is True
+
+    from_git = file_source != 'fs'
+    if from_git:
+        entries = _git_tree(rootdir, untracked=file_source == 'git+untracked')
+    else:
+        entries = _walk_tree(rootdir, descend)
+    log.debug("Listed %i entries below '%s' from %s, to glob %i pattern-sets.",
+              len(entries), rootdir, file_source, len(jobs))
+
+    listed = _ListedEntries(rootdir, entries, check_exists=from_git)
+    results = []
+    for (patterns, mybase, other_bases), prefix in zip(jobs, prefixes):
+        mybase = Path(mybase)
+        obases_trie = obases_tries[_bases_key(other_bases)]
+        mybase_depth = len(rpath_parts(prefix))
+        files = listed.glob(patterns, prefix)
+
+        ## Drop files owned by other bases nested in (not same as) `mybase`.
+        results.append([mybase / f for f in files
+                        if obases_trie.owner(rpath_parts(prefix + f))[0] <= mybase_depth])
 
-    return nfiles
+    return results
 
 
 def glob_files(patterns: List[str],
                mybase: pvproject.FLike = '.',
-               other_bases: pvproject.FLikeList = None) -> pvproject.FPaths:
+               other_bases: pvproject.FLikeList = None,
+               file_source='fs') -> pvproject.FPaths:
     """
     Glob files in `mybase` but not in `other_bases` (unless bases coincide).
 
     - Supports exclude patterns: ``!foo``.
     - If `mybase` is in `other_bases`, it doesn't change the results.
+    - Use :func:`glob_many_files()` to glob many bases/patterns in one go
+      (see there for `file_source`).
     """
-    pattern_pairs = _prepare_glob_pairs(patterns)
-
-    mybase = Path(mybase)
-    files = _glob_find_files(pattern_pairs, mybase)
-
-    files = _glob_filter_in_mybase(files, mybase)
-    if other_bases:
-        ## Keep bases only inside mybase, but
-        # Exclude bases coinciding with mybase.
-        #
-        other_ppaths = [Path(ob) for ob in other_bases]
-        other_ppaths = [ob for ob in other_ppaths
-                        if not fu._is_same_file(mybase, ob) and
-                        fu._is_base_or_same(mybase, ob)]
-        files = _glob_filter_out_other_bases(files, other_ppaths)
+    files = glob_many_files([(patterns, mybase, other_bases)], file_source)[0]
 
     assert all(isinstance(f, Path) for f in files)
     return files
@@ -142,13 +480,10 @@ def glob_files(patterns: List[str],
 Range = Tuple[int, int]
 
 
-def overlapped_matches(matches: Sequence[Match],
-                       no_touch=False,
-                       ) -> Set[Match]:
-    """
-    :param no_touch:
-        if true, all three (0,1), (1,2) (2,3) overlap on 1 and 2.
-    """
+def _overlapped_matches_pairwise(matches: Sequence[Match],
+                                 no_touch=False,
+                                 ) -> Set[Match]:
+    "The O(n^2) version of :func:`overlapped_matches()`, for matches in any order."
     import itertools as itt
     import operator
 
@@ -167,6 +502,204 @@ def overlapped_matches(matches: Sequence[Match],
     return overlapped
 
 
+def overlapped_matches(matches: Sequence[Match],
+                       no_touch=False,
+                       ) -> Set[Match]:
+    """
+    :param no_touch:
+        if true, all three (0,1), (1,2) (2,3) overlap on 1 and 2.
+    :return:
+        the matches overlapping any earlier match not overlapped itself
+        (first match wins)
+
+    Matches sorted by their start are swept in linear time;  any other order
+    falls back to checking all pairs (see :func:`_overlapped_matches_pairwise()`).
+    """
+    spans = [m.span() for m in matches]
+    if any(s1[0] > s2[0] for s1, s2 in zip(spans, spans[1:])):
+        return _overlapped_matches_pairwise(matches, no_touch)
+
+    ## Since earlier matches start before (or with) each match,
+    #  it overlaps if it starts before the furthest end of the earlier good ones
+    #  (an empty match must start strictly after their start, unless `no_touch`).
+    overlapped: Set[Match] = set()
+    reach = reach_before = -1  # ends of good matches, started before/upto `start`
+    prev_start = None
+    for m, (start, end) in zip(matches, spans):
+        if start != prev_start:
+            reach_before, prev_start = reach, start
+        if no_touch:
+            is_bad = start <= reach
+        elif start < end:
+            is_bad = start < reach
+        else:
+            is_bad = start < reach_before
+        if is_bad:
+            overlapped.add(m)
+        else:
+            reach = max(reach, end)
+
+    return overlapped
+
+
+#: The regex flags that can be scoped, for embedding regexes in alternations.
+_scopable_flags = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'),
+                   (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+
+_global_flags_regex = re.compile(rb'(?<!\\)\(\?[aiLmsux]+\)')
+
+_merged_group_prefix = '_pvgraft'
+
+
+def _regex_nodes(parsed) -> Iterable:
+    ":return: all ``(op, av)`` nodes in a parsed regex, recursively"
+    try:
+        from re import _parser as sre_parse  # type: ignore
+    except ImportError:
+        import sre_parse  # type: ignore
+
+    def subpatterns(av):
+        if isinstance(av, sre_parse.SubPattern):
+            yield av
+        elif isinstance(av, (tuple, list)):
+            for a in av:
+                yield from subpatterns(a)
+
+    for op, av in parsed:
+        yield op, av
+        for sub in subpatterns(av):
+            yield from _regex_nodes(sub)
+
+
+def _mergeable_source(regex: Pattern) -> Optional[bytes]:
+    """
+    Scope the flags of a bytes `regex` inside its source, to embed it in an alternation.
+
+    :return:
+        the source, or None if it cannot be embedded, e.g. because of
+        back-references (numbers change), or flags other than ``imsx``
+    """
+    try:
+        from re import _parser as sre_parse  # type: ignore
+    except ImportError:
+        import sre_parse  # type: ignore
+
+    flags = regex.flags
+    src = regex.pattern
+    if not isinstance(src, bytes) or flags & ~sum(f for f, _ in _scopable_flags):
+        return None
+    if any(name.startswith(_merged_group_prefix) for name in regex.groupindex):
+        return None
+
+    try:
+        parsed = sre_parse.parse(src, flags)
+        if any(str(op).startswith('GROUPREF') for op, _ in _regex_nodes(parsed)):
+            return None
+
+        ## Global inline flags (e.g. ``(?xm)``) are already in `flags`.
+        scoped_src = _global_flags_regex.sub(b'', src)
+        if repr(sre_parse.parse(scoped_src, flags)) != repr(parsed):
+            return None
+    except Exception as ex:
+        log.debug("Cannot merge regex %r due to: %s", regex, ex)
+        return None
+
+    letters = ''.join(c for f, c in _scopable_flags if flags & f)
+    ## A comment in verbose-mode would swallow the closing parenthesis.
+    return b'(?%s:%s%s)' % (letters.encode('ascii'), scoped_src,
+                            b'\n' if flags & re.VERBOSE else b'')
+
+
+@lru_cache(maxsize=64)
+def _compile_merged(sources: Tuple[bytes, ...]) -> Pattern:
+    "An alternation of named groups ``_pvgraft<i>`` for each of `sources`."
+    return re.compile(b'|'.join(b'(?P<%s%i>%s)' % (_merged_group_prefix.encode(), i, src)
+                                for i, src in enumerate(sources)))
+
+
+def _merge_regexes(regexes: Sequence[Optional[Pattern]]
+                   ) -> Tuple[List[Tuple[Pattern, List[Pattern], List[List[int]]]],
+                              List[int]]:
+    """
+    Merge `regexes` into as few alternations as their group-names allow.
+
+    :param regexes:
+        a list of regexes, `None` for those to skip
+    :return:
+        a 2-tuple ``(scanners, fallbacks)`` where:
+
+        - `scanners`: a list of ``(merged_regex, alt_regexes, alt_indices)``,
+          where the i-th alternative (group ``_pvgraft<i>``) is ``alt_regexes[i]``,
+          owned by the `regexes` at ``alt_indices[i]`` (identical regexes share it);
+        - `fallbacks`: the indices of the `regexes` that must scan separately
+    """
+    fallbacks: List[int] = []
+    ## [(group-names, [source, ...], [regex, ...], [[index, ...], ...]), ...]
+    bins: List[Tuple[Set[str], List[bytes], List[Pattern], List[List[int]]]] = []
+    alts_index: Dict[Tuple[bytes, int], Tuple[int, int]] = {}  # (bin, alt) of regex
+
+    for i, regex in enumerate(regexes):
+        if regex is None:
+            fallbacks.append(i)
+            continue
+
+        key = (regex.pattern, regex.flags)
+        if key in alts_index:
+            nbin, nalt = alts_index[key]
+            bins[nbin][3][nalt].append(i)
+            continue
+
+        src = _mergeable_source(regex)
+        if src is None:
+            fallbacks.append(i)
+            continue
+
+        names = set(regex.groupindex)
+        for nbin, (bin_names, _srcs, _alts, _owners) in enumerate(bins):
+            if not names & bin_names:
+                break
+        else:
+            nbin = len(bins)
+            bins.append((set(), [], [], []))
+
+        bin_names, srcs, alts, owners = bins[nbin]
+        bin_names.update(names)
+        alts_index[key] = (nbin, len(alts))
+        srcs.append(src)
+        alts.append(regex)
+        owners.append([i])
+
+    scanners = []
+    for _names, srcs, alts, owners in bins:
+        try:
+            scanners.append((_compile_merged(tuple(srcs)), alts, owners))
+        except Exception as ex:
+            log.debug("Cannot merge regexes %s due to: %s", alts, ex)
+            fallbacks.extend(i for idxs in owners for i in idxs)
+
+    return scanners, sorted(fallbacks)
+
+
+def _scan_merged(merged: Pattern, alts: Sequence[Pattern], fbytes: bytes
+                 ) -> List[List[Match]]:
+    """
+    Scan `fbytes` once with a `merged` regex, re-matching each hit with its own regex.
+
+    :return:
+        the matches for each of the `alts`, as if matched by them
+        (with their own groups, for :meth:`Match.expand()`)
+    """
+    nprefix = len(_merged_group_prefix)
+    matches: List[List[Match]] = [[] for _ in alts]
+    for m in merged.finditer(fbytes):
+        nalt = int(m.lastgroup[nprefix:])  # type: ignore  # outermost closed last
+        own_match = alts[nalt].match(fbytes, m.start())
+        if own_match:
+            matches[nalt].append(own_match)
+
+    return matches
+
+
 GlobTruples = List[Tuple[pvproject.Project, pvproject.Engrave, Path]]
 GraftsMap = Dict[Path, List[Tuple[pvproject.Project,
                                   pvproject.Engrave,
@@ -180,6 +713,32 @@ MatchMap = Dict[Path, List[MatchQruple]]
 
 class FileProcessor(cmdlets.Spec):
 
+    file_source = CaselessStrEnum(
+        file_sources,
+        default_value='fs',
+        config=True,
+        help="""
+        Where to list the files globbed for engraving & project autodiscovery.
+
+        - fs: walk the file-system below the project basepaths;
+        - git: list only files tracked by git, with a single `git ls-files`,
+          so dirs ignored by git (e.g. `.tox/`, `build/`, virtualenvs) are never walked;
+        - git+untracked: like `git`, plus untracked files not ignored by git.
+        """)
+
+    merge_grafts = BoolTrait(
+        False,
+        config=True,
+        help="""
+        Scan each file once for all its grafts, merged into a single regex.
+
+        - Grafts that cannot merge (e.g. with back-references or special flags)
+          are scanned separately, as usual.
+        - Unlike separate scans, hits of a graft starting inside the hit of another
+          graft are not reported (they would be dropped as overlapping, anyway),
+          and this may shift where the next hits of that graft start.
+        """)
+
     _fpath_bytes: Dict[Path, Tuple[bytes, bool]] = DictTrait(  # type: ignore
         key_trait=Instance(Path),
         value_trait=TupleTrait(Bytes(),
@@ -240,26 +799,42 @@ class FileProcessor(cmdlets.Spec):
                       in self._fpath_bytes.items()
                       if all_searched or changed)
 
+    def _glob_projects(self,
+                       projects: Sequence[pvproject.Project],
+                       other_bases: pvproject.FLikeList = ()
+                       ) -> GlobTruples:
+        """Glob the engraves of all `projects` with a single walk of their files."""
+        keys = []
+        jobs: List[GlobJob] = []
+        for prj in projects:
+            with self.errlogged(token='glob',
+                                doing="globbing %.28s" % prj):
+                for eng in prj.active_engraves():
+                    with self.errlogged(
+                        token='glob',
+                        doing="globbing %.28s%s" % (eng, eng.globs)
+                    ):
+                        globs = [prj.interp(gs, _escaped_for='glob')
+                                 for gs in eng.globs
+                                 if gs is not None]
+                        keys.append((prj, eng))
+                        jobs.append((globs,  # type: ignore # (interp may be null)
+                                     prj.basepath or '.', other_bases))
+
+        glob_truples: GlobTruples = []
+        with self.errlogged(token='glob',
+                            doing="globbing %i projects" % len(projects)):
+            hits = glob_many_files(jobs, self.file_source)
+            for (prj, eng), hit_fpaths in zip(keys, hits):
+                glob_truples.extend((prj, eng, fp) for fp in hit_fpaths)
+
+        return glob_truples
+
     def _glob_project(self,
                       project: pvproject.Project,
                       other_bases: pvproject.FLikeList = ()
                       ) -> GlobTruples:
-        mybase = project.basepath
-        glob_truples: GlobTruples = []
-        for eng in project.active_engraves():
-            with self.errlogged(
-                token='glob',
-                doing="globbing %.28s%s" % (eng, eng.globs)
-            ):
-                globs = [project.interp(gs, _escaped_for='glob')
-                         for gs in eng.globs
-                         if gs is not None]
-                hit_fpaths = glob_files(  # type: ignore # (interp may be null)
-                    globs, mybase=mybase or '.', other_bases=other_bases)
-                glob_truples.extend((project, eng, fp)
-                                    for fp in hit_fpaths)
-
-        return glob_truples
+        return self._glob_projects([project], other_bases)
 
     def _reindex_glob_results_on_fpaths(self, gtruples: GlobTruples
                                         ) -> GraftsMap:
@@ -274,36 +849,79 @@ class FileProcessor(cmdlets.Spec):
                            all_projects: Sequence[pvproject.Project]
                            ) -> GraftsMap:
         other_bases = [prj.basepath for prj in all_projects if prj.basepath]
-        glob_truples = []
-        for prj in projects:
-            with self.errlogged(token='glob',
-                                doing="globbing %.28s" % prj):
-                glob_truples.extend(self._glob_project(prj, other_bases))
+        glob_truples = self._glob_projects(projects, other_bases)
 
         return self._reindex_glob_results_on_fpaths(glob_truples)
 
+    def _log_scanned(self, fpath, fbytes, prj, eng, graft, matches):
+        self.log.debug(
+            "Scanned %i matches in %i-bytes text of file '%s': "
+            "\n  matches: %s\n  %s\n  %s \n  %s",
+            len(matches), len(fbytes), fpath,
+            '\n    '.join(str(m) for m in [''] + matches),  # type: ignore
+            graft, eng, prj)
+
+        sliced_matches = graft.sliced_matches(matches)
+        if len(sliced_matches) != len(matches):
+            self.log.debug(
+                "Sliced %i out of %i matches in file '%s' for %s.",
+                len(sliced_matches), len(matches), fpath, graft)
+
+    def _scan_graft(self, fpath, fbytes, prj, eng, graft) -> List[Match]:
+        matches: List[Match] = []
+        with self.errlogged(token='scan',
+                            doing="scanning '%s' for %.28s.%.28s" %
+                            (fpath, prj, eng)):
+            matches = graft.collect_matches(fbytes, prj)
+            self._log_scanned(fpath, fbytes, prj, eng, graft, matches)
+
+        return matches
+
+    def _scan_merged_grafts(self, fpath, fbytes, graft_truples
+                            ) -> List[List[Match]]:
+        """
+        Scan a file once for all mergeable grafts (see :attr:`merge_grafts`).
+
+        :return:
+            the matches for each of the `graft_truples`, in the same order
+        """
+        regexes: List[Optional[Pattern]] = []
+        for prj, _eng, graft in graft_truples:
+            try:
+                regexes.append(graft.regex_resolved(prj))
+            except Exception:
+                regexes.append(None)  # Scream when scanned separately.
+
+        scanners, fallbacks = _merge_regexes(regexes)
+        all_matches: List[List[Match]] = [[] for _ in graft_truples]
+        for merged, alts, owners in scanners:
+            for alt_matches, idxs in zip(_scan_merged(merged, alts, fbytes), owners):
+                ## Grafts with identical regexes would overlap all matches
+                #  of the 1st one, so only that keeps them.
+                for n, i in enumerate(idxs):
+                    matches = [] if n else alt_matches
+                    all_matches[i] = matches
+                    self._log_scanned(fpath, fbytes, *graft_truples[i], matches)
+        for i in fallbacks:
+            all_matches[i] = self._scan_graft(fpath, fbytes, *graft_truples[i])
+
+        self.log.debug("Scanned file '%s' for %i grafts with %i merged regexes "
+                       "(%i grafts scanned separately).",
+                       fpath, len(graft_truples), len(scanners), len(fallbacks))
+
+        return all_matches
+
     def _scan_all_grafts(self, grafts_map: GraftsMap) -> MatchMap:
         match_map: MatchMap = defaultdict(list)
-        for fpath, graft_truple in grafts_map.items():
+        for fpath, graft_truples in grafts_map.items():
             fbytes = self._read_file(fpath)
-            for prj, eng, graft in graft_truple:
-                with self.errlogged(token='scan',
-                                    doing="scanning '%s' for %.28s.%.28s" %
-                                    (fpath, prj, eng)):
-                    matches = graft.collect_matches(fbytes, prj)
-                    self.log.debug(
-                        "Scanned %i matches in %i-bytes text of file '%s': "
-                        "\n  matches: %s\n  %s\n  %s \n  %s",
-                        len(matches), len(fbytes), fpath,
-                        '\n    '.join(str(m) for m in [''] + matches),  # type: ignore
-                        graft, eng, prj)
-
-                    sliced_matches = graft.sliced_matches(matches)
-                    if len(sliced_matches) != len(matches):
-                        self.log.debug(
-                            "Sliced %i out of %i matches in file '%s' for %s.",
-                            len(sliced_matches), len(matches), fpath, graft)
+            if self.merge_grafts:
+                all_matches = self._scan_merged_grafts(fpath, fbytes, graft_truples)
+            else:
+                all_matches = [self._scan_graft(fpath, fbytes, *gt)
+                               for gt in graft_truples]
 
+            for (prj, eng, graft), matches in zip(graft_truples, all_matches):
                 match_map[fpath].extend((prj, eng, graft, m)
                                         for m in matches)
 
@@ -345,51 +963,77 @@ class FileProcessor(cmdlets.Spec):
 
     def _graft_match(self,
                      graft: pvproject.Graft,
-                     fbytes: bytes,
                      match: Match,
-                     offset: int,
                      project: 'pvproject.Project',
-                     ) -> Tuple[bytes, int]:
+                     ) -> Optional[bytes]:
         """
         :param graft:
             a graft with a non-null :attr:`pvproject.Graft.subst`
         :return:
-            the substituted fbytes
+            the substituted text for the `match`, or None if no subst resolved
         """
         subst = graft.subst_resolved(project)
         if subst is not None:
-            mstart, mend = match.span()
-            new_text = match.expand(subst)
-            head = fbytes[:mstart + offset]
-            tail = fbytes[mend + offset:]
-            fbytes = head + new_text + tail
-            offset += len(new_text) - (mend - mstart)
+            return match.expand(subst)
+
+        return None
 
-        return fbytes, offset
+    def engraved_files(self) -> Dict[Path, bytes]:
+        ":return: the contents of all files changed by :meth:`engrave_matches()`"
+        return {fpath: fbytes
+                for fpath, (fbytes, changed) in self._fpath_bytes.items()
+                if changed}
+
+    def engrave_matches(self, write_files=True):
+        """
+        :param write_files:
+            if false, keep engraved contents in memory only
+            (see :meth:`engraved_files()`)
+        """
+        ## Labels of (prj, eng, graft) for messages, costly to format on every match.
+        labels: Dict[Tuple[int, int, int], str] = {}
 
-    def engrave_matches(self):
         match_map = self.match_map
         for fpath, mqruples in match_map.items():
             if not mqruples:
                 continue
 
+            ## Assemble the new contents from the chunks between matches,
+            #  sorted & non-overlapping (see `_drop_overlapping_matches()`).
             fbytes = self._read_file(fpath)
-            offset = 0  # File growth/shrink as substituted?
+            chunks: List[bytes] = []
+            pos = 0
             for prj, eng, graft, match in (mq
                                            for mq in mqruples
                                            if mq[2].subst):
-                with self.errlogged(token='subst',
-                                    doing="subst '%s' with %.28s.%.28s.%.28s.%.28s" %
-                                    (fpath, prj, eng, graft, match)):
-
-                    fbytes, offset = self._graft_match(
-                        graft, fbytes, match, offset, prj)
+                key = (id(prj), id(eng), id(graft))
+                label = labels.get(key)
+                if label is None:
+                    label = labels[key] = '%.28s.%.28s.%.28s' % (prj, eng, graft)
+                ## Enter the (costly) errlog only on failures.
+                try:
+                    new_text = self._graft_match(graft, match, prj)
+                except Exception:
+                    with self.errlogged(token='subst',
+                                        doing="subst '%s' with %s.%.28s" %
+                                        (fpath, label, match)):
+                        raise
+                    continue
+
+                if new_text is not None:
+                    mstart, mend = match.span()
+                    chunks.append(fbytes[pos:mstart])
+                    chunks.append(new_text)
+                    pos = mend
                     self.log.debug(
-                        "Substituted match in %i(%+i)-bytes file '%s': "
-                        "\n  %s\n  %s\n  %s \n  %s",
-                        len(fbytes), offset, fpath,
-                        match, graft, eng, prj)
+                        "Substituted match at %i-%i of %i-bytes file '%s' "
+                        "with %s: %s", mstart, mend, len(fbytes), fpath,
+                        label, match)
 
+            if chunks:
+                chunks.append(fbytes[pos:])
+                fbytes = b''.join(chunks)
             self._set_file_bytes(fpath, fbytes)
 
-        self._write_all_files()
+        if write_files:
+            self._write_all_files()
@@ -12,7 +12,9 @@ The main structures of *polyvers*::
     Project 1-->* Engrave 1-->* Graft
 """
 from pathlib import Path
-from typing import List, Optional, Match, Sequence, Union, Pattern
+from typing import (
+    Callable, FrozenSet, List, Optional, Match, Sequence, Union, Pattern)
+import functools as fnt
 import logging
 import re
 
@@ -41,6 +43,26 @@ FLike = Union[str, Path]
 FLikeList = Sequence[FLike]
 
 
+@fnt.lru_cache()
+def _interp_fields(text: str) -> FrozenSet[str]:
+    """
+    The root names of all fields to interpolate in `text`, e.g. ``pname`` for ``{pname.x}``.
+
+    :raise ValueError:
+        on invalid format-string
+    """
+    import string
+
+    fields = set()
+    for _literal, fname, spec, _conversion in string.Formatter().parse(text):
+        if fname is not None:
+            fields.add(re.split(r'[.[]', fname, 1)[0])
+        if spec:
+            fields.update(_interp_fields(spec))
+
+    return frozenset(fields)
+
+
 def _slices_to_ids(slices, thelist):
     from boltons.setutils import IndexedSet as iset
 
@@ -235,10 +257,15 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
         help="The new absolute version to bump to.")
 
     def load_current_version_from_history(self, vtag_index=0):
-        try:
-            tag = self.pvtags_history[vtag_index]
-            self.current_version = self.version_from_pvtag(tag)
-        except IndexError:
+        """
+        :param vtag_index:
+            0 for the greatest version in :attr:`version_history`,
+            1 for the one before it, etc
+        """
+        latest = self.version_history.latest(vtag_index)
+        if latest:
+            self.current_version = latest[0]
+        else:
             self.log.debug("No vtags history for %s.", self)
             self.current_version = self.start_version_id
 
@@ -278,10 +305,52 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
            in `pvtag_format` kw-arg.
     """).tag(config=True)
 
+    @trt.observe('pname', 'pvtag_format', 'pvtag_regex', 'tag_vprefixes')
+    def _reset_tag_patterns(self, change):
+        ## A new dict (not cleared) to leave intact any clone's cache.
+        self._tag_patterns = {}
+        self._version_history_memo = None
+
+    def _tag_pattern(self, key, template: str, make: Callable, *keys: str):
+        """
+        Memoize `make()` under `key`, if `template` interpolates only observed traits.
+
+        :param keys:
+            any extra interpolation-keys, given explicitly to :meth:`interp()`,
+            apart from ``{pname}`` & ``{vprefix}``;  the `key` must include
+            their values
+        """
+        try:
+            fields = _interp_fields(template or '')
+        except ValueError:
+            return make()  # let interpolation scream
+
+        ## Keys in user-map take precedence over traits.
+        user_map = self.interpolations.maps[0]
+        if (not fields <= {'pname', 'vprefix'}.union(keys) or
+                any(f in user_map for f in fields)):
+            return make()
+
+        patterns = self.__dict__.get('_tag_patterns')
+        if patterns is None:
+            patterns = self._tag_patterns = {}
+        try:
+            return patterns[key]
+        except KeyError:
+            value = patterns[key] = make()
+
+            return value
+
     def _format_vtag(self, version, is_release=False):
-        return self.interp(self.pvtag_format,
-                           version=version,
-                           vprefix=self.tag_vprefixes[int(is_release)])
+        def make():
+            return self.interp(self.pvtag_format,
+                               version=version,
+                               vprefix=self.tag_vprefixes[int(is_release)])
+
+        if not isinstance(version, str):
+            return make()
+        return self._tag_pattern(('vtag', version, bool(is_release)),
+                                 self.pvtag_format, make, 'version')
 
     def tag_fnmatch(self, is_release=False):
         """
@@ -296,10 +365,13 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
             {version} <-- '*'
         """
         vprefix = self.tag_vprefixes[int(is_release)]
-        return self.interp(self.pvtag_format,
-                           vprefix=vprefix,
-                           version='*',
-                           _escaped_for='glob')
+        return self._tag_pattern(
+            ('fnmatch', bool(is_release)), self.pvtag_format,
+            lambda: self.interp(self.pvtag_format,
+                                vprefix=vprefix,
+                                version='*',
+                                _escaped_for='glob'),
+            'version')
 
     pvtag_regex = Unicode(
         help="""
@@ -380,10 +452,11 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
             `False` for version-tags, `True` for release-tags
         """
         vprefix = self.tag_vprefixes[int(is_release)]
-        regex = self.interp(self.pvtag_regex,
-                            vprefix=vprefix,
-                            _escaped_for='regex')
-        return re.compile(regex)
+        return self._tag_pattern(
+            ('regex', bool(is_release)), self.pvtag_regex,
+            lambda: re.compile(self.interp(self.pvtag_regex,
+                                           vprefix=vprefix,
+                                           _escaped_for='regex')))
 
     _pvtags_collected = ListTrait(
         Unicode(), allow_none=True, default_value=None,
@@ -401,6 +474,28 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
             raise AssertionError("Call first `populate_pvtags_history()` on %s!")
         return self._pvtags_collected
 
+    @property
+    def version_history(self) -> vermath.VersionHistory:
+        """
+        The :attr:`pvtags_history` sorted by version, for ``O(log n)`` queries.
+
+        It is rebuilt only when the *pvtags* collected or the tag-patterns change.
+
+        :raise AssertionError:
+           If used before :func:`populate_pvtags_history()` applied on this project.
+        """
+        pvtags = self.pvtags_history
+        ## Tags are appended in-place, so memo is keyed on list identity & length.
+        memo = self.__dict__.get('_version_history_memo')
+        if memo and memo[0] is pvtags and memo[1] == len(pvtags):
+            return memo[2]
+
+        history = vermath.VersionHistory((t, self.version_from_pvtag(t) or '')
+                                         for t in pvtags)
+        self._version_history_memo = (pvtags, len(pvtags), history)
+
+        return history
+
     def version_from_pvtag(self, pvtag: str,
                            is_release: Optional[bool] = None) -> Optional[str]:
         """Extract the version from a *pvtag*."""
@@ -466,12 +561,25 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
         release_flags = [0, 1] if is_release is None else [bool(is_release), ]
         tag_patterns = [self.tag_fnmatch(i) for i in release_flags]
 
-        ## TODO: move to pvtags
-        with pvtags.git_project_errors_handled(self.pname):
-            out = cmd.git.describe._(
-                tags=(include_lightweight) or None,
-                *git_args,
-                **git_flags)(*('--match=%s' % i for i in tag_patterns))
+        ## Buggy git < 2.15 respects only the last of many `--match` patterns.
+        if pvlib.git_capabilities().multi_match:
+            patterns_list = [tag_patterns]
+        else:
+            patterns_list = [[tp] for tp in tag_patterns]
+
+        for i, patterns in enumerate(patterns_list):
+            try:
+                ## TODO: move to pvtags
+                with pvtags.git_project_errors_handled(self.pname):
+                    out = cmd.git.describe._(
+                        tags=(include_lightweight) or None,
+                        *git_args,
+                        **git_flags)(*('--match=%s' % tp for tp in patterns))
+                break
+            except pvtags.GitVoidError:
+                ## Raise only at the very last pattern.
+                if i >= len(patterns_list) - 1:
+                    raise
 
         version = out
 
@@ -479,17 +587,23 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
         if 'all' in git_flags:
             version = version.lstrip('tags/')
 
-        if not self.version_from_pvtag(version, is_release):
+        self._check_described_pvtag(version, is_release)
+
+        return version
+
+    def _check_described_pvtag(self, pvtag: str, is_release=None):
+        "Scream if a ``git describe`` result is not parsable by :meth:`tag_regex()`."
+        if not self.version_from_pvtag(pvtag, is_release):
+            release_flags = [0, 1] if is_release is None else [bool(is_release), ]
+            tag_patterns = [self.tag_fnmatch(i) for i in release_flags]
             raise trt.TraitError(
                 "Project-version '%s' fetched by %i patterns (%s) "
                 "was unparsable by regex:%s" %
-                (version,
+                (pvtag,
                  len(tag_patterns), ', '.join(tag_patterns),
                  ','.join('\n%r' % self.tag_regex(r).pattern
                           for r in release_flags)))
 
-        return version
-
     def last_commit_tstamp(self):
         """
         Report the timestamp of the last commit of the git repo.
@@ -525,29 +639,16 @@ class Project(cmdlets.Replaceable, cmdlets.Printable, yu.YAMLable, cmdlets.Spec)
 
         :param is_release:
             `False` for version-tags, `True` for release-tags
+
+        .. Tip::
+           To tag many projects at once, use :func:`pvtags.tag_projects_commit()`.
         """
-        import subprocess as sbp
         from . import pvtags
 
-        tag_name = self._format_vtag(self.version, is_release)
-        ## TODO: move all git-cmds to pvtags?
-        try:
-            out = cmd.git.tag(
-                tag_name,
-                message=msg,
-                force=amend or self.is_forced('tag') or None,
-                sign=sign_tag or None,
-                local_user=sign_user or None,
-            )
-
-            if self.dry_run:
-                self.log.warning('PRETEND tag: %s' % out)
-        except sbp.CalledProcessError as ex:
-            if "already exists" in str(ex.stderr):
-                raise pvtags.GitError(
-                    "Cannot bump, tag '%s' already exists!"
-                    "\n  Add `--force=tag` if you must, or you can --amend." % tag_name)
-            raise
+        pvtags.tag_projects_commit([self], msg,
+                                   is_release=is_release, amend=amend,
+                                   sign_tag=sign_tag, sign_user=sign_user,
+                                   dry_run=self.dry_run)
 
     engraves = ListTrait(
         autotrait.AutoInstance(Engrave),
@@ -19,16 +19,17 @@ There are 3 important methods/functions calling Git:
   this function has not been applies on a project instance.
 """
 
-from typing import List, Dict, Sequence, Optional
+from typing import Container, Dict, List, Optional, Pattern, Sequence, Union
 import contextlib
 import logging
+import re
 
 import polyversion as pvlib
 import subprocess as sbp
 
-from . import pvproject
+from . import pvproject, tagindex
 from .cmdlet import cmdlets
-from .utils.oscmd import cmd, PopenCmd
+from .utils.oscmd import acmd, cmd, run_concurrently, PopenCmd
 
 
 MONOREPO = '<monorepo>'
@@ -59,7 +60,11 @@ def git_project_errors_handled(pname):
     try:
         yield
     except sbp.CalledProcessError as ex:
-        err = ex.stderr
+        err = ex.stderr or ''
+        if isinstance(err, bytes):  # from `polyversion` lib
+            err = err.decode('utf-8', errors='replace')
+        if "ot a git repository" in err and not isinstance(ex, NoGitRepoError):
+            raise NoGitRepoError("Project '%s': %s" % (pname, err)) from ex
         if any(msg in err
                for msg in [
                    "does not have any commits yet",
@@ -70,10 +75,15 @@ def git_project_errors_handled(pname):
         raise
 
 
-def _git_current_branch() -> Optional[str]:
+def _git_current_branch(branches: str = None) -> Optional[str]:
+    """
+    :param branches:
+        the output of ``git branch``, if already fetched
+    """
     CUR_BRANCH_PREFIX = '* '
 
-    branches = cmd.git.branch()
+    if branches is None:
+        branches = cmd.git.branch()
     for br_line in branches.split('\n'):
         if br_line.startswith(CUR_BRANCH_PREFIX):
             cur_branch = br_line.lstrip(CUR_BRANCH_PREFIX)
@@ -84,8 +94,8 @@ def _git_current_branch() -> Optional[str]:
 def _parse_ref_pairs_list(reflines: str) -> Dict[str, str]:
     "parses the output of ``git show-ref`` as a dict"
     return {ref: sha
-            for sha, ref in (l.split()
-                             for l in reflines.split('\n'))}
+            for sha, ref in (line.split()
+                             for line in reflines.split('\n'))}
 
 
 def _restore_refs(old_refs: Dict[str, str], new_refs: Dict[str, str]):
@@ -102,42 +112,308 @@ def _restore_refs(old_refs: Dict[str, str], new_refs: Dict[str, str]):
                      for ref in to_upd
                      if old_refs[ref] != new_refs[ref])
     if cmd_lines:
-        cmd_text = '\n'.join(cmd_lines) + '\n'
-        log.debug("Restoring git-refs: \n%s" % cmd_text)
-        PopenCmd(input=cmd_text.encode(),
-                 universal_newlines=False,
-                 encoding=None, encoding_errors=None
-                 ).git.update_ref(stdin=True)
+        log.debug("Restoring git-refs...")
+        _update_refs(cmd_lines)
+
+
+def _update_refs(cmd_lines: Sequence[str]):
+    """
+    Apply all `cmd_lines` with a single ``git update-ref --stdin`` transaction.
+
+    Git applies all of them atomically, or none, if any ref fails to update.
+    """
+    cmd_text = '\n'.join(cmd_lines) + '\n'
+    log.debug("Updating git-refs: \n%s" % cmd_text)
+    PopenCmd(input=cmd_text.encode(),
+             universal_newlines=False,
+             encoding=None, encoding_errors=None
+             ).git.update_ref(stdin=True)
 
 
 @contextlib.contextmanager
-def git_restore_point(restore_head=False, heads=True, tags=True):
+def git_restore_point(restore_head=False, heads=True, tags=True,
+                      restore_worktree=True):
     """
     Restored checked out branch to previous state in case of errors (or if forced).
 
     :param restore:
         if true, force restore at exit, otherwise, restore only on errors
+    :param restore_worktree:
+        if false, restore just the `heads` & `tags` refs, for code
+        that never touches the work-tree nor HEAD
     """
     show_ref_kw = {'heads': heads or None, 'tags': tags or None}
 
-    cur_branch = _git_current_branch()
-    original_commit_id = cmd.git.rev_parse.HEAD()
+    ## Independent queries, run in parallel.
+    queries = []
+    if restore_worktree:
+        queries.extend([acmd.git.branch(), acmd.git.rev_parse.HEAD()])
+    if heads or tags:
+        queries.append(acmd.git.show_ref(**show_ref_kw))
+    results = run_concurrently(*queries)
+
+    if restore_worktree:
+        cur_branch = _git_current_branch(results[0])
+        original_commit_id = results[1]
     if heads or tags:
-        old_refs = _parse_ref_pairs_list(cmd.git.show_ref(**show_ref_kw))
+        old_refs = _parse_ref_pairs_list(results[-1])
     ok = False
     try:
         yield
         ok = True
     finally:
         if not ok or restore_head:
-            if cur_branch:
-                cmd.git.checkout(cur_branch, force=True)
-            cmd.git.reset._(hard=True)(original_commit_id)
+            if restore_worktree:
+                if cur_branch:
+                    cmd.git.checkout(cur_branch, force=True)
+                cmd.git.reset._(hard=True)(original_commit_id)
             if heads or tags:
                 new_refs = _parse_ref_pairs_list(cmd.git.show_ref(**show_ref_kw))
                 _restore_refs(old_refs, new_refs)
 
 
+def ref_update_cmd(ref: str, new_oid: str) -> str:
+    """
+    A ``git update-ref --stdin`` command moving `ref`, expecting its current oid.
+
+    The transaction fails if `ref` moves (or gets created) meanwhile.
+    """
+    out = cmd.git.for_each_ref(ref, format='%(refname) %(objectname)')
+    old_oid = dict(line.split() for line in out.split('\n') if line).get(ref)
+
+    return ('update %s %s %s' % (ref, new_oid, old_oid)
+            if old_oid else
+            'create %s %s' % (ref, new_oid))
+
+
+def _cleanup_message(msg: str, strip_comments=True) -> str:
+    """
+    Like ``git stripspace [--strip-comments]``, as ``git tag/commit -m`` do by default.
+
+    :param strip_comments:
+        true for tags, false for commits (not edited)
+    """
+    lines: List[str] = []
+    for line in msg.split('\n'):
+        line = line.rstrip()
+        if strip_comments and line.startswith('#'):
+            continue
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _hash_objects(contents: Sequence[bytes], objtype='blob') -> List[str]:
+    """
+    Write all `contents` into git's object-db with a single ``git hash-object``.
+
+    Blobs pass through the "clean" conversions (e.g. ``core.autocrlf``)
+    but not through any path-specific *gitattributes*.
+
+    :return:
+        the object-ids, in the same order as `contents`
+    """
+    import tempfile
+    import os.path as osp
+
+    with tempfile.TemporaryDirectory(prefix='polyvers-objects-') as tdir:
+        fpaths = []
+        for i, fbytes in enumerate(contents):
+            fpath = osp.join(tdir, str(i))
+            with open(fpath, 'wb') as fd:
+                fd.write(fbytes)
+            fpaths.append(fpath)
+
+        out = PopenCmd(input='\n'.join(fpaths) + '\n'
+                       ).git.hash_object('--stdin-paths', t=objtype, w=True)
+
+    oids = out.split('\n')
+    assert len(oids) == len(contents), (oids, contents)
+
+    return oids
+
+
+def tag_commit_atomically(tag_msgs: Dict[str, str], *,
+                          rev='HEAD',
+                          forced: Container[str] = (),
+                          sign=None, sign_user=None,
+                          dry_run=False,
+                          extra_ref_cmds: Sequence[str] = ()
+                          ) -> Dict[str, Optional[str]]:
+    """
+    Create many annotated tags on `rev`, all or none of them.
+
+    The tag-objects are written in a single batch, and their refs are applied
+    with a single ``git update-ref --stdin`` transaction, so the number of
+    git processes launched does not grow with the number of tags.
+
+    :param tag_msgs:
+        a mapping of ``{tag-name: message}``
+    :param forced:
+        tag-names to overwrite if they already exist
+    :param sign:
+        PGP-sign tags; since only ``git tag`` can sign them, they are then
+        created one-by-one (non-atomically)
+    :param dry_run:
+        if true, the tag-objects are written but no ref is touched
+        (signed tags are not created at all)
+    :param extra_ref_cmds:
+        more ``git update-ref --stdin`` commands to apply in the same transaction
+        (e.g. to move a branch along with its tags)
+    :return:
+        a mapping of ``{tag-name: tag-object-id}``
+        (the ids are `None` for signed tags)
+    :raise GitError:
+        if any tag already exists and it is not in `forced`
+    :raise CalledProcessError:
+        on any other git errors, in which case no tag has been created
+    """
+    if not tag_msgs:
+        return {}
+
+    refnames = ['refs/tags/%s' % t for t in tag_msgs]
+    ## Independent queries, run in parallel.
+    #  Refnames cannot contain glob-chars, so they match literally
+    #  (or their leading dirs, filtered out below).
+    tag_refs, commit_id, tagger = run_concurrently(
+        acmd.git.for_each_ref(*refnames, format='%(refname) %(objectname)'),
+        acmd.git.rev_parse('%s^{commit}' % rev),
+        acmd.git.var('GIT_COMMITTER_IDENT'))
+    existing = {ref: oid
+                for ref, oid in (line.split() for line in tag_refs.split('\n') if line)
+                if ref in refnames}
+    for tag_name in tag_msgs:
+        if 'refs/tags/%s' % tag_name in existing and tag_name not in forced:
+            raise GitError(
+                "Cannot bump, tag '%s' already exists!"
+                "\n  Add `--force=tag` if you must, or you can --amend." % tag_name)
+
+    if sign:
+        for tag_name, msg in tag_msgs.items():
+            git_tag = cmd.git.tag._(tag_name, rev,
+                                    message=msg,
+                                    force=tag_name in forced or None,
+                                    sign=True, local_user=sign_user or None)
+            if dry_run:
+                log.warning('PRETEND tag: %s', git_tag)
+            else:
+                git_tag()
+        if extra_ref_cmds:
+            if dry_run:
+                log.warning('PRETEND refs: \n  %s' % '\n  '.join(extra_ref_cmds))
+            else:
+                _update_refs(extra_ref_cmds)
+
+        return {t: None for t in tag_msgs}
+
+    tag_texts = [('object %s\ntype commit\ntag %s\ntagger %s\n\n%s' %
+                  (commit_id, tag_name, tagger, _cleanup_message(msg))).encode('utf-8')
+                 for tag_name, msg in tag_msgs.items()]
+    oids = _hash_objects(tag_texts, 'tag')
+
+    cmd_lines = ['update %s %s %s' % (ref, oid, existing[ref])
+                 if ref in existing else
+                 'create %s %s' % (ref, oid)
+                 for ref, oid in zip(refnames, oids)]
+    cmd_lines.extend(extra_ref_cmds)
+    if dry_run:
+        log.warning('PRETEND tags: \n  %s' % '\n  '.join(cmd_lines))
+    else:
+        _update_refs(cmd_lines)
+
+    return dict(zip(tag_msgs, oids))
+
+
+def tag_projects_commit(projects: Sequence[pvproject.Project], msg: str, *,
+                        rev='HEAD',
+                        is_release=False, amend=False,
+                        sign_tag=None, sign_user=None,
+                        dry_run=False,
+                        extra_ref_cmds: Sequence[str] = ()
+                        ) -> Dict[str, Optional[str]]:
+    """
+    Tag `rev` (current commit) with the new version of all `projects`, atomically.
+
+    :param is_release:
+        `False` for version-tags, `True` for release-tags
+    :return:
+        see :func:`tag_commit_atomically()`
+    """
+    tag_msgs = {}
+    forced = set()
+    for proj in projects:
+        tag_name = proj._format_vtag(proj.version, is_release)
+        tag_msgs[tag_name] = msg
+        if amend or proj.is_forced('tag'):
+            forced.add(tag_name)
+
+    return tag_commit_atomically(tag_msgs, rev=rev, forced=forced,
+                                 sign=sign_tag, sign_user=sign_user,
+                                 dry_run=dry_run,
+                                 extra_ref_cmds=extra_ref_cmds)
+
+
+def commit_files_off_worktree(files: Dict[str, bytes], msg: str, *,
+                              parent='HEAD',
+                              sign=None, sign_user=None) -> str:
+    """
+    Commit `files` on top of `parent`, without touching the work-tree, the index or HEAD.
+
+    The tree is built in a temporary index (``GIT_INDEX_FILE``) read from `parent`,
+    with plumbing commands only (``read-tree``, ``hash-object``, ``update-index``,
+    ``write-tree`` & ``commit-tree``);  no ref is moved, so the new commit
+    must be referenced by the caller (e.g. with a tag or a branch).
+
+    :param files:
+        ``{path: bytes}``, with paths relative to the root of the repo (and CWD);
+        files not tracked in `parent` are skipped, like ``git commit --all`` does
+    :return:
+        the new commit-id
+    """
+    import os
+    import tempfile
+    import os.path as osp
+
+    parent_id = cmd.git.rev_parse('%s^{commit}' % parent)
+    with tempfile.TemporaryDirectory(prefix='polyvers-index-') as tdir:
+        index_env = dict(os.environ, GIT_INDEX_FILE=osp.join(tdir, 'index'))
+        PopenCmd(env=index_env).git.read_tree(parent_id)
+
+        modes = {}
+        if files:
+            out = PopenCmd(env=index_env).git._('--literal-pathspecs').ls_files._(
+                '-z', stage=True)('--', *files)
+            for line in out.split('\0'):
+                if line:
+                    mode_oid_stage, path = line.split('\t', 1)
+                    modes[path] = mode_oid_stage.split()[0]
+
+        paths = [p for p in files if p in modes]
+        untracked = files.keys() - modes.keys()
+        if untracked:
+            log.warning("Skipped %i untracked files from release-commit: %s",
+                        len(untracked), ', '.join(sorted(untracked)))
+
+        if paths:
+            oids = _hash_objects([files[p] for p in paths])
+            index_info = ''.join('%s %s\t%s\0' % (modes[p], oid, p)
+                                 for p, oid in zip(paths, oids))
+            PopenCmd(env=index_env, input=index_info
+                     ).git.update_index('-z', index_info=True)
+
+        tree_id = PopenCmd(env=index_env).git.write_tree()
+
+    gpg_sign = (sign_user or True) if sign else None
+    commit_id = PopenCmd(input=_cleanup_message(msg, strip_comments=False)
+                         ).git.commit_tree._(p=parent_id, gpg_sign=gpg_sign
+                                             )('-F', '-', tree_id)
+
+    return commit_id
+
+
 def make_pvtag_project(pname: str = MONOREPO,
                        **project_kw) -> pvproject.Project:
     """
@@ -274,6 +550,10 @@ def populate_pvtags_history(*projects: pvproject.Project,
     :raise sbp.CalledProcessError:
         if `git` executable not in PATH
 
+    .. Note::
+       Tags are fetched from the :mod:`tagindex`, unless disabled
+       with :data:`polyversion.git_cache_envvar`.
+
     .. Note::
        Internally, *pvtags* are populated in :attr:`_pvtags_collected` which
        by default it is ``None``.  After this call, it will be a (possibly empty)
@@ -293,10 +573,15 @@ def populate_pvtags_history(*projects: pvproject.Project,
             tag_patterns.append(proj.tag_fnmatch(is_release))
 
     pnames_msg = ', '.join(p.pname for p in projects)
-    if include_lightweight:
-        tags = _fetch_all_tags(tag_patterns, pnames_msg)
-    else:
-        tags = _fetch_annotated_tags(tag_patterns, pnames_msg)
+    tags = None
+    if pvlib.is_git_cache_enabled(None):
+        with git_project_errors_handled(pnames_msg):
+            tags = tagindex.fetch_tags(tag_patterns, include_lightweight)
+    if tags is None:
+        if include_lightweight:
+            tags = _fetch_all_tags(tag_patterns, pnames_msg)
+        else:
+            tags = _fetch_annotated_tags(tag_patterns, pnames_msg)
 
     for proj in projects:
         proj._pvtags_collected = []
@@ -304,14 +589,175 @@ def populate_pvtags_history(*projects: pvproject.Project,
     assign_tags_to_projects(tags, projects)
 
 
+def describe_projects(*projects: pvproject.Project,
+                      include_lightweight=False,
+                      is_release=None) -> List[Union[str, Exception]]:
+    """
+    Like :meth:`Project.git_describe()` on all `projects`, walking history just once.
+
+    All tags are listed once, and the commits of a single ``git rev-list`` stream
+    (or the pure-python engine, see :data:`polyversion.git_engine_envvar`)
+    are shared among the describe-walks of all projects
+    (see :func:`polyversion.describe_many()`).
+
+    :param include_lightweight, is_release:
+        see :meth:`Project.git_describe()`
+    :return:
+        for each project, the same *pvtag* as ``git describe`` would return,
+        or the exception that :meth:`Project.git_describe()` would raise
+        (e.g. :class:`GitVoidError`)
+    """
+    if not projects:
+        return []
+
+    release_flags = [0, 1] if is_release is None else [bool(is_release)]
+    patterns_list = [[proj.tag_fnmatch(r) for r in release_flags]
+                     for proj in projects]
+    pvtags = pvlib.describe_many('.', patterns_list,
+                                 ['--tags'] if include_lightweight else None,
+                                 pvlib.is_python_git_engine(None))
+
+    results: List[Union[str, Exception]] = []
+    for proj, pvtag in zip(projects, pvtags):
+        try:
+            with git_project_errors_handled(proj.pname):
+                if isinstance(pvtag, Exception):
+                    raise pvtag
+            proj._check_described_pvtag(pvtag, is_release)
+        except Exception as ex:
+            pvtag = ex
+        results.append(pvtag)
+
+    return results
+
+
+def _literal_char(code: int, ignorecase) -> Optional[str]:
+    ":return: the char, lower-cased if `ignorecase`, or `None` if non-ASCII then"
+    c = chr(code)
+    if ignorecase:
+        if code > 127:
+            return None
+        c = c.lower()
+
+    return c
+
+
+def _collect_literal_prefix(parsed, sre_parse, ignorecase, prefix: List[str]) -> bool:
+    "Append literal chars into `prefix`; return false when not all are literals."
+    for op, av in parsed:
+        if op == sre_parse.AT and av in (sre_parse.AT_BEGINNING,
+                                         sre_parse.AT_BEGINNING_STRING):
+            continue
+        if op == sre_parse.LITERAL:
+            c = _literal_char(av, ignorecase)
+            if c is None:
+                return False
+            prefix.append(c)
+            continue
+        if (op == sre_parse.SUBPATTERN and
+                not (len(av) == 4 and (av[1] or av[2])) and  # no local flags
+                _collect_literal_prefix(av[-1], sre_parse, ignorecase, prefix)):
+            continue
+        return False
+
+    return True
+
+
+def _regex_literal_prefix(regex: Pattern) -> str:
+    """
+    The literal text any string matched by `regex` must start with.
+
+    :return:
+        the prefix, lower-cased and ASCII-only if `regex` ignores case
+    """
+    try:
+        from re import _parser as sre_parse  # type: ignore
+    except ImportError:
+        import sre_parse  # type: ignore
+
+    ignorecase = regex.flags & re.IGNORECASE
+    prefix: List[str] = []
+    try:
+        _collect_literal_prefix(sre_parse.parse(regex.pattern, regex.flags),
+                                sre_parse, ignorecase, prefix)
+    except Exception as ex:
+        log.debug("Cannot find literal prefix of regex %r due to: %s", regex, ex)
+        prefix = []
+
+    return ''.join(prefix)
+
+
+class _TagDispatcher:
+    """
+    Assign tags to the 1st project with a regex matching them, in ~O(tags).
+
+    Instead of trying the regexes of all projects for each tag,
+    the literal prefixes of all regexes (mostly the `pname` part)
+    are indexed in tries, and only the projects with prefixes found
+    at the start of a tag are tried, in their original order.
+    """
+
+    def __init__(self, projects: Sequence[pvproject.Project]) -> None:
+        self.projects = projects
+        #: A list of 2-tuples ``(vtag_regex, rtag_regex)`` for each project.
+        self.regexes = [(proj.tag_regex(False), proj.tag_regex(True))
+                        for proj in projects]
+        ## Trie nodes are dicts ``{char: node}``, with project-indices
+        #  under the `None` key of the nodes where their prefixes end.
+        self.case_trie: dict = {}
+        self.nocase_trie: dict = {}
+        for i, regexes in enumerate(self.regexes):
+            for regex in regexes:
+                trie = (self.nocase_trie if regex.flags & re.IGNORECASE
+                        else self.case_trie)
+                node = trie
+                for c in _regex_literal_prefix(regex):
+                    node = node.setdefault(c, {})
+                node.setdefault(None, set()).add(i)
+
+    @staticmethod
+    def _walk(trie, text, candidates):
+        node = trie
+        candidates.update(node.get(None, ()))
+        for c in text:
+            node = node.get(c)
+            if node is None:
+                break
+            candidates.update(node.get(None, ()))
+
+    def candidates(self, pvtag: str) -> List[int]:
+        "The indices of projects that may match `pvtag`, in order."
+        ## Unicode case-folding may match non-ASCII chars against ASCII literals.
+        if not all(ord(c) < 128 for c in pvtag):
+            return list(range(len(self.projects)))
+
+        candidates: set = set()
+        self._walk(self.case_trie, pvtag, candidates)
+        self._walk(self.nocase_trie, pvtag.lower(), candidates)
+
+        return sorted(candidates)
+
+    def dispatch(self, pvtag: str) -> Optional[pvproject.Project]:
+        ":return: the 1st project whose regexes extract a version from `pvtag`"
+        for i in self.candidates(pvtag):
+            ## Like :meth:`Project.version_from_pvtag()`.
+            for regex in self.regexes[i]:
+                m = regex.match(pvtag)
+                if m:
+                    if m.groupdict()['version']:
+                        return self.projects[i]
+                    break
+
+        return None
+
+
 def assign_tags_to_projects(tags: Sequence[str],
                             projects: Sequence[pvproject.Project]):
+    """
+    Append each tag into :attr:`Project._pvtags_collected` of the 1st project parsing it.
+    """
+    dispatcher = _TagDispatcher(projects)
     for pvtag in tags:
-        ## Attempt all projects to parse tags.
-        # and assign it to the 1st one to manage it.
-        #
-        for proj in projects:
-            version = proj.version_from_pvtag(pvtag)
-            if version:
-                proj._pvtags_collected.append(pvtag)
-                break
+        proj = dispatcher.dispatch(pvtag)
+        if proj:
+            proj._pvtags_collected.append(pvtag)
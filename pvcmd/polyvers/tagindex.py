@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015-2018 European Commission (JRC);
+# Licensed under the EUPL 1.2+ (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+#
+"""
+A persistent index of all git tags, stored under ``<git-common-dir>/polyvers/``.
+
+Sorting tags with ``--sort=-taggerdate`` forces git to read all tag-objects
+on every call, which is slow in repos with tens of thousands of tags.
+Instead, the index is updated incrementally, by diffing the current list
+of matched tag-refs (names & oids only, no objects read) against the snapshot
+stored, so that git reads only the new or changed tag-objects.
+"""
+
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import logging
+import re
+
+import polyversion as pvlib
+import os.path as osp
+
+from .utils.oscmd import cmd
+
+
+log = logging.getLogger(__name__)
+
+#: The index file, relative to *git-common-dir*.
+index_fpath = osp.join('polyvers', 'tags-index')
+
+_index_header = 'polyvers-tags-index 1'
+
+#: Above this many new/changed tags, read all tag-objects in one git call,
+#: instead of asking for them by name.
+full_scan_threshold = 500
+
+#: Parses ``(pname, version)`` with the default *pvtag* & *vtag* formats.
+_default_tag_regex = re.compile(r"""(?xi)
+    ^(?:(?P<pname>[A-Z0-9]|[A-Z0-9][A-Z0-9._-]*?[A-Z0-9])-)?
+    [vr](?P<version>\d[^-]*)$
+""")
+
+_ref_details_format = '%09'.join(['%(refname)', '%(objectname)', '%(objecttype)',
+                                  '%(*objectname)', '%(taggerdate:raw)'])
+
+
+class TagEntry(namedtuple('TagEntry', 'name oid objtype target tstamp pname version')):
+    """
+    An index entry for a tag.
+
+    - `name`: the tag-name, without ``refs/tags/``;
+    - `oid`: the object the ref points to;
+    - `objtype`: ``tag`` for annotated tags, ``commit`` for lightweight ones;
+    - `target`: the commit tagged (peeled);
+    - `tstamp`: the tagger-date in seconds, or 0 for lightweight tags;
+    - `pname`, `version`: parsed with the default *pvtag*/*vtag* formats,
+      or empty.
+    """
+    __slots__ = ()
+
+    @property
+    def is_annotated(self):
+        return self.objtype == 'tag'
+
+    @classmethod
+    def parsed(cls, refname, oid, objtype, peeled, taggerdate):
+        "Make an entry from ``git for-each-ref`` fields."
+        name = refname[len('refs/tags/'):]
+        m = _default_tag_regex.match(name)
+        pname, version = m.group('pname', 'version') if m else ('', '')
+
+        return cls(name, oid, objtype, peeled or oid,
+                   int(taggerdate.split(' ', 1)[0] or 0), pname or '', version)
+
+    @classmethod
+    def from_line(cls, line):
+        "Make an entry from a line stored in the index-file."
+        name, oid, objtype, target, tstamp, pname, version = line.split('\t')
+
+        return cls(name, oid, objtype, target, int(tstamp), pname, version)
+
+
+def _parse_for_each_ref(out: str, nfields: int) -> Iterable[List[str]]:
+    "Split fields of unstripped `out`, or the empty fields of the last line are lost."
+    for line in (out or '').split('\n'):
+        if line:
+            fields = line.split('\t')
+            if len(fields) == nfields:
+                yield fields
+
+
+def _git_list_tags(tag_patterns: Sequence[str], include_lightweight: bool,
+                   fmt: str, nfields: int) -> Iterable[List[str]]:
+    """
+    List tags with ``git tag --list`` or ``git for-each-ref refs/tags/...``, as `fmt` fields.
+
+    Git matches `tag_patterns` differently in these 2 commands, so
+    the same command is used both for listing tag-refs & reading their objects.
+    """
+    git = cmd.git
+    if include_lightweight:
+        git.tag('--list', *tag_patterns, format=fmt)
+    else:
+        git.for_each_ref(*('refs/tags/' + p for p in tag_patterns), format=fmt)
+
+    return _parse_for_each_ref(git.stdout, nfields)
+
+
+def _read_tag_entries(refnames: Sequence[str]) -> Dict[str, TagEntry]:
+    """
+    Read the tag-objects of `refnames` from git.
+
+    :return: ``{refname: TagEntry}``
+    """
+    ## Refnames cannot contain glob-chars, so they match literally
+    #  (or their leading dirs, filtered out below).
+    wanted = set(refnames)
+    entries = {}
+    for i in range(0, len(refnames), 200):
+        git = cmd.git
+        git.for_each_ref(*refnames[i:i + 200], format=_ref_details_format)
+        for fields in _parse_for_each_ref(git.stdout, 5):
+            if fields[0] in wanted:
+                entries[fields[0]] = TagEntry.parsed(*fields)
+
+    return entries
+
+
+def _git_tag_refs() -> Set[str]:
+    ":return: the refnames of all tags in the repo, reading no objects"
+    out = cmd.git.for_each_ref('refs/tags', format='%(refname)')
+
+    return set(out.split('\n')) if out else set()
+
+
+def _load_index(fpath: str) -> Dict[str, TagEntry]:
+    ":return: ``{refname: TagEntry}`` stored, or empty if missing/invalid"
+    import io
+
+    try:
+        with io.open(fpath, 'rt', encoding='utf-8') as fp:
+            lines = fp.read().split('\n')
+    except FileNotFoundError:
+        return {}
+    except Exception as ex:
+        log.warning("Ignoring unreadable tags-index '%s' due to: %s", fpath, ex)
+        return {}
+
+    if not lines or lines[0] != _index_header:
+        log.warning("Ignoring tags-index '%s' of unknown format.", fpath)
+        return {}
+
+    entries = {}
+    try:
+        for line in lines[1:]:
+            if line:
+                entry = TagEntry.from_line(line)
+                entries['refs/tags/' + entry.name] = entry
+    except Exception as ex:
+        log.warning("Ignoring corrupted tags-index '%s' due to: %s", fpath, ex)
+        return {}
+
+    return entries
+
+
+def _store_index(fpath: str, entries: Dict[str, TagEntry]):
+    lines = [_index_header]
+    lines.extend('\t'.join(str(f) for f in e) for e in entries.values())
+    try:
+        pvlib.atomic_write_text(fpath, '\n'.join(lines) + '\n')
+    except Exception as ex:
+        log.warning("Cannot store tags-index '%s' due to: %s", fpath, ex)
+
+
+def update_index(tag_patterns: Sequence[str],
+                 include_lightweight=False,
+                 basepath='.') -> Optional[List[TagEntry]]:
+    """
+    Sync the stored tags-index for the matched tags, reading only the new/changed ones.
+
+    :param tag_patterns:
+        matched like ``git tag --list <patterns>``, or like
+        ``git for-each-ref refs/tags/<patterns>`` if not `include_lightweight`
+    :return:
+        the entries of all tags matched (even lightweight ones),
+        or `None` if no repo found (or ``GIT_DIR`` env-var set)
+    :raise CalledProcessError:
+        on any git errors
+    """
+    git_dirs = pvlib.find_git_dirs(basepath)
+    if not git_dirs:
+        return None
+    fpath = osp.join(git_dirs[1], index_fpath)  # refs live in common-dir
+
+    stored = _load_index(fpath)
+    ## {refname: oid}, reading no objects.
+    current = dict(_git_list_tags(tag_patterns, include_lightweight,  # type: ignore
+                                  '%(refname)%09%(objectname)', 2))
+
+    changed = [ref for ref, oid in current.items()
+               if ref not in stored or stored[ref].oid != oid]
+    if changed:
+        if len(changed) > full_scan_threshold:
+            new_entries = {
+                fields[0]: TagEntry.parsed(*fields)
+                for fields in _git_list_tags(tag_patterns, include_lightweight,
+                                             _ref_details_format, 5)}
+        else:
+            new_entries = _read_tag_entries(changed)
+        log.debug("Read %i new/changed tags (out of %i) into tags-index '%s'.",
+                  len(new_entries), len(current), fpath)
+
+        stored.update(new_entries)
+
+    ## Refs stored but not matched now might have been deleted from the repo.
+    stale = stored.keys() - current.keys()
+    if stale:
+        stale -= _git_tag_refs()
+    if stale:
+        log.debug("Dropping %i deleted tags from tags-index '%s'.", len(stale), fpath)
+        for ref in stale:
+            del stored[ref]
+
+    if changed or stale:
+        _store_index(fpath, stored)
+
+    return [stored[ref] for ref, oid in current.items()
+            if ref in stored and stored[ref].oid == oid]
+
+
+def fetch_tags(tag_patterns: Sequence[str],
+               include_lightweight=False,
+               basepath='.') -> Optional[List[str]]:
+    """
+    Like ``git tag --list --sort=-taggerdate <patterns>`` (or only annotated tags), from the index.
+
+    Tags of equal tagger-dates (e.g. all lightweight ones, sorted last)
+    are sorted by name, like git does.
+
+    :param include_lightweight:
+        if false, only annotated tags are returned
+    :return:
+        the matched tag-names, newest first, or `None` if no repo found
+    """
+    entries = update_index(tag_patterns, include_lightweight, basepath)
+    if entries is None:
+        return None
+
+    found: List[Tuple[int, str]] = [(-e.tstamp, e.name)
+                                    for e in entries
+                                    if include_lightweight or e.is_annotated]
+    found.sort()
+
+    return [name for _, name in found]
@@ -14,7 +14,8 @@ The *polyvers* version-configuration tool is generating tags like::
 
 On purpose python code here kept with as few dependencies as possible."""
 
-from typing import Dict
+from typing import Dict, Optional, Tuple
+import atexit
 import logging
 
 import subprocess as sbp
@@ -63,6 +64,13 @@ class _CmdName:
         return "'%s' (command)" % self.path
 
 
+_call_types = {
+    None: {'label': 'EXEC', 'stream': None},
+    False: {'label': 'EXEC(no-stdout)', 'stream': sbp.DEVNULL},
+    True: {'label': 'CALL', 'stream': sbp.PIPE},
+}
+
+
 def exec_cmd(cmd,
              dry_run=False,
              check_stdout=True,
@@ -77,12 +85,7 @@ def exec_cmd(cmd,
         True: Popen(stdout=sbp.PIPE), collected & returned
     """
     log = logging.getLogger(__name__)
-    call_types = {
-        None: {'label': 'EXEC', 'stream': None},
-        False: {'label': 'EXEC(no-stdout)', 'stream': sbp.DEVNULL},
-        True: {'label': 'CALL', 'stream': sbp.PIPE},
-    }
-    stdout_ctype = call_types[check_stdout]
+    stdout_ctype = _call_types[check_stdout]
     cmd_label = stdout_ctype['label']
     cmd_str = format_syscmd(cmd)
 
@@ -96,7 +99,7 @@ def exec_cmd(cmd,
         res: sbp.CompletedProcess = sbp.run(
             cmd,
             stdout=stdout_ctype['stream'],
-            stderr=call_types[check_stderr]['stream'],
+            stderr=_call_types[check_stderr]['stream'],
             encoding=encoding,
             errors=encoding_errors,
             **popen_kws
@@ -110,6 +113,15 @@ def exec_cmd(cmd,
 
         raise
 
+    return _check_result(res, cmd_label, cmd_str,
+                         check_stdout, check_stderr, check_returncode)
+
+
+def _check_result(res: sbp.CompletedProcess, cmd_label, cmd_str,
+                  check_stdout, check_stderr, check_returncode):
+    "Log & scream (if asked) for a finished command, like :func:`exec_cmd()`."
+    log = logging.getLogger(__name__)
+
     if res.returncode:
         log.log(
             logging.DEBUG if check_returncode else logging.WARNING,
@@ -141,6 +153,115 @@ def exec_cmd(cmd,
     return res
 
 
+async def exec_cmd_async(cmd,
+                         dry_run=False,
+                         check_stdout=True,
+                         check_stderr=True,
+                         check_returncode=True,
+                         encoding='utf-8', encoding_errors='surrogateescape',
+                         input=None,  # noqa: A002
+                         universal_newlines=None,
+                         **popen_kws):
+    """
+    Like :func:`exec_cmd()`, but running in an :mod:`asyncio` subprocess.
+
+    :param input:
+        text (or bytes, if no `encoding`) fed into the command's STDIN
+    :param popen_kws:
+        passed to :func:`asyncio.create_subprocess_exec()` (e.g. `cwd`, `env`)
+    :return:
+        the :class:`subprocess.CompletedProcess`, or `None` if `dry_run`
+    """
+    import asyncio
+
+    log = logging.getLogger(__name__)
+    stdout_ctype = _call_types[check_stdout]
+    cmd_label = 'A' + stdout_ctype['label']
+    cmd_str = format_syscmd(cmd)
+
+    log.debug('%s%s %r', 'DRY_' if dry_run else '', cmd_label, cmd_str)
+
+    if dry_run:
+        return
+
+    if isinstance(input, str) and encoding:
+        input = input.encode(encoding, encoding_errors)  # noqa: A001
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=sbp.PIPE if input is not None else None,
+            stdout=stdout_ctype['stream'],
+            stderr=_call_types[check_stderr]['stream'],
+            **popen_kws)
+    except FileNotFoundError as ex:
+        if not ex.filename:
+            ex.filename = _CmdName(cmd[0])
+
+        raise
+
+    stdout, stderr = await proc.communicate(input)
+    if encoding:
+        ## Universal-newlines, like :func:`subprocess.run()` with `encoding`.
+        stdout, stderr = [
+            None if b is None else
+            b.decode(encoding, encoding_errors).replace('\r\n', '\n').replace('\r', '\n')
+            for b in (stdout, stderr)]
+    res = sbp.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+    return _check_result(res, cmd_label, cmd_str,
+                         check_stdout, check_stderr, check_returncode)
+
+
+#: The maximum number of commands running in parallel by :func:`run_concurrently()`.
+max_concurrent_cmds = 8
+
+
+def run_concurrently(*awaitables, max_concurrent: int = None,
+                     return_exceptions=False) -> list:
+    """
+    Sync facade running `awaitables` (e.g. :data:`acmd` calls) in parallel.
+
+    :param max_concurrent:
+        at most that many awaitables run at a time;
+        if not given, :data:`max_concurrent_cmds`
+    :param return_exceptions:
+        like in :func:`asyncio.gather()`, errors are returned instead of raised
+    :return:
+        a list with the results of each awaitable, in the same order
+
+    Each call runs in a new event-loop, so it cannot be used from code
+    already running inside an event-loop (use the coroutines directly there).
+    """
+    import asyncio
+    import sys
+
+    if not awaitables:
+        return []
+
+    async def run_all():
+        ## Created inside the loop, for python < 3.10.
+        sem = asyncio.Semaphore(max_concurrent or max_concurrent_cmds)
+
+        async def bounded(aw):
+            async with sem:
+                return await aw
+
+        return await asyncio.gather(*(bounded(aw) for aw in awaitables),
+                                    return_exceptions=return_exceptions)
+
+    ## Subprocesses need the proactor-loop on Windows for python < 3.8.
+    loop = (asyncio.ProactorEventLoop()  # type: ignore
+            if sys.platform == 'win32' else
+            asyncio.new_event_loop())
+    ## Child-watchers on *nix need the loop set, for python < 3.8.
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(run_all())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
 def _as_flag(k):
     return k.replace('_', '-')
 
@@ -257,3 +378,220 @@ class PopenCmd:
 
 
 cmd = PopenCmd()
+
+
+class _AsyncCli(_Cli):
+    async def __call__(self, *args, **kw) -> str:  # type: ignore
+        self._extend_cmdlist(args, kw)
+        res = await exec_cmd_async(self._cmdlist, **self._popen_kw)
+        if res is None:  # dry-run
+            return None
+        self.rc = res.returncode
+        self.stderr = res.stderr
+        self.stdout = res.stdout  # keep unstripped stdout
+
+        if self._popen_kw['check_stdout']:
+            return res.stdout and res.stdout.strip()
+
+
+class AsyncPopenCmd(PopenCmd):
+    """
+    Like :class:`PopenCmd`, but calls return coroutines, to run commands in parallel.
+
+    To fetch the log & tags of a repo concurrently::
+
+        log, tags = run_concurrently(acmd.git.log(n=1), acmd.git.tag())
+
+    :raise sbp.CalledProcessError:
+        if check_returncode=true and exit code is non-zero, and
+        :class:`pvtags.NoGitRepoError` if not in a git repo, like :class:`PopenCmd`.
+    """
+    def __getattr__(self, attr):
+        return _AsyncCli(self._popen_kw, attr)
+
+
+acmd = AsyncPopenCmd()
+
+
+class CatFileBatch:
+    """
+    A long-lived ``git cat-file --batch`` process, reading objects over its pipes.
+
+    Each object read costs a round-trip over the pipes, not a new process.
+    The process is (re)started lazily, so it is restarted automatically
+    if it dies (up to `max_restarts` times), and it is killed on :meth:`close()`
+    (or when used as a context-manager, or at exit if pooled by :func:`cat_file()`).
+
+    To read the message of an annotated tag::
+
+        with CatFileBatch() as cf:
+            oid, objtype, data = cf.read('v0.1.0')
+            msg = data.decode('utf-8').split('\\n\\n', 1)[1]
+
+    Not thread-safe; use a separate instance per thread
+    (or the ones from :func:`cat_file()`).
+    """
+    def __init__(self, check_only=False, cwd=None, max_restarts=3):
+        """
+        :param check_only:
+            if true, run ``--batch-check``, reading only object infos, not contents
+        :param cwd:
+            the dir to launch git from (default: current one)
+        """
+        self.check_only = check_only
+        self.cwd = cwd
+        self.max_restarts = max_restarts
+        self.nstarts = 0
+        self.cmd = ['git', 'cat-file',
+                    '--batch-check' if check_only else '--batch']
+        self._proc: Optional[sbp.Popen] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+    def _start(self) -> sbp.Popen:
+        if self.nstarts > self.max_restarts:
+            raise sbp.CalledProcessError(
+                -1, self.cmd,
+                stderr="Giving up after %i restarts!" % self.max_restarts)
+
+        log = logging.getLogger(__name__)
+        log.debug('%s %r', 'START' if not self.nstarts else 'RESTART',
+                  format_syscmd(self.cmd))
+        self.nstarts += 1
+        try:
+            self._proc = sbp.Popen(self.cmd, cwd=self.cwd,
+                                   stdin=sbp.PIPE, stdout=sbp.PIPE, stderr=sbp.PIPE)
+        except FileNotFoundError as ex:
+            if not ex.filename:
+                ex.filename = _CmdName(self.cmd[0])
+            raise
+
+        return self._proc
+
+    def close(self):
+        "Stop the git process (if running); it restarts on the next read."
+        proc, self._proc = self._proc, None
+        if proc:
+            try:
+                proc.stdin.close()  # type: ignore
+                proc.wait(1)
+            except Exception:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()  # type: ignore
+            proc.stderr.close()  # type: ignore
+
+    def _died(self, proc: sbp.Popen):
+        "Scream if git exited reporting an error (e.g. not in a git-repo)."
+        self._proc = None
+        proc.kill()
+        proc.wait()
+        err = proc.stderr.read()  # type: ignore
+        for pipe in (proc.stdin, proc.stdout, proc.stderr):
+            try:
+                pipe.close()  # type: ignore
+            except OSError:
+                pass
+        if proc.returncode and err:
+            res = sbp.CompletedProcess(self.cmd, proc.returncode, b'', err)
+            _check_result(res, 'CALL', format_syscmd(self.cmd), True, True, True)
+
+    def _request(self, rev: str):
+        """:return: the header fields, or `None` if object is missing"""
+        if '\n' in rev:
+            raise ValueError("Invalid object-name with newline: %r" % rev)
+
+        while True:
+            proc = self._proc or self._start()
+            try:
+                proc.stdin.write(rev.encode('utf-8') + b'\n')
+                proc.stdin.flush()
+                header = proc.stdout.readline()
+            except (OSError, ValueError):  # broken/closed pipes
+                header = b''
+            if header:
+                break
+            self._died(proc)
+
+        fields = header.decode('utf-8', 'surrogateescape').split()
+        if len(fields) != 3:  # e.g. "<rev> missing", "<rev> ambiguous"
+            return None
+
+        return fields
+
+    def info(self, rev: str) -> Optional[Tuple[str, str, int]]:
+        """
+        :param rev:
+            any git object-name (e.g. sha, tag-name, ``HEAD:setup.py``)
+        :return:
+            a 3-tuple ``(oid, objtype, size)``, or `None` if object is missing
+        """
+        fields = self._request(rev)
+        if fields is None:
+            return None
+
+        oid, objtype, size = fields
+        if not self.check_only:
+            ## Consume content, to keep protocol in sync.
+            self._proc.stdout.read(int(size) + 1)  # type: ignore
+
+        return oid, objtype, int(size)
+
+    def read(self, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        :param rev:
+            any git object-name (e.g. sha, tag-name, ``HEAD:setup.py``)
+        :return:
+            a 3-tuple ``(oid, objtype, data)``, or `None` if object is missing
+        """
+        if self.check_only:
+            raise ValueError("Cannot read objects with `--batch-check`!")
+
+        fields = self._request(rev)
+        if fields is None:
+            return None
+
+        oid, objtype, size = fields
+        size = int(size)
+        proc = self._proc
+        data = proc.stdout.read(size + 1)  # type: ignore
+        if len(data) != size + 1:
+            self._died(proc)  # type: ignore
+            raise EOFError("Truncated object '%s' from %r!" %
+                           (rev, format_syscmd(self.cmd)))
+
+        return oid, objtype, data[:-1]
+
+
+#: {(cwd, check_only, thread-id): CatFileBatch}, see :func:`cat_file()`
+_cat_file_pool: Dict[Tuple[str, bool, int], CatFileBatch] = {}
+
+
+def cat_file(check_only=False, cwd=None) -> CatFileBatch:
+    """
+    The shared :class:`CatFileBatch` for `cwd` (the current dir if not given) & thread.
+
+    They all get closed at exit, or with :func:`close_cat_files()`.
+    """
+    import os
+    import threading
+
+    key = (os.path.abspath(cwd or os.curdir), bool(check_only),
+           threading.get_ident())
+    cf = _cat_file_pool.get(key)
+    if cf is None:
+        cf = _cat_file_pool[key] = CatFileBatch(check_only, key[0])
+
+    return cf
+
+
+@atexit.register
+def close_cat_files():
+    "Stop all pooled `git cat-file` processes (see :func:`cat_file()`)."
+    while _cat_file_pool:
+        _key, cf = _cat_file_pool.popitem()
+        cf.close()
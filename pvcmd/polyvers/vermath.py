@@ -8,7 +8,10 @@
 #
 """Validate absolute versions or add relative ones on top of a base absolute."""
 
-from typing import Union, Optional
+from typing import Iterable, List, Optional, Tuple, Union
+import bisect
+import functools as fnt
+import logging
 import re
 
 from packaging.version import InvalidVersion, Version, _parse_letter_version
@@ -19,6 +22,8 @@ from ._vendor.traitlets import traitlets as trt
 from .cmdlet import cmdlets
 
 
+log = logging.getLogger(__name__)
+
 VerLike = Union[str, Version]
 
 
@@ -26,9 +31,14 @@ class VersionError(cmdlets.CmdException):
     pass
 
 
+@fnt.lru_cache(maxsize=4096)
+def _parse_version(vstr: str) -> Version:
+    return Version(vstr)
+
+
 def _packver(v: VerLike) -> Version:
     try:
-        return v if isinstance(v, Version) else Version(str(v))
+        return v if isinstance(v, Version) else _parse_version(str(v))
     except InvalidVersion as ex:
         raise VersionError(str(ex))
 
@@ -204,3 +214,83 @@ def add_versions(v1: VerLike, *rel_versions: VerLike) -> Version:
         raise VersionError("Backward bump is forbidden: %s -/-> %s" %
                            (v1, new_version))
     return new_version
+
+
+def parse_version_range(text: str) -> Tuple[Optional[Version], Optional[Version]]:
+    """
+    Parse ``[<low>]..[<high>]`` (or just ``<high>``) into absolute versions.
+
+    :return:
+        a 2-tuple ``(low, high)``, any of them `None` if missing;
+        a single version ``X`` is treated as ``..X``
+    :raise VersionError:
+        when any of the bounds is not a valid :pep:`440` version
+    """
+    low, _sep, high = text.strip().rpartition('..')
+
+    return (low and _packver(low.strip()) or None,
+            high and _packver(high.strip()) or None)
+
+
+class VersionHistory:
+    """
+    Tags sorted by their :pep:`440` versions, for ``O(log n)`` lookups.
+
+    Ties of equal versions are sorted by tag-name.
+    """
+    def __init__(self, tag_versions: Iterable[Tuple[str, VerLike]] = ()) -> None:
+        """
+        :param tag_versions:
+            ``(tag, version)`` pairs;  tags with invalid versions are ignored
+        """
+        entries = []
+        for tag, version in tag_versions:
+            try:
+                entries.append((_packver(version), tag))
+            except VersionError as ex:
+                log.debug("Ignoring tag '%s' with invalid version: %s", tag, ex)
+        entries.sort()
+
+        self._versions = [v for v, _t in entries]
+        self._tags = [t for _v, t in entries]
+
+    def __len__(self):
+        return len(self._versions)
+
+    def __iter__(self):
+        "Iterate ``(version, tag)`` pairs, lowest version first."
+        return zip(self._versions, self._tags)
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, self._tags)
+
+    def latest(self, nth=0) -> Optional[Tuple[Version, str]]:
+        """
+        :param nth:
+            0 for the greatest version, 1 for the one before it, etc
+        :return:
+            the ``(version, tag)`` pair, or `None` if history not that long
+        """
+        i = len(self._versions) - 1 - nth
+        if nth < 0 or i < 0:
+            return None
+
+        return self._versions[i], self._tags[i]
+
+    def in_range(self, low: VerLike = None,
+                 high: VerLike = None) -> List[Tuple[Version, str]]:
+        """
+        :param low:
+            the inclusive lower bound, or `None` for unbounded
+        :param high:
+            the exclusive upper bound, or `None` for unbounded
+        :return:
+            the ``(version, tag)`` pairs within range, lowest version first
+        """
+        versions = self._versions
+        start = 0 if low is None else bisect.bisect_left(versions, _packver(low))
+        end = (len(versions)
+               if high is None else
+               bisect.bisect_left(versions, _packver(high)))
+
+        return list(zip(versions[start:end], self._tags[start:end]))
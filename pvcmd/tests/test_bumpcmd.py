@@ -196,3 +196,45 @@ def test_bump_cmd_monorepo(mutable_repo, caplog, capsys):
         ])
     out, err = capsys.readouterr()
     assert not out and not err
+
+
+def test_bump_cmd_off_worktree(mutable_repo, caplog, capsys):
+    mutable_repo.chdir()
+
+    caplog.clear()
+    setupy_fpath = make_setup_py(mutable_repo, 'simple')
+    setuppy_orig = setupy_fpath.read_text(encoding='utf-8')
+    head = cmd.git.rev_parse('HEAD')
+
+    rc = cli.run('bump  -v --monorepo --off-worktree 0.0.1'.split())
+    assert rc == 0
+    check_text(
+        caplog.text,
+        require=[
+            r"Bumped projects",
+            r"simple-0.0.0 --> 0.0.1",
+        ])
+    out, err = capsys.readouterr()
+    assert not out and not err
+
+    ## Work-tree, index & HEAD untouched.
+    assert cmd.git.rev_parse('HEAD') == head
+    assert cmd.git.symbolic_ref('HEAD') == 'refs/heads/master'
+    assert not cmd.git.status(porcelain=True)
+    assert setupy_fpath.read_text(encoding='utf-8') == setuppy_orig
+
+    gitlog = cmd.git.log(format="format:%s %d", all=True)
+    exp = tw.dedent("""\
+        chore(ver): bump simple-r0.0.0 -> 0.0.1  (tag: simple-r0.0.1, latest)
+        added 'setup.py'  (HEAD -> master, tag: simple-v0.0.1)
+        some_msg  (origin/master, origin/HEAD)""")
+    assert exp in gitlog
+    assert re.search("version *= *'0.0.1',", cmd.git.show('latest:setup.py'))
+
+    ## The existing release-branch moves to the next release.
+    cmd.git.commit(m='more', allow_empty=True)
+    rc = cli.run('bump  --monorepo --off-worktree 0.0.2'.split())
+    assert rc == 0
+    assert cmd.git.rev_parse('latest~') == cmd.git.rev_parse('HEAD')
+    assert cmd.git.rev_parse('latest') == cmd.git.rev_parse('simple-r0.0.2^{}')
+    assert re.search("version *= *'0.0.2',", cmd.git.show('latest:setup.py'))
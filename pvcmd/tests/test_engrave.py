@@ -11,9 +11,11 @@ from polyvers import engrave
 from polyvers._vendor.traitlets.config import Config
 from polyvers.cmdlet.slicetrait import _parse_slice
 from polyvers.pvproject import Project, Graft, _slices_to_ids
+from polyvers.utils import fileutil as fu
 from polyvers.utils.logconfutils import init_logging
 from pprint import pformat  # noqa: F401  @UnusedImport
 from tests import conftest
+from tests.conftest import touchpaths
 import logging
 import re
 
@@ -96,27 +98,12 @@ def test_glob_negatives(globs, exp, fileset):
     assert posixize(files) == exp.split()
 
 
-def test_glob_mybase():
-    files = [Path('../a')]
-    assert engrave._glob_filter_in_mybase(files, '.') == []
-    assert engrave._glob_filter_in_mybase(files, Path('.').resolve() / 'b') == []
-
-
 def test_glob_relative(fileset):
     (fileset / 'a').chdir()
     files = engrave.glob_files(['*', '../b/f*'])
     assert posixize(files) == 'f1 f2 f3'.split()
 
 
-def test_glob_filter_out_other_bases(fileset, orig_files):
-    fileset.chdir()
-    search_files = [Path(f) for f in orig_files]
-    obases = [Path('b')]
-    filtered_files = engrave._glob_filter_out_other_bases(search_files, obases)
-    assert filtered_files == [f for f in search_files
-                              if str(f).startswith('a')]
-
-
 def test_glob_otherbases(fileset, orig_files):
     fileset.chdir()
     files = engrave.glob_files(['*/*'], other_bases=['b'])
@@ -129,6 +116,145 @@ def test_glob_otherbases(fileset, orig_files):
     assert files == [Path(f) for f in orig_files]
 
 
+@pytest.mark.parametrize('pattern', [
+    '**/f*', 'a/f?', '*/*', '**/[ab]/f[!1]', '**', 'a/**', '**/b/**/*',
+    '**/nothing', 'a/f[', '**/.h*', 'c/**/*.py', '**/**',
+    ## Symlinked dirs, crossed by all but ``**``.
+    'l/*', '*/x.py', '*/*/*', '**/x.py', 'l/**', 'l/**/*.py', '**/l/d/*', 'l/d/**',
+])
+def test_compile_glob_like_pathlib(tmpdir, pattern):
+    import os
+
+    tmpdir.chdir()
+    touchpaths(tmpdir, """
+        a/f1
+        a/f2
+        b/f1
+        b/f2
+        b/sub/b/f3
+        c/d/e/x.py
+        c/x.py
+        .hidden/f1
+        a/f[
+    """)
+    os.symlink('c', 'l')
+    os.symlink('..', 'c/d/up')  # A loop, not to be walked.
+    exp = sorted(p.as_posix() for p in Path('.').glob(pattern) if str(p) != '.')
+    regex, dirs_only = engrave._compile_glob(pattern)
+    got = sorted(rpath
+                 for rpath, is_dir, links in engrave._walk_tree('.', lambda d: True)
+                 if (is_dir or not dirs_only) and
+                 engrave._glob_fullmatch(regex, rpath, 0, links))
+    assert got == exp
+
+
+def test_glob_symlinked_dirs(tmpdir):
+    import os
+
+    tmpdir.chdir()
+    touchpaths(tmpdir, """
+        real/setup.py
+    """)
+    os.symlink('real', 'link')
+    files = engrave.glob_files(['/link/setup.py', '/*/setup.py'])
+    assert sorted(posixize(files)) == ['link/setup.py', 'real/setup.py']
+
+    files = engrave.glob_files(['**/setup.py'])
+    assert posixize(files) == ['real/setup.py']
+
+
+def test_glob_many_files(fileset, monkeypatch):
+    fileset.chdir()
+    jobs = [
+        (['/a/f*', 'b/f?'], '.', None),
+        (['f1', '!x'], 'a', ['b']),
+        (['*/*'], '.', ['b']),
+        (['**/f*'], 'b', ['.', 'b']),
+    ]
+    exp = [engrave.glob_files(*job) for job in jobs]
+
+    nwalks = []
+    orig_walk = engrave._walk_tree
+
+    def spy_walk(*args):
+        nwalks.append(args[0])
+        return orig_walk(*args)
+
+    monkeypatch.setattr(engrave, '_walk_tree', spy_walk)
+    assert engrave.glob_many_files(jobs) == exp
+    assert len(nwalks) == 1
+    assert [sorted(posixize(files)) for files in exp] == [
+        'a/f1 a/f2 a/f3 b/f1 b/f2 b/f3'.split(),
+        ['a/f1'],
+        'a/f1 a/f2 a/f3'.split(),
+        'b/f1 b/f2 b/f3'.split(),
+    ]
+
+
+def test_glob_nested_bases(tmpdir, monkeypatch):
+    import os
+
+    tmpdir.chdir()
+    touchpaths(tmpdir, """
+        f0
+        a/f1
+        b/f2
+        b/sub/f3
+        b/sub/deep/f4
+        c/f5
+    """)
+    obases = ['.', 'b', 'b/sub', Path('c').resolve()]
+
+    scanned = []
+    orig_scandir = os.scandir
+
+    def spy_scandir(path):
+        scanned.append(Path(path).relative_to(tmpdir).as_posix())
+        return orig_scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', spy_scandir)
+    files = engrave.glob_many_files([
+        (['**/f*'], '.', obases),
+        (['**/f*'], 'b/sub', obases),
+    ])
+    assert [sorted(posixize(fs)) for fs in files] == [
+        ['a/f1', 'f0'],
+        ['b/sub/deep/f4', 'b/sub/f3'],
+    ]
+    ## Neither `c/` nor `b/` contents were walked (`b/sub/` belongs to a job).
+    assert sorted(scanned) == ['.', 'a', 'b', 'b/sub', 'b/sub/deep']
+
+    ## Like the brute-force filtering.
+    fs = [Path(f) for f in 'f0 a/f1 b/f2 b/sub/f3 b/sub/deep/f4 c/f5'.split()]
+    assert [f for f in fs
+            if not any(fu._is_base_or_same(Path(obase), f) in (None, True)
+                       for obase in obases[1:])] == files[0]
+
+
+@pytest.mark.parametrize('file_source, exp', [
+    ('fs', 'a/setup.py b/setup.py build/setup.py'),
+    ('git', 'a/setup.py'),
+    ('git+untracked', 'a/setup.py b/setup.py'),
+])
+def test_glob_file_sources(tmpdir, file_source, exp):
+    from polyvers.utils.oscmd import cmd
+
+    tmpdir.chdir()
+    touchpaths(tmpdir, """
+        a/setup.py
+        a/gone/setup.py
+        b/setup.py
+        build/setup.py
+    """)
+    (tmpdir / '.gitignore').write('build/\n')
+    cmd.git.init()
+    cmd.git.add('a', '.gitignore')
+    (tmpdir / 'a' / 'gone' / 'setup.py').remove()
+
+    files = engrave.glob_files(['**/setup.py', '!gone'], file_source=file_source)
+    assert sorted(posixize(files)) == exp.split()
+
+
 slices_test_data = [
     ('-1:', 5, [4]),
     ([1, '3'], 5, [1, 3]),
@@ -200,6 +326,35 @@ def test_overlapped_matches():
     }
 
 
+class _FakeMatch:
+    "Cheaper than mocks, for many matches."
+    def __init__(self, span):
+        self._span = span
+
+    def span(self):
+        return self._span
+
+
+def _random_matches(n, seed=0, density=4):
+    import random
+
+    rnd = random.Random(seed)
+    spans = sorted((start, start + rnd.randint(0, 6))
+                   for start in (rnd.randint(0, density * n) for _ in range(n)))
+
+    return [_FakeMatch(span) for span in spans]
+
+
+@pytest.mark.parametrize('no_touch', [False, True])
+@pytest.mark.parametrize('n, density', [
+    (0, 4), (1, 4), (2, 1), (16, 1), (300, 1), (300, 4), (300, 16)])
+@pytest.mark.parametrize('seed', range(4))
+def test_overlapped_matches_sweep_like_pairwise(seed, n, density, no_touch):
+    matches = _random_matches(n, seed, density)
+    exp = engrave._overlapped_matches_pairwise(matches, no_touch)
+    assert engrave.overlapped_matches(matches, no_touch) == exp
+
+
 def test_scan(fileset_mutable, orig_files, f1_graft, f2_graft, caplog):
     caplog.set_level(0)
     fileset_mutable.chdir()
@@ -247,7 +402,9 @@ def test_engrave(fileset_mutable, ok_files, f1_graft, f2_graft, caplog):
         assert ftxt == tw.dedent(text)
 
 
-def test_engrave_duped_scans(fileset_mutable, ok_files, f1_graft, f2_graft, caplog):
+@pytest.mark.parametrize('merge_grafts', [False, True])
+def test_engrave_duped_scans(fileset_mutable, ok_files, f1_graft, f2_graft, caplog,
+                             merge_grafts):
     caplog.set_level(0)
     fileset_mutable.chdir()
     cfg = Config()
@@ -269,7 +426,7 @@ def test_engrave_duped_scans(fileset_mutable, ok_files, f1_graft, f2_graft, capl
     }]
     prj2 = Project(config=cfg)
 
-    fproc = engrave.FileProcessor()
+    fproc = engrave.FileProcessor(merge_grafts=merge_grafts)
     fproc.scan_projects([prj1, prj2])
     fproc.engrave_matches()
     #print(pformat(match_map))
@@ -278,3 +435,112 @@ def test_engrave_duped_scans(fileset_mutable, ok_files, f1_graft, f2_graft, capl
     for fpath, text in ok_files.items():
         ftxt = (fileset_mutable / fpath).read_text('utf-8')
         assert ftxt == tw.dedent(text)
+
+
+def test_engrave_many_matches(tmpdir, f1_graft):
+    tmpdir.chdir()
+    text = ''.join('k%i = v%i\nleave %i\n' % (i, i, i) for i in range(2000))
+    (tmpdir / 'big.txt').write_binary(text.encode('utf-8'))
+
+    cfg = Config()
+    cfg.Project.pname = 'prj1'
+    cfg.Project.engraves = [{'globs': ['big.txt'], 'grafts': [f1_graft]}]
+    fproc = engrave.FileProcessor()
+    fproc.scan_projects([Project(config=cfg)])
+    assert fproc.nmatches() == 2000
+
+    fproc.engrave_matches()
+    exp = re.sub(f1_graft['regex'], f1_graft['subst'], text)
+    assert (tmpdir / 'big.txt').read_binary().decode('utf-8') == exp
+
+
+@pytest.mark.parametrize('pkg_init', ['polyvers', 'polyversion'])
+def test_engrave_lazy_version_attributes(tmpdir, pkg_init):
+    """The default ``py-version`` engrave must match the lazy-attributes layout."""
+    pkg_init = __import__(pkg_init).__file__
+    tmpdir.chdir()
+    init_fpath = tmpdir / '__init__.py'
+    init_fpath.write_binary(Path(pkg_init).read_bytes())
+
+    prj = Project(pname='lazy', version='1.2.3', release_date='2018-06-21',
+                  enabled_engraves=['py-version'])
+    fproc = engrave.FileProcessor()
+    fproc.scan_projects([prj])
+    assert fproc.nmatches() == 2
+
+    fproc.engrave_matches()
+    text = init_fpath.read_text('utf-8')
+    assert re.search(r"^__version__ = '1.2.3'$", text, re.M)
+    assert re.search(r"^__updated__ = '2018-06-21'$", text, re.M)
+
+
+def test_merge_regexes():
+    regexes = [
+        re.compile(rb'(?m)^(\w+) *= *(\w+)$'),
+        re.compile(rb'(?xi) a \ b  # comment'),
+        re.compile(rb'(?m)^(\w+) *= *(\w+)$'),  # same as 1st
+        re.compile(rb'(a)\1'),  # back-ref
+        None,
+        re.compile(rb'(?P<pname>foo)'),
+        re.compile(rb'(?P<pname>bar)'),  # name-clash
+        re.compile(rb'(?L)a'),  # unscopable flag
+    ]
+    scanners, fallbacks = engrave._merge_regexes(regexes)
+    assert fallbacks == [3, 4, 7]
+    assert [owners for _merged, _alts, owners in scanners] == [
+        [[0, 2], [1], [5]],
+        [[6]],
+    ]
+
+
+@pytest.mark.parametrize('regexes', [
+    [rb'(?m)^(\w+) *= *(\w+)', rb'(?m)^CHANGE\s+THESE'],
+    [rb'(?x) \b ver (sion)?  # comment', rb'(?i)VERSION', rb'(?s)v.'],
+    [rb'(?m)^a', rb'(?m)a$', rb'\ba\b', rb'(?<=a)b'],
+])
+def test_scan_merged_like_separate(regexes):
+    text = tw.dedent("""
+        version = 1
+        a = b
+        CHANGE
+        THESE ab
+        Version  a
+        v
+        ver
+    """).encode('utf-8')
+    regexes = [re.compile(r) for r in regexes]
+
+    scanners, fallbacks = engrave._merge_regexes(regexes)
+    assert not fallbacks and len(scanners) == 1
+    merged, alts, _owners = scanners[0]
+    matches = engrave._scan_merged(merged, alts, text)
+
+    ## Hidden hits overlap the hits of other grafts.
+    sep_matches = [list(r.finditer(text)) for r in regexes]
+    all_sep = sorted((m for ms in sep_matches for m in ms), key=lambda m: m.start())
+    bad = engrave.overlapped_matches(all_sep)
+    exp = [[(m.span(), m.groups()) for m in ms if m not in bad]
+           for ms in sep_matches]
+    assert [[(m.span(), m.groups()) for m in ms] for ms in matches] == exp
+
+
+def test_engrave_merged_grafts(fileset_mutable, ok_files, f1_graft, f2_graft):
+    fileset_mutable.chdir()
+    cfg = Config()
+    cfg.Project.pname = 'prj1'
+    cfg.Project.current_version = '0.0.0'
+    cfg.Project.version = '0.0.1'
+    cfg.Project.engraves = [{
+        'globs': ['/a/f*', 'b/f1', '/b/f2', 'b/?3'],
+        'grafts': [f1_graft, f2_graft, {'regex': r'(\w)\1'}],
+    }]
+
+    prj = Project(config=cfg)
+    fproc = engrave.FileProcessor(merge_grafts=True)
+    fproc.scan_projects([prj])
+    fproc.engrave_matches()
+    assert fproc.nmatches() == 4
+
+    for fpath, text in ok_files.items():
+        ftxt = (fileset_mutable / fpath).read_text('utf-8')
+        assert ftxt == tw.dedent(text)
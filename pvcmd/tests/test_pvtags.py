@@ -106,6 +106,46 @@ def test_pvtag_Project_interpolations():
     assert r'f\*o' in proj.tag_regex().pattern
 
 
+def test_Project_tag_patterns_memoized():
+    proj = pvtags.make_pvtag_project(pname='foo')
+
+    regex = proj.tag_regex()
+    assert proj.tag_regex() is regex
+    assert proj.tag_regex(True) is not regex
+    assert proj._format_vtag('1.2.3') == 'foo-v1.2.3'
+
+    ## Clones do not share stale patterns.
+    clone = proj.replace(pname='bar')
+    assert 'bar' in clone.tag_regex().pattern
+    assert 'bar' in clone.tag_fnmatch()
+    assert clone._format_vtag('1.2.3') == 'bar-v1.2.3'
+    assert proj.tag_regex() is regex
+    assert proj._format_vtag('1.2.3') == 'foo-v1.2.3'
+
+    proj.tag_vprefixes = ('V', 'R')
+    assert proj.tag_fnmatch(True) == 'foo-R*'
+    proj.pvtag_format = '{pname}/{vprefix}{version}'
+    assert proj.tag_fnmatch() == 'foo/V*'
+    proj.pvtag_regex = '{pname}_{vprefix}(?P<version>.*)'
+    assert proj.version_from_pvtag('foo_R1.0') == '1.0'
+
+    ## Not memoized when depending on non-observed keys.
+    proj.pvtag_format = '{pname}-{start_version_id}-{vprefix}{version}'
+    assert proj.tag_fnmatch() == 'foo-0.0.0-V*'
+    proj.start_version_id = '1.0.0'
+    assert proj.tag_fnmatch() == 'foo-1.0.0-V*'
+
+    ## Nor when overriden by user-map.
+    proj.pvtag_format = '{pname}-{vprefix}{version}'
+    assert proj.tag_fnmatch() == 'foo-V*'
+    proj.interpolations['pname'] = 'user'
+    try:
+        assert proj.tag_fnmatch() == 'user-V*'
+    finally:
+        del proj.interpolations['pname']
+    assert proj.tag_fnmatch() == 'foo-V*'
+
+
 def test_vtag_Project_interpolations():
     with pytest.raises(trt.TraitError, match="Invalid version: '1.2.3"):
         pvtags.make_vtag_project(version='1.2.3(-: ')
@@ -143,6 +183,26 @@ def test_populate_pvtags_history_per_project(ok_repo, project1, project2, foo):
     assert project2.pvtags_history == ['proj-2-V0.2.1', 'proj-2-V0.2.0']
 
 
+def test_Project_version_history(project1):
+    project1._pvtags_collected = ['proj1-v0.0.10', 'proj1-v0.0.9', 'proj1-r0.1.0']
+    project1.load_current_version_from_history()
+    assert str(project1.current_version) == '0.1.0'
+    project1.load_current_version_from_history(1)
+    assert str(project1.current_version) == '0.0.10'
+    project1.load_current_version_from_history(3)
+    assert str(project1.current_version) == project1.start_version_id
+
+    hist = project1.version_history
+    assert project1.version_history is hist
+
+    project1._pvtags_collected.append('proj1-v0.2.0')
+    assert project1.version_history.latest()[1] == 'proj1-v0.2.0'
+
+    project1.pvtag_regex = r'(?P<pname>{pname})-v(?P<version>[\d.]+)$'
+    assert [t for _v, t in project1.version_history] == [
+        'proj1-v0.0.9', 'proj1-v0.0.10', 'proj1-v0.2.0']
+
+
 def test_populate_pvtags_history_multi_projects(ok_repo, project1, project2, foo):
     ok_repo.chdir()
 
@@ -153,6 +213,52 @@ def test_populate_pvtags_history_multi_projects(ok_repo, project1, project2, foo
     assert foo.pvtags_history == []
 
 
+def test_assign_tags_to_projects_like_brute_force(project1, project2, foo):
+    projects = [project1, project2, foo,
+                pvtags.make_pvtag_project(pname='proj'),
+                pvtags.make_pvtag_project(pname='proj1-r'),
+                pvtags.make_vtag_project(),
+                search_all]
+    tags = ['proj1-v0.0.1', 'proj1-r0.0.1', 'PROJ1-V1.0.0', 'proj1-x1',
+            'proj-2-V0.2.1', 'proj-2-v0.2.1', 'proj-v1.0', 'proj-r2.0',
+            'proj1-r-v0.1', 'v0.1.0', 'V0.1.0', 'r1', 'foo-v1.0',
+            'other-v1.2.3', 'other-r1', 'proj1-\u212a-v1.0', 'pro\u017fj1-v1',
+            '', 'proj1-v']
+    for proj in projects:
+        proj._pvtags_collected = []
+
+    def brute_force(pvtag):
+        for proj in projects:
+            if proj.version_from_pvtag(pvtag):
+                return proj
+
+    exp = [brute_force(t) for t in tags]
+    dispatcher = pvtags._TagDispatcher(projects)
+    assert [dispatcher.dispatch(t) for t in tags] == exp
+
+    pvtags.assign_tags_to_projects(tags, projects)
+    assert project1.pvtags_history == ['proj1-v0.0.1', 'proj1-r0.0.1',
+                                       'PROJ1-V1.0.0']
+    for proj in projects:
+        assert proj.pvtags_history == [t for t, p in zip(tags, exp) if p is proj]
+
+
+@pytest.mark.parametrize('regex, exp', [
+    (pvlib.pvtag_regex, '^(?P<pname>{pname})'),
+    (r'^ab(?:c|d)', 'ab'),
+    (r'ab\.c+', 'ab.'),
+    (r'(?i)AB(?P<x>C)D', 'abcd'),
+    (r'(?i)a\u212ab', 'a'),
+    (r'a(?i:b)c', 'a'),
+    (r'[ab]bc', ''),
+])
+def test_regex_literal_prefix(regex, exp):
+    if '{pname}' in exp:
+        regex = regex.format(pname='proj-1', vprefix='v')
+        exp = 'proj-1-v'
+    assert pvtags._regex_literal_prefix(re.compile(regex)) == exp
+
+
 def test_fetch_pvtags_history_no_tags(untagged_repo, empty_repo, foo):
     untagged_repo.chdir()
 
@@ -254,6 +360,40 @@ def test_git_describe_bad(ok_repo, no_repo, foo):
         foo.git_describe()
 
 
+def _describe_or_error(proj, **kw):
+    try:
+        return proj.git_describe(**kw)
+    except Exception as ex:
+        return type(ex)
+
+
+@pytest.mark.parametrize('git_engine', ['git', 'python'])
+@pytest.mark.parametrize('kw', [{},
+                                {'include_lightweight': True},
+                                {'is_release': True},
+                                {'is_release': False, 'include_lightweight': True}])
+def test_describe_projects_like_git_describe(ok_repo, project1, project2, foo,
+                                             monkeypatch, git_engine, kw):
+    ok_repo.chdir()
+    monkeypatch.setenv(pvlib.git_engine_envvar, git_engine)
+    projects = [project1, project2, foo]
+
+    exp = [_describe_or_error(p, **kw) for p in projects]
+    got = pvtags.describe_projects(*projects, **kw)
+    assert [r if isinstance(r, str) else type(r) for r in got] == exp
+
+
+def test_describe_projects_bad(ok_repo, no_repo, project1):
+    ok_repo.chdir()
+    project1.pvtag_regex = r'^(?P<pname>BADNAME)-v(?P<version>\d[^-]*)$'
+    res, = pvtags.describe_projects(project1)
+    assert isinstance(res, trt.TraitError)
+
+    no_repo.chdir()
+    res, = pvtags.describe_projects(project1)
+    assert isinstance(res, pvtags.NoGitRepoError)
+
+
 def test_git_describe_mismatch_version(ok_repo, project1):
     ok_repo.chdir()
 
@@ -341,3 +481,92 @@ def test_git_restore_point(mutable_repo):
     with pvtags.git_restore_point(True):
         cmd.git.commit(m='some msg', allow_empty=True)
     assert cmd.git.rev_parse.HEAD() == exp_point
+
+
+def test_tag_projects_commit(mutable_repo, project1, project2):
+    mutable_repo.chdir()
+    project1.version = '0.1.0'
+    project2.version = '0.2.0'
+    msg = "\n# comment\nBump them  \n\n\n- all\n\n"
+
+    oids = pvtags.tag_projects_commit([project1, project2], msg)
+    assert list(oids) == ['proj1-v0.1.0', 'proj-2-V0.2.0']
+
+    ## Same objects as `git tag`.
+    cmd.git.tag('git-tag', message=msg)
+    exp = cmd.git.cat_file('-p', 'git-tag')
+    exp = exp.replace('tag git-tag\n', 'tag proj1-v0.1.0\n')
+    assert cmd.git.cat_file('-p', 'proj1-v0.1.0') == exp
+    assert cmd.git.rev_parse('proj1-v0.1.0') == oids['proj1-v0.1.0']
+    assert cmd.git.describe(match='proj-2-*') == 'proj-2-V0.2.0'
+
+    ## Existing tags, all or none.
+    project2.version = '0.2.1'
+    with pytest.raises(pvtags.GitError, match="'proj1-v0.1.0' already exists"):
+        pvtags.tag_projects_commit([project2, project1], 'msg')
+    assert 'proj-2-V0.2.1' not in cmd.git.tag('--list').split()
+
+    cmd.git.commit(m='new', allow_empty=True)
+    refs = cmd.git.show_ref(tags=True)
+    pvtags.tag_projects_commit([project2, project1], 'msg', amend=True,
+                               dry_run=True)
+    assert cmd.git.show_ref(tags=True) == refs
+
+    pvtags.tag_projects_commit([project2, project1], 'msg', amend=True)
+    assert cmd.git.describe(match='proj1-*') == 'proj1-v0.1.0'
+    assert cmd.git.describe(match='proj-2-*') == 'proj-2-V0.2.1'
+    assert cmd.git.rev_parse('proj-2-V0.2.0^{}') == cmd.git.rev_parse('HEAD~')
+
+    ## Signing needs no keys when pretending.
+    refs = cmd.git.show_ref(tags=True)
+    oids = pvtags.tag_commit_atomically({'signed-v1': 'msg'}, sign=True,
+                                        sign_user='nobody@nowhere', dry_run=True)
+    assert oids == {'signed-v1': None}
+    assert cmd.git.show_ref(tags=True) == refs
+
+
+def test_commit_files_off_worktree(mutable_repo):
+    mutable_repo.chdir()
+    (mutable_repo / 'a' / 'f.txt').write('a\n', ensure=True)
+    (mutable_repo / 'b.txt').write('b\n')
+    cmd.git.add('.')
+    cmd.git.commit(m='files')
+    (mutable_repo / 'untracked.txt').write('u\n')
+    head = cmd.git.rev_parse('HEAD')
+
+    commit_id = pvtags.commit_files_off_worktree(
+        {'a/f.txt': b'A\n', 'untracked.txt': b'U\n'}, '\nRelease it  \n\n')
+
+    assert cmd.git.rev_parse('HEAD') == head
+    assert cmd.git.status(porcelain=True) == '?? untracked.txt'
+    assert (mutable_repo / 'a' / 'f.txt').read() == 'a\n'
+
+    assert cmd.git.rev_parse('%s~' % commit_id) == head
+    assert cmd.git.log(commit_id, n=1, format='%B') == 'Release it'
+    assert cmd.git.show('%s:a/f.txt' % commit_id) == 'A'
+    assert cmd.git.show('%s:b.txt' % commit_id) == 'b'
+    assert cmd.git.diff_tree(head, commit_id, name_only=True, r=True) == 'a/f.txt'
+
+    ## Branch moves with tags, in one transaction.
+    pvtags.tag_commit_atomically({'r1': 'msg'}, rev=commit_id,
+                                 extra_ref_cmds=['update refs/heads/latest %s'
+                                                 % commit_id])
+    assert cmd.git.rev_parse('latest') == commit_id
+    assert cmd.git.rev_parse('r1^{}') == commit_id
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Colons not allowed in fnames.")
+def test_commit_files_off_worktree_literal_paths(mutable_repo):
+    mutable_repo.chdir()
+    ## Pathspec-magic & globs, matching other files.
+    for fname in (':b.txt', 'b.txt', '[b].txt'):
+        (mutable_repo / fname).write('b\n')
+    cmd.git.add('.')
+    cmd.git.commit(m='files')
+    head = cmd.git.rev_parse('HEAD')
+
+    commit_id = pvtags.commit_files_off_worktree(
+        {':b.txt': b'1\n', '[b].txt': b'2\n'}, 'Release it')
+
+    assert cmd.git.diff_tree(head, commit_id, name_only=True) == ':b.txt\n[b].txt'
+    assert cmd.git.show('%s:b.txt' % commit_id) == 'b'
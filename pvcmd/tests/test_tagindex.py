@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2015-2018 European Commission (JRC);
+# Licensed under the EUPL 1.2+ (the 'Licence');
+# You may not use this work except in compliance with the Licence.
+# You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
+
+from polyvers import tagindex
+from polyvers.utils.oscmd import cmd
+
+import pytest
+
+
+def _git_tags(patterns, include_lightweight):
+    if include_lightweight:
+        out = cmd.git.tag('--list', *patterns, sort='-taggerdate')
+    else:
+        out = cmd.git.for_each_ref(*('refs/tags/' + p for p in patterns),
+                                   format='%(objecttype) %(refname:short)',
+                                   sort='-taggerdate')
+        out = '\n'.join(line.split()[1] for line in out.split('\n')
+                        if line.startswith('tag '))
+
+    return out.split('\n') if out else []
+
+
+@pytest.fixture()
+def tags_repo(mutable_pvtags_repo):
+    for tag in ['a/b-v1', 'a-v1', 'p-r1', 'p-v1', 'x/y/z']:
+        cmd.git.tag(tag, m='annotated')
+    cmd.git.tag('lw/a-v2')
+    cmd.git.commit(allow_empty=True, m='new')
+    cmd.git.tag('a-v2', m='annotated')
+
+    return mutable_pvtags_repo
+
+
+@pytest.mark.parametrize('patterns', [
+    ['*'],
+    ['*-v*'],
+    ['a'],
+    ['a/*', 'p-*'],
+    ['x/*'],
+    ['proj1-v*', 'proj-2-*'],
+    ['nothing*'],
+])
+@pytest.mark.parametrize('include_lightweight', [False, True])
+def test_fetch_tags_like_git(tags_repo, patterns, include_lightweight):
+    exp = _git_tags(patterns, include_lightweight)
+    assert tagindex.fetch_tags(patterns, include_lightweight) == exp
+
+    ## Again, from stored index.
+    assert tagindex.fetch_tags(patterns, include_lightweight) == exp
+
+
+def test_index_incremental(tags_repo, monkeypatch):
+    read_refs = []
+    orig_read = tagindex._read_tag_entries
+
+    def spy_read(refnames):
+        read_refs.extend(refnames)
+        return orig_read(refnames)
+
+    monkeypatch.setattr(tagindex, '_read_tag_entries', spy_read)
+
+    assert tagindex.fetch_tags(['*'])
+    assert (tags_repo / '.git' / 'polyvers' / 'tags-index').check()
+    assert len(read_refs) > 5
+
+    del read_refs[:]
+    assert tagindex.fetch_tags(['*']) == _git_tags(['*'], False)
+    assert read_refs == []
+
+    ## New, moved & deleted tags.
+    cmd.git.commit(allow_empty=True, m='newer')
+    cmd.git.tag('p-v2', m='annotated')
+    cmd.git.tag('a-v2', m='moved', f=True)
+    cmd.git.tag('p-r1', d=True)
+    assert tagindex.fetch_tags(['*']) == _git_tags(['*'], False)
+    assert sorted(read_refs) == ['refs/tags/a-v2', 'refs/tags/p-v2']
+    assert 'p-r1\t' not in (tags_repo / '.git' / 'polyvers' / 'tags-index').read()
+
+    ## Only tags not matched before (`*` matches also '/' in `git tag --list`).
+    del read_refs[:]
+    assert tagindex.fetch_tags(['*'], True) == _git_tags(['*'], True)
+    assert sorted(read_refs) == ['refs/tags/a/b-v1', 'refs/tags/lw/a-v2',
+                                 'refs/tags/x/y/z']
+    del read_refs[:]
+
+    ## Full re-read above threshold.
+    monkeypatch.setattr(tagindex, 'full_scan_threshold', 0)
+    (tags_repo / '.git' / 'polyvers' / 'tags-index').write('garbage')
+    assert tagindex.fetch_tags(['*']) == _git_tags(['*'], False)
+    assert read_refs == []
+
+
+def test_lightweight_tag_listed_last(tags_repo, monkeypatch):
+    ## Its empty trailing fields end git's output.
+    cmd.git.tag('p-v9')
+    exp = _git_tags(['p-*'], True)
+    assert exp[-1] == 'p-v9'
+    assert tagindex.fetch_tags(['p-*'], True) == exp
+
+    read_refs = []
+    monkeypatch.setattr(tagindex, '_read_tag_entries',
+                        lambda refnames: read_refs.extend(refnames) or {})
+    assert tagindex.fetch_tags(['p-*'], True) == exp
+    assert read_refs == []
+
+
+def test_deleted_tags_dropped(tags_repo):
+    index = tags_repo / '.git' / 'polyvers' / 'tags-index'
+    assert tagindex.fetch_tags(['*'], True)
+    assert 'lw/a-v2\t' in index.read()
+
+    cmd.git.tag('lw/a-v2', d=True)
+    assert tagindex.fetch_tags(['a-*']) == _git_tags(['a-*'], False)
+    assert 'lw/a-v2\t' not in index.read()
+    assert 'x/y/z\t' in index.read()
+
+
+def test_fetch_tags_no_repo(no_repo):
+    no_repo.chdir()
+    assert tagindex.fetch_tags(['*']) is None
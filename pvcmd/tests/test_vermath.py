@@ -129,3 +129,39 @@ def test_plus_versions(v1, v2, exp):
 ])
 def test_caret_versions(v1, v2, exp):
     _check_addition(v1, v2, exp)
+
+
+@pytest.mark.parametrize('text, exp', [
+    ('1.0', (None, '1.0')),
+    ('..1.0', (None, '1.0')),
+    ('0.1..1.0', ('0.1', '1.0')),
+    (' 0.1.. ', ('0.1', None)),
+    ('..', (None, None)),
+    ('0.1..bad', VersionError("Invalid version: 'bad'")),
+])
+def test_parse_version_range(text, exp):
+    if isinstance(exp, Exception):
+        with pytest.raises(type(exp), match=str(exp)):
+            vermath.parse_version_range(text)
+    else:
+        exp = tuple(v and Version(v) for v in exp)
+        assert vermath.parse_version_range(text) == exp
+
+
+def test_VersionHistory():
+    hist = vermath.VersionHistory([('v0.10', '0.10'), ('v0.9', '0.9'),
+                                   ('bad', 'bad'), ('v1.0b1', '1.0b1'),
+                                   ('v0.9.0', '0.9.0'), ('v1.0', '1.0')])
+    assert len(hist) == 5
+    assert [t for _v, t in hist] == ['v0.9', 'v0.9.0', 'v0.10', 'v1.0b1', 'v1.0']
+
+    assert hist.latest() == (Version('1.0'), 'v1.0')
+    assert hist.latest(1) == (Version('1.0b1'), 'v1.0b1')
+    assert hist.latest(5) is None
+
+    assert [t for _v, t in hist.in_range('0.9.0', '1.0')] == [
+        'v0.9', 'v0.9.0', 'v0.10', 'v1.0b1']
+    assert [t for _v, t in hist.in_range(high='0.10')] == ['v0.9', 'v0.9.0']
+    assert [t for _v, t in hist.in_range('1')] == ['v1.0']  # pre-releases before
+
+    assert not vermath.VersionHistory().latest()
@@ -6,7 +6,10 @@
 # You may not use this work except in compliance with the Licence.
 # You may obtain a copy of the Licence at: http://ec.europa.eu/idabc/eupl
 
-from polyvers.utils.oscmd import cmd, _Cli, PopenCmd
+from polyvers import pvtags
+from polyvers.utils import oscmd
+from polyvers.utils.oscmd import cmd, _Cli, PopenCmd, acmd, AsyncPopenCmd
+import subprocess as sbp
 
 import pytest
 
@@ -47,3 +50,105 @@ def test_cmd_exec(ok_repo):
 
     res = cmd.git.log(n=1)
     assert res.count('\n') >= 4
+
+
+def test_async_cmd_exec(ok_repo):
+    ok_repo.chdir()
+
+    res = oscmd.run_concurrently(
+        acmd.git.log(n=1, format='%H'),
+        AsyncPopenCmd(input='a\r\nb').python._(c=True)(
+            "import sys; sys.stdout.write(sys.stdin.read())"),
+        AsyncPopenCmd(check_stdout=False).git.log(n=1),
+        max_concurrent=2)
+    assert res == [cmd.git.log(n=1, format='%H'), 'a\nb', None]
+
+    ## Bytes, without encoding.
+    res, = oscmd.run_concurrently(AsyncPopenCmd(encoding=None).git.log(n=1))
+    assert isinstance(res, bytes)
+
+
+def test_async_cmd_errors(ok_repo, no_repo):
+    ok_repo.chdir()
+    with pytest.raises(sbp.CalledProcessError, match="'bad' is not a git command"):
+        oscmd.run_concurrently(acmd.git.bad())
+
+    res = oscmd.run_concurrently(acmd.git.bad(), acmd.no_such_cmd(), acmd.git.status(),
+                                 return_exceptions=True)
+    assert isinstance(res[0], sbp.CalledProcessError)
+    assert isinstance(res[1], FileNotFoundError)
+    assert isinstance(res[2], str)
+
+    no_repo.chdir()
+    with pytest.raises(pvtags.NoGitRepoError):
+        oscmd.run_concurrently(acmd.git.log())
+
+
+def test_run_concurrently_bounded(monkeypatch):
+    import asyncio
+
+    running = [0, 0]  # [current, max]
+
+    async def job(i):
+        running[0] += 1
+        running[1] = max(running)
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return i
+
+    assert oscmd.run_concurrently(*(job(i) for i in range(7)),
+                                  max_concurrent=3) == list(range(7))
+    assert running[1] == 3
+
+    monkeypatch.setattr(oscmd, 'max_concurrent_cmds', 2)
+    running[1] = 0
+    oscmd.run_concurrently(*(job(i) for i in range(7)))
+    assert running[1] == 2
+
+    assert oscmd.run_concurrently() == []
+
+
+def test_cat_file_batch(ok_repo):
+    ok_repo.chdir()
+    head = cmd.git.rev_parse('HEAD')
+    tag = cmd.git.tag('--list').split()[0]
+
+    with oscmd.CatFileBatch() as cf:
+        oid, objtype, data = cf.read('HEAD')
+        assert (oid, objtype) == (head, 'commit')
+        assert data.decode() == cmd.git.cat_file('-p', 'HEAD') + '\n'
+        assert cf.read('no-such-rev') is None
+        assert cf.info('HEAD') == (head, 'commit', len(data))
+        assert cf.read('%s^{}' % tag)[1] == 'commit'
+
+        ## Restarts.
+        cf._proc.kill()
+        cf._proc.wait()
+        assert cf.read('HEAD')[0] == head
+        assert cf.nstarts == 2
+
+    assert cf._proc is None
+    assert cf.read('HEAD')[0] == head  # Restarts after close.
+    cf.close()
+
+    with oscmd.CatFileBatch(check_only=True) as cf:
+        assert cf.info('HEAD')[:2] == (head, 'commit')
+        with pytest.raises(ValueError):
+            cf.read('HEAD')
+
+
+def test_cat_file_pool(ok_repo, no_repo):
+    ok_repo.chdir()
+    cf = oscmd.cat_file()
+    assert oscmd.cat_file() is cf
+    assert oscmd.cat_file(check_only=True) is not cf
+    assert cf.read('HEAD')
+
+    oscmd.close_cat_files()
+    assert cf._proc is None
+    assert oscmd.cat_file() is not cf
+
+    no_repo.chdir()
+    with pytest.raises(pvtags.NoGitRepoError):
+        oscmd.cat_file().read('HEAD')
+    oscmd.close_cat_files()
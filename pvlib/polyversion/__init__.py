@@ -27,9 +27,12 @@ import sys
 
 import os.path as osp
 import subprocess as sbp
+from collections import namedtuple
 
 
-__all__ = 'polyversion polytime decide_vprefixes'.split()
+__all__ = ('polyversion polyversions polytime polyinfo decide_vprefixes '
+           'git_capabilities describe_many is_python_git_engine '
+           'is_git_cache_enabled find_git_dirs atomic_write_text').split()
 
 
 PY2 = sys.version_info < (3, )
@@ -160,6 +163,63 @@ def _parse_metadata(fp):
     return Parser().parse(fp, headersonly=True)
 
 
+#: Memo of directory indices, ``{dirpath: (stat_sig, {(prefix, ext): [entry, ...]})}``.
+_dir_index_memo = {}
+#: Memo of parsed metadata-files, ``{fpath: (stat_sig, (name, version))}``.
+_metadata_memo = {}
+
+
+def _dir_index(dpath):
+    """
+    Index `dpath` by all dash-separated name-prefixes of its ``*.(dist|egg)-info`` entries.
+
+    The directory is scanned just once, and re-scanned only when its mtime changes,
+    so that globbing ``<pname>-*.dist-info`` becomes a dict-lookup
+    of ``(<pname>, '.dist-info')``, even in huge *site-packages*.
+    Plain ``METADATA`` & ``PKG-INFO`` files are indexed as ``(<fname>, '')``.
+    """
+    sig = _stat_sig(dpath)
+    entry = _dir_index_memo.get(dpath)
+    if entry and entry[0] == sig:
+        return entry[1]
+
+    index = {}
+    if sig != '-':
+        scandir = getattr(os, 'scandir', None)  # PY35+
+        names = [e.name for e in scandir(dpath)] if scandir else os.listdir(dpath)
+        for name in names:
+            name = osp.normcase(name)
+            base, ext = osp.splitext(name)
+            if ext in ('.dist-info', '.egg-info'):
+                i = base.find('-')
+                while i > 0:
+                    index.setdefault((base[:i], ext), []).append(name)
+                    i = base.find('-', i + 1)
+            elif name in ('METADATA', 'PKG-INFO'):
+                index[(name, '')] = [name]
+
+    _dir_index_memo[dpath] = (sig, index)
+
+    return index
+
+
+def _read_metadata(fpath):
+    ":return: the ``(name, version)`` of a metadata-file, reparsed only if modified"
+    import io
+
+    sig = _stat_sig(fpath)
+    entry = _metadata_memo.get(fpath)
+    if entry and entry[0] == sig:
+        return entry[1]
+
+    with io.open(fpath, 'r', errors='ignore') as fp:
+        pkg_metadata = _parse_metadata(fp)
+    info = (pkg_metadata.get('Name', None), pkg_metadata.get('Version', None))
+    _metadata_memo[fpath] = (sig, info)
+
+    return info
+
+
 def pkg_metadata_version(pname, basepath=None):
     """Get the version from package metadata if present.
 
@@ -181,54 +241,107 @@ def pkg_metadata_version(pname, basepath=None):
         installed in PYTHONPATH from an *(bdist) egg*.
       - ``METADATA``: when launched from within for *wheels*.
       - ``PKG-INFO``: when launched from within for *sdists*,
-    """
-    import glob
-    import io
 
-    pkg_metadata_fpaths = [
-        osp.join('..', '%s-*.dist-info' % pname, 'METADATA'),  # wheel
-        osp.join('..', '%s-*.egg-info' % pname, 'PKG-INFO'),   # egg
-        'METADATA',
-        'PKG-INFO',
+    Directory listings and parsed files are memoized (see :func:`_dir_index()`),
+    so repeated lookups cost just a couple of `stat()` calls.
+    """
+    basepath = osp.abspath(str(basepath or '.'))
+    ## Not normalized, for the OS to resolve any symlinked `basepath`.
+    parentpath = osp.join(basepath, '..')
+    pkg_metadata_lookups = [
+        (parentpath, pname, '.dist-info', 'METADATA'),  # wheel
+        (parentpath, pname, '.egg-info', 'PKG-INFO'),   # egg
+        (basepath, 'METADATA', '', None),
+        (basepath, 'PKG-INFO', '', None),
     ]
-    pkg_metadata = {}
-    for fpath in pkg_metadata_fpaths:
-        fpath = osp.join(str(basepath) or '.', fpath)
+    meta_pname = meta_version = None
+    for dpath, prefix, ext, fname in pkg_metadata_lookups:
         try:
-            matches = glob.glob(fpath)
-            if len(matches) == 1:
-                fpath = matches[0]
-            else:
-                if len(matches) > 1:
+            entries = _dir_index(dpath).get((osp.normcase(prefix), ext), ())
+            fpaths = [osp.join(dpath, e, fname) if fname else osp.join(dpath, e)
+                      for e in entries]
+            fpaths = [f for f in fpaths if osp.isfile(f)]
+            if len(fpaths) != 1:
+                if len(fpaths) > 1:
                     log.warning("Many matches while searching version in '%s': %s",
-                                osp.realpath(fpath), matches)
+                                osp.realpath(dpath), fpaths)
                 continue
 
-            with io.open(fpath, 'r', errors='ignore') as fp:
-                pkg_metadata = _parse_metadata(fp)
+            meta_pname, meta_version = _read_metadata(fpaths[0])
 
             break
         except Exception as ex:
             log.warning("Ignored error while searching version in '%s': %s",
-                        osp.realpath(fpath), ex)
+                        osp.realpath(dpath), ex)
 
     ## Check to make sure we're in our own dir
     #
-    meta_pname = pkg_metadata.get('Name', None)
     if meta_pname == pname:
-        return pkg_metadata.get('Version', None)
+        return meta_version
     elif meta_pname is not None:
         log.warning("Skipping version '%s' from foreign project '%s' (expecting '%s').",
-                    pkg_metadata.get('Version', None), meta_pname, pname)
+                    meta_version, meta_pname, pname)
 
 
-def _caller_module_name(nframes_back=2):
+#: The module written by the :term:`setuptools plugin` into the top-packages built
+#: (see ``version_module`` key of :func:`setuplugin.init_plugin_kw()`),
+#: consulted first by :func:`polyversion()`, :func:`polytime()` & :func:`polyinfo()`.
+version_module_fname = '_polyversion.py'
+
+#: Memo of generated version-modules read, ``{fpath: PolyInfo or None}``.
+_version_modules = {}
+
+
+def _read_version_module(pname, basepath):
+    """
+    Read (just once) the :data:`version_module_fname` in `basepath`, if generated for `pname`.
+
+    :return:
+        a :data:`PolyInfo`, or `None`
+    """
+    import ast
+    import io
+
+    fpath = osp.abspath(osp.join(str(basepath or '.'), version_module_fname))
+    if fpath not in _version_modules:
+        info = None
+        if osp.isfile(fpath):
+            try:
+                with io.open(fpath, 'rt', encoding='utf-8') as fp:
+                    tree = ast.parse(fp.read())
+                fields = dict((node.targets[0].id, ast.literal_eval(node.value))
+                              for node in tree.body
+                              if isinstance(node, ast.Assign))
+                info = PolyInfo(*(fields.get(f) for f in PolyInfo._fields))
+            except Exception as ex:
+                log.warning("Ignored error while reading version-module '%s': %s",
+                            fpath, ex)
+        _version_modules[fpath] = info
+
+    info = _version_modules[fpath]
+    if info and info.pname == pname and info.version:
+        return info
+
+
+def _caller_frame(nframes_back):
+    ":return: the frame `nframes_back` from the function calling this one"
+    nframes_back += 1  # this frame
+    getframe = getattr(sys, '_getframe', None)  # CPython, PyPy
+    if getframe:
+        return getframe(nframes_back)
+
     import inspect
 
     frame = inspect.currentframe()
+    for _ in range(nframes_back):
+        frame = frame.f_back
+
+    return frame
+
+
+def _caller_module_name(nframes_back=2):
+    frame = _caller_frame(nframes_back)
     try:
-        for _ in range(nframes_back):
-            frame = frame.f_back
         modname = frame.f_globals['__name__']
         name = modname.split('.')[-1]
         if name.startswith('_'):  # eg: _version, __init__, __main__
@@ -240,22 +353,51 @@ def _caller_module_name(nframes_back=2):
         del frame
 
 
-def _caller_basepath(nframes_back=2):
+#: Memo for :func:`_caller_basepath()`, ``{top-package-name: (module, basepath)}``.
+_caller_basepaths = {}
+
+
+def _package_basepath(topackage):
+    "The dir of a (top) package module, or of a namespace-package's 1st portion."
+    fpath = getattr(topackage, '__file__', None)
+    if fpath:
+        return osp.dirname(fpath)
+
+    spec = getattr(topackage, '__spec__', None)
+    locations = spec and spec.submodule_search_locations
+    if locations:
+        return list(locations)[0]
+
     import inspect
 
-    frame = inspect.currentframe()
-    try:
-        for _ in range(nframes_back):
-            frame = frame.f_back
-        mod = inspect.getmodule(frame)
+    return osp.dirname(inspect.getfile(topackage))  # screams like before
 
-        topackage = __import__(mod.__name__.split('.')[0])
-        basepath = osp.dirname(inspect.getfile(topackage))
 
-        return basepath
+def _caller_basepath(nframes_back=2):
+    """
+    The dir of the top-package of the caller's module, memoized per package.
+
+    Derived from the frame's ``__name__`` and :data:`sys.modules`,
+    not with :func:`inspect.getmodule()`, which scans all modules loaded.
+    """
+    frame = _caller_frame(nframes_back)
+    try:
+        topname = frame.f_globals['__name__'].split('.')[0]
     finally:
         del frame
 
+    topackage = sys.modules.get(topname)
+    entry = _caller_basepaths.get(topname)
+    if entry and topackage is not None and entry[0] is topackage:
+        return entry[1]
+
+    if topackage is None:
+        topackage = __import__(topname)
+    basepath = _package_basepath(topackage)
+    _caller_basepaths[topname] = (topackage, basepath)
+
+    return basepath
+
 
 def split_pvtag(pvtag, tag_regexes):
     ## TODO: parse descids like `setuptools_scm` plugin:
@@ -309,7 +451,7 @@ def _interp_regex(tag_regex, vprefix, pname):
                             vprefix=vprefix)
 
 
-def _git_version():
+def _parse_git_version(gitver):
     def _int(i):
         try:
             i = int(i)
@@ -317,15 +459,122 @@ def _git_version():
             pass
         return i
 
-    gitver = _my_run(['git', 'version'])
     ## Git's versions like ``'git version 2.17.0.windows.1'``
     ver = gitver.lstrip('git version ')
     return tuple(_int(i) for i in ver.split('.'))
 
 
+def _git_version():
+    return _parse_git_version(_my_run(['git', 'version']))
+
+
+#: The features of a git binary, as probed by :func:`git_capabilities()`:
+#:
+#: - `path`, `mtime`, `size`: the identity of the binary (`path` may be `None`
+#:   if not found in ``PATH``, and then not cached);
+#: - `version`: a tuple like ``(2, 17, 0, 'windows', 1)``;
+#: - `multi_match`: ``git describe`` respects all ``--match`` patterns (2.15+);
+#: - `log_describe`: ``git log --format=%(describe:match=...)`` (2.32+);
+#: - `log_describe_tags`: and its ``tags`` option (2.35+).
+GitCaps = namedtuple('GitCaps', 'path mtime size version multi_match '
+                     'log_describe log_describe_tags')
+
+#: Process-wide memo of :func:`git_capabilities()`, ``{(path, mtime, size): GitCaps}``.
+_git_caps_memo = {}
+
+
+def _which_git():
+    ":return: the absolute real-path of the `git` binary found in ``PATH``, or `None`"
+    exts = ['']
+    if os.name == 'nt':
+        exts = os.environ.get('PATHEXT', '.EXE').lower().split(os.pathsep) + exts
+    for d in os.environ.get('PATH', '').split(os.pathsep):
+        if d:
+            for ext in exts:
+                fpath = osp.join(d, 'git' + ext)
+                if osp.isfile(fpath) and os.access(fpath, os.X_OK):
+                    return osp.realpath(fpath)
+
+
+def _git_caps_cache_fpath():
+    "The file caching git-capabilities, under the user's cache-dir."
+    cache_dir = (os.environ.get('XDG_CACHE_HOME') or
+                 os.environ.get('LOCALAPPDATA') or
+                 osp.join(osp.expanduser('~'), '.cache'))
+
+    return osp.join(cache_dir, 'polyversion', 'git-caps')
+
+
+def _git_caps_from_version(path, mtime, size, version):
+    def since(*minver):
+        return version[:len(minver)] >= minver
+
+    return GitCaps(path, mtime, size, version,
+                   since(2, 15), since(2, 32), since(2, 35))
+
+
+def git_capabilities():
+    """
+    Probe (just once) the features of the `git` binary in ``PATH``.
+
+    Only ``git version`` is launched, once per binary, and the results are cached
+    in memory and on disk (unless disabled with :data:`git_cache_envvar`),
+    keyed by the path, mtime & size of the binary.
+
+    :return:
+        a :data:`GitCaps` instance
+    :raise:
+        if git cannot run
+    """
+    import io
+
+    path = _which_git()
+    if not path:
+        ## Let git report any errors, uncached.
+        return _git_caps_from_version(None, None, None, _git_version())
+
+    st = os.stat(path)
+    ident = (path, st.st_mtime, st.st_size)
+    caps = _git_caps_memo.get(ident)
+    if caps:
+        return caps
+
+    cache_fpath = _git_caps_cache_fpath() if is_git_cache_enabled(None) else None
+    ident_line = '%s\t%r\t%s\t' % ident
+    lines = []
+    gitver = None
+    if cache_fpath:
+        try:
+            with io.open(cache_fpath, 'rt', encoding='utf-8') as fp:
+                lines = fp.read().splitlines()
+            for line in lines:
+                if line.startswith(ident_line):
+                    gitver = line[len(ident_line):]
+        except Exception as ex:
+            log.debug("Ignoring unreadable git-caps cache '%s' due to: %s",
+                      cache_fpath, ex)
+
+    if not gitver:
+        gitver = _my_run([path, 'version'])
+        if cache_fpath:
+            ## Keep lines of other binaries (and drop older ones of this).
+            lines = [line for line in lines if not line.startswith(path + '\t')]
+            lines.append(ident_line + gitver)
+            try:
+                atomic_write_text(cache_fpath, '\n'.join(lines) + '\n')
+            except Exception as ex:
+                log.debug("Cannot store git-caps cache '%s' due to: %s",
+                          cache_fpath, ex)
+
+    caps = _git_caps_memo[ident] = _git_caps_from_version(
+        path, st.st_mtime, st.st_size, _parse_git_version(gitver))
+
+    return caps
+
+
 def _is_git_describe_accept_signle_pattern():
     """Buggy git < 2.15.0 ignores multiple match-patterns but the last."""
-    return _git_version()[:2] < (2, 15)
+    return not git_capabilities().multi_match
 
 
 def _git_describe(cmd, tag_patterns, basepath):
@@ -350,21 +599,280 @@ def _git_describe(cmd, tag_patterns, basepath):
     return pvtag
 
 
-def _git_describe_parsed(pname,
-                         default_version,        # if None, raise
-                         tag_format, tag_regex,
-                         vprefixes,
-                         basepath, git_options):
+#: Env-var to disable the on-disk cache of ``git describe`` results
+#: when set to a false-like value (e.g. ``0``, ``false``, ``off``);
+#: see the `git_cache` kw of :func:`polyversion()`.
+git_cache_envvar = 'POLYVERSION_GIT_CACHE'
+
+
+def is_git_cache_enabled(git_cache):
     """
-    Parse git-desc as `pvtag, version, descid` or raise when no `default_version`.
+    Decide whether to use the on-disk caches of git results.
 
-    :param vprefixes:
-        a sequence of str; no surprises, just make that many match-patterns
+    :param git_cache:
+        a boolean, or `None` to read the :data:`git_cache_envvar`
+        (defaulting to enabled)
     """
-    assert not isinstance(vprefixes, str), "req list-of-str, got: %r" % vprefixes
+    if git_cache is None:
+        val = os.environ.get(git_cache_envvar, '').strip().lower()
+        git_cache = val not in ('0', 'n', 'no', 'f', 'false', 'off')
 
-    import re
+    return bool(git_cache)
+
+
+#: Env-var selecting the default `git_engine` of :func:`polyversion()`
+#: & :func:`polytime()`, one of: ``git`` (default), ``python``.
+git_engine_envvar = 'POLYVERSION_GIT_ENGINE'
 
+
+def is_python_git_engine(git_engine):
+    """
+    Decide whether to use the pure-python git-engine (see :mod:`polyversion.pygit`).
+
+    :param git_engine:
+        one of ``git``, ``python`` (case-insensitive), or `None` to read
+        the :data:`git_engine_envvar` (defaulting to ``git``)
+    :raise ValueError:
+        on unknown engines
+    """
+    if git_engine is None:
+        git_engine = os.environ.get(git_engine_envvar)
+    git_engine = (git_engine or 'git').strip().lower()
+    if git_engine not in ('git', 'python'):
+        raise ValueError("Invalid `git_engine` %r, expected one of: git, python" %
+                         git_engine)
+
+    return git_engine == 'python'
+
+
+def _pygit_call(basepath, method, *args, **kw):
+    """
+    Run a :class:`pygit.PyGit` `method`, or return `None` to retry with the `git` command.
+    """
+    from . import pygit
+
+    try:
+        with pygit.PyGit(basepath) as repo:
+            return getattr(repo, method)(*args, **kw)
+    except Exception as ex:
+        log.debug("Pure-python git-engine falling back to `git` command due to: %s",
+                  ex, exc_info=not isinstance(ex, pygit.PyGitError))
+
+
+def _read_text(fpath):
+    "Read small files (refs, HEAD) without screaming; return `None` if missing."
+    try:
+        with open(fpath, 'rb') as fp:
+            return fp.read().decode('utf-8', 'replace').strip()
+    except (IOError, OSError):
+        pass
+
+
+def _stat_sig(fpath):
+    try:
+        st = os.stat(fpath)
+        return '%r-%s-%s' % (st.st_mtime, st.st_size, st.st_ino)
+    except OSError:
+        return '-'
+
+
+def find_git_dirs(basepath):
+    """
+    Locate the *git-dir* & *common-dir* of the repo hosting `basepath`, without forking git.
+
+    Useful for keying caches on the files of the repo (e.g. its refs).
+
+    :return:
+        a 2-tuple ``(gitdir, commondir)``, differing only in *linked worktrees*,
+        or `None` if not inside a repo, or if ``GIT_DIR`` env-var is set
+    """
+    if os.environ.get('GIT_DIR'):
+        return
+
+    path = osp.abspath(str(basepath or '.'))
+    while True:
+        dotgit = osp.join(path, '.git')
+        if osp.isdir(dotgit):
+            gitdir = dotgit
+            break
+        if osp.isfile(dotgit):
+            ## A submodule or a linked worktree.
+            line = _read_text(dotgit) or ''
+            if not line.startswith('gitdir:'):
+                return
+            gitdir = osp.join(path, line[len('gitdir:'):].strip())
+            break
+
+        parent = osp.dirname(path)
+        if parent == path:
+            return
+        path = parent
+
+    commondir = gitdir
+    common_ref = _read_text(osp.join(gitdir, 'commondir'))
+    if common_ref:
+        commondir = osp.join(gitdir, common_ref)
+
+    return osp.normpath(gitdir), osp.normpath(commondir)
+
+
+def _refs_state_key(gitdir, commondir):
+    """
+    Fingerprint HEAD, *packed-refs* and loose tags, without forking git.
+
+    :return:
+        a hex-digest that changes whenever ``git describe`` results may change,
+        or `None` if HEAD is unreadable
+    """
+    import hashlib
+
+    head = _read_text(osp.join(gitdir, 'HEAD'))
+    if not head:
+        return
+
+    parts = [head]
+    if head.startswith('ref:'):
+        ## Branch-ref may be missing, if packed (or unborn).
+        parts.append(_read_text(osp.join(commondir, head[4:].strip())) or '')
+    for fname in ('packed-refs', 'shallow'):
+        parts.append('%s:%s' % (fname, _stat_sig(osp.join(commondir, fname))))
+
+    tags_dir = osp.join(commondir, 'refs', 'tags')
+    for dirpath, dirnames, fnames in os.walk(tags_dir):
+        dirnames.sort()
+        for fname in sorted(fnames):
+            fpath = osp.join(dirpath, fname)
+            parts.append('%s:%s' % (osp.relpath(fpath, tags_dir),
+                                    _read_text(fpath)))
+
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _git_state(basepath):
+    """
+    :return:
+        a 2-tuple ``(gitdir, state_key)``, or ``(None, None)`` if cannot cache
+    """
+    try:
+        git_dirs = find_git_dirs(basepath)
+        if git_dirs:
+            state_key = _refs_state_key(*git_dirs)
+            if state_key:
+                return git_dirs[0], state_key
+    except Exception as ex:
+        log.debug("Skipped git-describe cache due to: %s", ex, exc_info=1)
+
+    return None, None
+
+
+def _describe_cache_slot(basepath, *args_key):
+    """
+    :param args_key:
+        strings affecting ``git describe`` results other than the repo-state
+    :return:
+        a 2-tuple ``(cache_fpath, state_key)``, or ``(None, None)`` if cannot cache
+    """
+    import hashlib
+
+    gitdir, state_key = _git_state(basepath)
+    if gitdir:
+        args_digest = hashlib.sha1('\0'.join(args_key).encode('utf-8')).hexdigest()
+        cache_fpath = osp.join(gitdir, 'polyversion', 'describe-%s' % args_digest[:16])
+
+        return cache_fpath, state_key
+
+    return None, None
+
+
+#: Process-wide memo in front of the on-disk cache, ``{key: (state_key, value)}``,
+#: keyed by cache-fpaths (for *pvtags*) or ``(gitdir, 'cdate')`` (for commit-dates).
+_git_memo = {}
+
+
+def _memo_load(key, state_key):
+    entry = _git_memo.get(key)
+    if entry and entry[0] == state_key:
+        return entry[1]
+
+
+def _memo_store(key, state_key, value):
+    _git_memo[key] = (state_key, value)
+
+
+def _cdate_memo_key(cache_fpath):
+    return (osp.dirname(osp.dirname(cache_fpath)), 'cdate')
+
+
+def _describe_cache_load(cache_fpath, state_key):
+    """
+    :return:
+        a 2-tuple ``(pvtag, cdate)``, any of them `None` if not cached
+    """
+    pvtag = _memo_load(cache_fpath, state_key)
+    if pvtag:
+        return pvtag, _memo_load(_cdate_memo_key(cache_fpath), state_key)
+
+    content = _read_text(cache_fpath)
+    if content:
+        cached_key, _, pvtag = content.partition('\n')
+        pvtag, _, cdate = pvtag.partition('\n')
+        if cached_key == state_key and pvtag:
+            _memo_store(cache_fpath, state_key, pvtag)
+            if cdate:
+                _memo_store(_cdate_memo_key(cache_fpath), state_key, cdate)
+
+            return pvtag, cdate or None
+
+    return None, None
+
+
+def atomic_write_text(fpath, text):
+    "Write `text` in a temp-file renamed over `fpath`, creating any parent dirs."
+    import io
+
+    tmp_fpath = '%s.%s.tmp' % (fpath, os.getpid())
+    try:
+        fdir = osp.dirname(fpath)
+        if not osp.isdir(fdir):
+            try:
+                os.makedirs(fdir)
+            except OSError:
+                if not osp.isdir(fdir):  # Not created by a parallel process?
+                    raise
+
+        with io.open(tmp_fpath, 'wt', encoding='utf-8') as fp:
+            fp.write(text)
+        try:
+            getattr(os, 'replace', os.rename)(tmp_fpath, fpath)
+        except OSError:
+            ## PY2 on Windows cannot rename over existing files.
+            os.remove(fpath)
+            os.rename(tmp_fpath, fpath)
+    except Exception:
+        if osp.exists(tmp_fpath):
+            try:
+                os.remove(tmp_fpath)
+            except OSError:
+                pass
+        raise
+
+
+def _describe_cache_store(cache_fpath, state_key, pvtag, cdate=None):
+    "Atomically (re)write the cache-file, ignoring any errors (e.g. read-only repos)."
+    _memo_store(cache_fpath, state_key, pvtag)
+    if cdate:
+        _memo_store(_cdate_memo_key(cache_fpath), state_key, cdate)
+
+    try:
+        atomic_write_text(cache_fpath,
+                          u'%s\n%s\n%s' % (state_key, pvtag, cdate or ''))
+    except Exception as ex:
+        log.debug("Failed storing git-describe cache '%s' due to: %s",
+                  cache_fpath, ex)
+
+
+def _split_git_options(git_options):
+    ":return: a list-of-str, or the falsy `git_options` as is"
     if git_options:
         if isinstance(git_options, str):
             git_options = git_options.split()
@@ -376,29 +884,151 @@ def _git_describe_parsed(pname,
                     "invalid `git_options` due to: %s"
                     "\n  must be a str or an iterable, got: %r" %
                     (ex, git_options))
+
+    return git_options
+
+
+def _tag_matchers(pname, tag_format, tag_regex, vprefixes):
+    ":return: 2-tuple of tuples ``(fnmatch-patterns, compiled-regexes)``, one per vprefix"
+    assert not isinstance(vprefixes, str), "req list-of-str, got: %r" % vprefixes
+
+    import re
+
     tag_patterns, tag_regexes = zip(
         *((_interp_fnmatch(tag_format, vp, pname),
            re.compile(_interp_regex(tag_regex, vp, pname)))
           for vp in vprefixes))
 
-    #
-    ## Guard against git's runtime errors, below,
-    #  and not configuration-ones, above.
-    #
-    pvtag = version = descid = None
+    return tag_patterns, tag_regexes
+
+
+def _pvtag_parsed(pname, pvtag, tag_regexes):
+    ":return: 2-tuple ``(version, descid)`` with any `descid` merged in `version`"
+    matched_project, version, descid = split_pvtag(pvtag, tag_regexes)
+    if matched_project and matched_project != pname:
+        log.warning("Matched  pvtag project '%s' different from expected '%s'!",
+                    matched_project, pname)
+    if descid:
+        version = _version_from_descid(version, descid)
+
+    return version, descid
+
+
+def _is_git_log_describing(tags):
+    "Whether ``git log`` supports the ``%(describe)`` placeholder (and its `tags`)."
     try:
+        caps = git_capabilities()
+    except Exception as ex:
+        log.debug("Cannot probe git capabilities due to: %s", ex)
+        return False
+
+    return caps.log_describe_tags if tags else caps.log_describe
+
+
+def _git_describe_dated(cmd, tag_patterns, basepath, git_options, use_pygit):
+    """
+    Run ``git describe`` and fetch also the ``%cD`` date of HEAD, in a single git call.
+
+    Uses the ``%(describe)`` placeholder of ``git log`` (git-2.32+, ``tags`` in 2.35+),
+    or the :mod:`pygit` engine.
+    When that is impossible, or describing fails (to report git's genuine errors),
+    it falls back to plain ``git describe``.
+
+    :return:
+        a 2-tuple ``(pvtag, cdate)``, where `cdate` may be `None`
+    """
+    pvtag = cdate = None
+
+    ## Only `--tags` option is emulated by `%(describe)` & pure-python engine.
+    tags = bool(git_options)
+    if set(git_options or ()) <= {'--tags'}:
+        if use_pygit:
+            pvtag, cdate = _pygit_call(basepath, 'describe_dated', tag_patterns,
+                                       tags=tags) or (None, None)
+
+        if (not pvtag and _is_git_log_describing(tags) and
+                not any(c in tp for tp in tag_patterns for c in ',)')):
+            args = ['match=%s' % tp for tp in tag_patterns]
+            if tags:
+                args.append('tags')
+            fmt = '--format=%%cD%%n%%(describe:%s)' % ','.join(args)
+            try:
+                out = _my_run(['git', 'log', '-n1', fmt], cwd=basepath)
+                cdate, _, pvtag = (out or '').partition('\n')
+                if pvtag.startswith('%('):  # unknown placeholder, old git
+                    pvtag = None
+            except Exception as ex:
+                log.debug("Combined `git log -n1 %s` failed due to: %s", fmt, ex)
+
+    if not pvtag:
+        pvtag = _git_describe(cmd, tag_patterns, basepath)
+
+    return pvtag, cdate or None
+
+
+def _git_describe_cached(tag_patterns, basepath, git_options, use_pygit,
+                         cache_fpath=None, state_key=None):
+    """
+    Like :func:`_git_describe_dated()`, but reuse (or store) the describe-cache slot, if given.
+
+    :return:
+        the 2-tuple ``(pvtag, cdate)``
+    """
+    pvtag = cdate = None
+    if cache_fpath:
+        pvtag, cdate = _describe_cache_load(cache_fpath, state_key)
+
+    if not pvtag:
         cmd = 'git describe'.split()
         if git_options:
             cmd.extend(git_options)
+        pvtag, cdate = _git_describe_dated(cmd, tag_patterns, basepath,
+                                           git_options, use_pygit)
+        if cache_fpath:
+            _describe_cache_store(cache_fpath, state_key, pvtag, cdate)
 
-        pvtag = _git_describe(cmd, tag_patterns, basepath)
+    return pvtag, cdate
+
+
+def _git_describe_parsed(pname,
+                         default_version,        # if None, raise
+                         tag_format, tag_regex,
+                         vprefixes,
+                         basepath, git_options,
+                         git_cache=None, git_engine=None):
+    """
+    Parse git-desc as `pvtag, version, descid, cdate` or raise when no `default_version`.
 
-        matched_project, version, descid = split_pvtag(pvtag, tag_regexes)
-        if matched_project and matched_project != pname:
-            log.warning("Matched  pvtag project '%s' different from expected '%s'!",
-                        matched_project, pname)
-        if descid:
-            version = _version_from_descid(version, descid)
+    :param vprefixes:
+        a sequence of str; no surprises, just make that many match-patterns
+    :param git_cache:
+        see :func:`polyversion()`
+    :param git_engine:
+        see :func:`polyversion()`
+    :return:
+        a 4-tuple, where the HEAD's commit-date `cdate` is `None`
+        unless fetched along with the *pvtag*
+    """
+    git_options = _split_git_options(git_options)
+    use_pygit = is_python_git_engine(git_engine)
+    tag_patterns, tag_regexes = _tag_matchers(pname, tag_format, tag_regex,
+                                              vprefixes)
+
+    #
+    ## Guard against git's runtime errors, below,
+    #  and not configuration-ones, above.
+    #
+    pvtag = version = descid = cdate = None
+    try:
+        ## Options (e.g. `--dirty`) may consult more than refs, so don't cache them.
+        cache_fpath = state_key = None
+        if not git_options and is_git_cache_enabled(git_cache):
+            cache_fpath, state_key = _describe_cache_slot(
+                basepath, pname, tag_format, tag_regex, *vprefixes)
+        pvtag, cdate = _git_describe_cached(tag_patterns, basepath, git_options,
+                                            use_pygit, cache_fpath, state_key)
+
+        version, descid = _pvtag_parsed(pname, pvtag, tag_regexes)
     except Exception as ex:
         if default_version is None:
             raise
@@ -411,7 +1041,182 @@ def _git_describe_parsed(pname,
     if not version:
         version = default_version
 
-    return pvtag, version, descid
+    return pvtag, version, descid, cdate
+
+
+class _GitRevList(object):
+    """
+    Stream ``git rev-list --parents --timestamp HEAD`` lazily, as commits get walked.
+
+    Commits arrive roughly in the date-order :func:`pygit.walk_describe()`
+    visits them, so history is read only as deep as the deepest walk needs.
+    """
+
+    def __init__(self, basepath):
+        self.basepath = basepath
+        self.cmd = 'git rev-list --parents --timestamp HEAD'.split()
+        #: {sha: (parents, tstamp)}
+        self._commits = {}
+        self._proc = sbp.Popen(self.cmd, stdout=sbp.PIPE, stderr=sbp.PIPE,
+                               cwd=str(basepath))
+        try:
+            self.head = self._read_commit()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+    def close(self):
+        proc = self._proc
+        if proc.poll() is None:
+            proc.kill()
+        proc.communicate()
+
+    def _read_commit(self):
+        ":return: the sha of the next commit streamed, or `None` when exhausted"
+        proc = self._proc
+        line = proc.stdout.readline()
+        if not line:
+            _out, err = proc.communicate()
+            if proc.returncode != 0:
+                raise MyCalledProcessError(proc.returncode, self.cmd,
+                                           None, err, self.basepath)
+            return None
+
+        fields = line.decode('ascii').split()
+        sha = fields[1]
+        self._commits[sha] = (fields[2:], int(fields[0]))
+
+        return sha
+
+    def commit(self, sha):
+        ":return: a 2-tuple ``(parent-shas, committer-tstamp)``"
+        info = self._commits.get(sha)
+        while info is None:
+            if self._read_commit() is None:
+                raise ValueError("Commit %s not in the history of HEAD!" % sha)
+            info = self._commits.get(sha)
+
+        return info
+
+
+def _git_tag_infos(basepath):
+    """
+    List all tags with a single ``git for-each-ref``, like :meth:`pygit.PyGit.tag_infos()`.
+    """
+    fmt = '%00'.join(('%(refname)', '%(objecttype)', '%(objectname)',
+                      '%(*objecttype)', '%(*objectname)', '%(taggerdate:raw)'))
+    out = _my_run(['git', 'for-each-ref', '--format=' + fmt, 'refs/tags/'],
+                  cwd=basepath)
+
+    infos = []
+    for line in (out or '').splitlines():
+        refname, otype, sha, peeled_otype, peeled_sha, tagger_date = line.split('\0')
+        is_annotated = otype == 'tag'
+        if is_annotated:
+            otype, sha = peeled_otype, peeled_sha
+        if otype == 'commit':
+            tag_tstamp = int(tagger_date.split()[0]) if tagger_date else 0
+            infos.append((refname[len('refs/tags/'):], sha, is_annotated, tag_tstamp))
+
+    return infos
+
+
+def _memoized(func):
+    "Cache the results of a single-arg `func` (no `lru_cache` in PY2)."
+    memo = {}
+
+    def wrapper(arg):
+        if arg not in memo:
+            memo[arg] = func(arg)
+        return memo[arg]
+
+    return wrapper
+
+
+def _describe_walked(basepath, cmd, patterns, walk=None):
+    ":return: the *pvtag* found by `walk`, or else by ``git describe``"
+    pvtag = None
+    if walk:
+        try:
+            pvtag = walk(patterns)
+        except Exception as ex:
+            log.debug("Describe-walk for %s failed due to: %s", patterns, ex)
+
+    return pvtag or _git_describe(list(cmd), patterns, basepath)
+
+
+def describe_many(basepath, patterns_list, git_options, use_pygit):
+    """
+    Emulate ``git describe`` for many projects, forking git only a fixed number of times.
+
+    All tags are listed once, and the commits read from a single history-stream
+    are shared among the walks of all projects.  Walks failing (e.g. no tags)
+    are retried with ``git describe``, to report its genuine errors.
+
+    :param basepath:
+        a path inside the git repo
+    :param patterns_list:
+        a list with the tag-patterns of each project
+    :param git_options:
+        extra ``git describe`` options (only ``--tags`` is emulated by the walks,
+        others make it fork ``git describe`` for each project)
+    :param use_pygit:
+        whether to read the repo with the pure-python git-engine
+        (see :func:`is_python_git_engine()`)
+    :return:
+        a list with the *pvtag* (or the exception raised) for each item
+        in `patterns_list`
+    """
+    from . import pygit
+
+    tags = bool(git_options)
+    cmd = ['git', 'describe'] + list(git_options or ())
+
+    def describe_each(walk=None):
+        results = []
+        for patterns in patterns_list:
+            try:
+                results.append(_describe_walked(basepath, cmd, patterns, walk))
+            except Exception as ex:
+                results.append(ex)
+
+        return results
+
+    def walk_each(head, tag_infos, commit, abbrev):
+        abbrev = _memoized(abbrev)
+
+        return describe_each(lambda patterns: pygit.walk_describe(
+            head, pygit.best_names(tag_infos, patterns), commit, abbrev, tags))
+
+    ## Only `--tags` option is emulated by the walks.
+    if set(git_options or ()) - {'--tags'}:
+        return describe_each()
+
+    if use_pygit:
+        try:
+            with pygit.PyGit(basepath) as repo:
+                return walk_each(repo.head_sha(), repo.tag_infos(),
+                                 repo.commit, repo.abbrev)
+        except Exception as ex:
+            log.debug("Pure-python git-engine falling back to `git` command due to: %s",
+                      ex, exc_info=not isinstance(ex, pygit.PyGitError))
+
+    try:
+        tag_infos = _git_tag_infos(basepath)
+        history = _GitRevList(basepath)
+    except Exception as ex:
+        return [ex] * len(patterns_list)
+
+    with history:
+        return walk_each(history.head, tag_infos, history.commit,
+                         lambda sha: _my_run(['git', 'rev-parse', '--short', sha],
+                                             cwd=basepath))
 
 
 def decide_vprefixes(vprefixes, is_release):
@@ -429,10 +1234,31 @@ def decide_vprefixes(vprefixes, is_release):
     return vprefixes
 
 
+def _env_default_version(pname, default_version, kw):
+    "Read `default_version` from its env-var, unless given."
+    if not default_version:
+        defver_envvar = kw.get('default_version_env_var', '%s_VERSION' % pname)
+        ## Ignore empty/none envvars
+        #  to preserve empty (but not none) `default-version` kwd.
+        #
+        env_ver = os.environ.get(defver_envvar)
+        if env_ver:
+            default_version = env_ver
+
+    return default_version
+
+
 def polyversion(**kw):
     """
     Report the *pvtag* of the `pname` in the git repo hosting the source-file calling this.
 
+    The version is searched, in this order, in:
+
+    1. the :data:`version_module_fname` generated in packages built
+       by the :term:`setuptools plugin`, if any;
+    2. any package-metadata (see :func:`pkg_metadata_version()`);
+    3. the git tags.
+
     :param str pname:
         The project-name, used as the prefix of pvtags when searching them.
         If not given, defaults to the *last segment of the module-name of the caller*.
@@ -496,6 +1322,25 @@ def polyversion(**kw):
         it is splitted by spaces.
     :param return_all:
         when true, return the 3-tuple (tag, version, desc-id) (not just version)
+    :param git_cache:
+        When true, ``git describe`` results are cached on disk under
+        ``<git-dir>/polyversion/``, keyed by HEAD, *packed-refs* & loose tags
+        and the tag-pattern arguments (along with the HEAD's commit-date),
+        and memoized in the process, so repeated calls do not fork git
+        until any of those change.
+
+        - It is bypassed when `git_options` are given.
+        - If `None` (default), it is enabled unless the :data:`git_cache_envvar`
+          env-var is set to a false-like value (e.g. ``0``).
+    :param git_engine:
+        How to query git, one of:
+
+        - ``git``: launch the ``git describe`` command (default);
+        - ``python``: read the repo files with the pure-python :mod:`pygit` engine,
+          without any subprocess, falling back to the `git` command for
+          anything it cannot handle (e.g. any `git_options` apart from ``--tags``).
+
+        If `None`, read from :data:`git_engine_envvar` env-var.
 
     :return:
         The version-id (or 3-tuple) derived from the *pvtag*, or `default` if
@@ -513,20 +1358,17 @@ def polyversion(**kw):
 
             __version__ = polyversion('myproj')
 
+        To avoid launching git on import, compute them lazily on first access,
+        from a module ``__getattr__()`` (:pep:`562`), like the sources
+        of this module do.
+
     .. Note::
        This is a python==2.7 & python<3.6 safe function; there is also the similar
        function with elaborate error-handling :func:`polyvers.pvtags.describe_project()`
        in the full-blown tool `polyvers`.
     """
     pname = kw.get('pname')
-    default_version = kw.get('default_version')
     basepath = kw.get('basepath')
-    mono_project = kw.get('mono_project')
-    tag_format = kw.get('tag_format')
-    tag_regex = kw.get('tag_regex')
-    vprefixes = kw.get('vprefixes')
-    is_release = kw.get('is_release')
-    git_options = kw.get('git_options')
     return_all = kw.get('return_all')
 
     if not pname:
@@ -537,20 +1379,171 @@ def polyversion(**kw):
         if not basepath:
             basepath = '.'
 
+    built = _built_version(pname, basepath)
+    if built:
+        return built if return_all else built[1]
+
+    tag, version, descid, _cdate = _polyversion_from_git(pname, basepath, kw)
+    if return_all:
+        return tag, version, descid
+    return version
+
+
+def _polyversion_from_git(pname, basepath, kw):
+    ":return: the 4-tuple of :func:`_git_describe_parsed()`"
+    default_version = kw.get('default_version')
+    mono_project = kw.get('mono_project')
+    tag_format = kw.get('tag_format')
+    tag_regex = kw.get('tag_regex')
+    vprefixes = kw.get('vprefixes')
+    is_release = kw.get('is_release')
+    git_options = kw.get('git_options')
+    git_cache = kw.get('git_cache')
+    git_engine = kw.get('git_engine')
+
+    default_version = _env_default_version(pname, default_version, kw)
+
+    if tag_format is None:
+        tag_format = vtag_format if mono_project else pvtag_format
+    if tag_regex is None:
+        tag_regex = vtag_regex if mono_project else pvtag_regex
+
+    vprefixes = decide_vprefixes(vprefixes, is_release)
+
+    return _git_describe_parsed(pname, default_version,
+                                tag_format, tag_regex,
+                                vprefixes,
+                                basepath, git_options,
+                                git_cache, git_engine)
+
+
+def _built_version(pname, basepath):
+    """
+    :return:
+        the 3-tuple ``(pvtag, version, descid)`` from the generated version-module
+        or the package-metadata (where `pvtag` & `descid` are `None`), if any
+    """
+    info = _read_version_module(pname, basepath)
+    if info:
+        return info.pvtag, info.version, info.descid
+
     version = pkg_metadata_version(pname, basepath)
     if version:
-        if return_all:
-            return None, version, None
-        return version
+        return None, version, None
 
-    if not default_version:
-        defver_envvar = kw.get('default_version_env_var', '%s_VERSION' % pname)
-        ## Ignore empty/none envvars
-        #  to preserve empty (but not none) `default-version` kwd.
-        #
-        env_ver = os.environ.get(defver_envvar)
-        if env_ver:
-            default_version = env_ver
+
+def _describe_slot(pname, basepath, tag_format, tag_regex, vprefixes, use_cache):
+    """
+    :return:
+        a list ``[pvtag, tag_patterns, tag_regexes, cache_fpath, state_key]``,
+        with the `pvtag` loaded from the describe-cache, if found there
+    """
+    tag_patterns, tag_regexes = _tag_matchers(pname, tag_format, tag_regex,
+                                              vprefixes)
+    pvtag = cache_fpath = state_key = None
+    if use_cache:
+        cache_fpath, state_key = _describe_cache_slot(
+            basepath, pname, tag_format, tag_regex, *vprefixes)
+        if cache_fpath:
+            pvtag = _describe_cache_load(cache_fpath, state_key)[0]
+
+    return [pvtag, tag_patterns, tag_regexes, cache_fpath, state_key]
+
+
+def _pvtag_parsed_or_default(pname, pvtag, tag_regexes, default_version):
+    """
+    :param pvtag:
+        the *pvtag* described, or the exception raised while describing it
+    :return:
+        the 3-tuple ``(pvtag, version, descid)``, with the `default_version`
+        if `pvtag` failed
+    :raise:
+        the failure, if `default_version` is `None`
+    """
+    version = descid = None
+    try:
+        if isinstance(pvtag, Exception):
+            raise pvtag
+        version, descid = _pvtag_parsed(pname, pvtag, tag_regexes)
+    except Exception as ex:
+        if default_version is None:
+            raise
+        else:
+            log.warning(
+                "polyversions(): falling back to default-version '%s' "
+                "for project '%s' due to ignored error: %s",
+                default_version, pname, ex, exc_info=1)
+    if isinstance(pvtag, Exception):
+        pvtag = None
+
+    return pvtag, version or default_version, descid
+
+
+def _describe_uncached(basepath, projects, git_options, use_pygit):
+    """
+    Describe in one git pass the `projects` not found in the describe-cache, & cache them.
+
+    :param projects:
+        a dict ``{pname: describe_slot}`` (see :func:`_describe_slot()`),
+        updated in-place with the *pvtags* described (or the exceptions raised)
+    """
+    uncached = [pname for pname, proj in projects.items() if not proj[0]]
+    if uncached:
+        pvtags = describe_many(basepath, [projects[p][1] for p in uncached],
+                               git_options, use_pygit)
+        for pname, pvtag in zip(uncached, pvtags):
+            proj = projects[pname]
+            proj[0] = pvtag
+            if proj[3] and not isinstance(pvtag, Exception):
+                _describe_cache_store(proj[3], proj[4], pvtag)
+
+
+def polyversions(**kw):
+    """
+    Like :func:`polyversion()` for many projects, resolving all of them in one git pass.
+
+    Instead of launching ``git describe`` per project, all tags are listed once
+    with ``git for-each-ref``, and a single history-stream of ``git rev-list``
+    (or the :mod:`pygit` engine) is shared by all per-project walks,
+    emulating ``git describe`` to give the same results as calling
+    :func:`polyversion()` for each project.
+
+    :param pnames:
+        a (non-empty) sequence of project-names
+    :param kw:
+        any other keyword of :func:`polyversion()` (apart from `pname`),
+        applied to all projects, e.g. the `default_version` & env-var.
+        Any `git_options` apart from ``--tags`` cannot be emulated,
+        so ``git describe`` is launched for each project.
+    :return:
+        a dict ``{pname: version}`` ordered like `pnames`,
+        or with 3-tuples as values if `return_all`.
+    :raise CalledProcessError:
+        on the first project without a vtag, if `default_version` is None
+    """
+    from collections import OrderedDict
+
+    pnames = kw.get('pnames')
+    default_version = kw.get('default_version')
+    basepath = kw.get('basepath')
+    mono_project = kw.get('mono_project')
+    tag_format = kw.get('tag_format')
+    tag_regex = kw.get('tag_regex')
+    vprefixes = kw.get('vprefixes')
+    is_release = kw.get('is_release')
+    git_options = _split_git_options(kw.get('git_options'))
+    return_all = kw.get('return_all')
+    use_cache = not git_options and is_git_cache_enabled(kw.get('git_cache'))
+    use_pygit = is_python_git_engine(kw.get('git_engine'))
+
+    if not pnames or isinstance(pnames, str):
+        raise ValueError("Expected `pnames` as a non-empty list-of-str, got: %r" %
+                         (pnames, ))
+
+    if not basepath:
+        basepath = _caller_basepath()
+        if not basepath:
+            basepath = '.'
 
     if tag_format is None:
         tag_format = vtag_format if mono_project else pvtag_format
@@ -558,13 +1551,28 @@ def polyversion(**kw):
         tag_regex = vtag_regex if mono_project else pvtag_regex
 
     vprefixes = decide_vprefixes(vprefixes, is_release)
-    tag, version, descid = _git_describe_parsed(pname, default_version,
-                                                tag_format, tag_regex,
-                                                vprefixes,
-                                                basepath, git_options)
-    if return_all:
-        return tag, version, descid
-    return version
+
+    ## {pname: (pvtag, version, descid)}
+    results = OrderedDict()
+    ## {pname: [pvtag, tag_patterns, tag_regexes, cache_fpath, state_key]}
+    projects = OrderedDict()
+    for pname in pnames:
+        results[pname] = _built_version(pname, basepath)  # also preserve order
+        if not results[pname]:
+            projects[pname] = _describe_slot(pname, basepath, tag_format, tag_regex,
+                                             vprefixes, use_cache)
+
+    _describe_uncached(basepath, projects, git_options, use_pygit)
+
+    for pname, (pvtag, _patterns, tag_regexes, _fpath, _key) in projects.items():
+        defver = _env_default_version(pname, default_version, kw)
+        results[pname] = _pvtag_parsed_or_default(pname, pvtag, tag_regexes, defver)
+
+    if not return_all:
+        for pname, res in results.items():
+            results[pname] = res[1]
+
+    return results
 
 
 def polytime(**kw):
@@ -588,11 +1596,15 @@ def polytime(**kw):
     :param str default_version_env_var:
         Override which env-var to read *version* from, if git cmd fails
         [Default: ``<pname>_VERSION``]
+    :param git_cache:
+        when false, do not reuse the commit-date memoized by any previous call
+        of this function or :func:`polyversion()`; see there
+    :param git_engine:
+        see :func:`polyversion()`
 
     :return:
         the commit-date if in git repo, or now; :rfc:`2822` formatted
     """
-    no_raise = kw.get('no_raise', False)
     basepath = kw.get('basepath')
     pname = kw.get('pname')
 
@@ -602,23 +1614,13 @@ def polytime(**kw):
     if not basepath:
         basepath = _caller_basepath()
 
-    cdate = None
-    if not pkg_metadata_version(pname, basepath):
-        defver_envvar = kw.get('default_version_env_var', '%s_VERSION' % pname)
-        if os.environ.get(defver_envvar):
-            no_raise = True
-
-        cmd = "git log -n1 --format=format:%cD"
-        try:
-                cdate = _my_run(cmd, cwd=basepath)
-        except Exception as ex:
-            if not no_raise:
-                raise
-            else:
-                log.warning(
-                    "polytime(): falling back to current-time "
-                    "due to ignored error: %s",
-                    ex, exc_info=1)
+    info = _read_version_module(pname, basepath)
+    if info:
+        cdate = info.cdate
+    elif not pkg_metadata_version(pname, basepath):
+        cdate = _polytime_from_git(pname, basepath, kw)
+    else:
+        cdate = None
 
     if not cdate:
         cdate = rfc2822_tstamp()
@@ -626,6 +1628,96 @@ def polytime(**kw):
     return cdate
 
 
+def _polytime_from_git(pname, basepath, kw):
+    ":return: HEAD's commit-date, or `None` if failed & `no_raise`"
+    no_raise = kw.get('no_raise', False)
+    use_pygit = is_python_git_engine(kw.get('git_engine'))
+    use_cache = is_git_cache_enabled(kw.get('git_cache'))
+
+    defver_envvar = kw.get('default_version_env_var', '%s_VERSION' % pname)
+    if os.environ.get(defver_envvar):
+        no_raise = True
+
+    cdate = None
+    cmd = "git log -n1 --format=format:%cD"
+    try:
+        gitdir = state_key = None
+        if use_cache:
+            gitdir, state_key = _git_state(basepath)
+            if gitdir:
+                cdate = _memo_load((gitdir, 'cdate'), state_key)
+
+        if not cdate:
+            if use_pygit:
+                cdate = _pygit_call(basepath, 'head_commit_date')
+            if not cdate:
+                cdate = _my_run(cmd, cwd=basepath)
+            if gitdir and cdate:
+                _memo_store((gitdir, 'cdate'), state_key, cdate)
+    except Exception as ex:
+        if not no_raise:
+            raise
+        else:
+            log.warning(
+                "polytime(): falling back to current-time "
+                "due to ignored error: %s",
+                ex, exc_info=1)
+
+    return cdate
+
+
+#: The record returned by :func:`polyinfo()`.
+PolyInfo = namedtuple('PolyInfo', 'pname version pvtag descid cdate')
+
+
+def polyinfo(**kw):
+    """
+    Report the version, *pvtag*, descid & last commit-date with a single git call.
+
+    Cheaper than invoking both :func:`polyversion()` & :func:`polytime()`,
+    since it probes the package-metadata just once, and fetches ``git describe``
+    along with the commit-date, through the ``%(describe)`` placeholder of
+    ``git log`` (git-2.32+) or the :mod:`pygit` engine.
+
+    :param kw:
+        all keywords of :func:`polyversion()` (`return_all` is ignored)
+        and :func:`polytime()` (e.g. `no_raise`)
+    :return:
+        a :data:`PolyInfo` named-tuple ``(pname, version, pvtag, descid, cdate)``
+    :raise CalledProcessError:
+        like :func:`polyversion()` & :func:`polytime()`
+
+    .. Tip::
+        Results are memoized per git-repo & HEAD & tags for the lifetime
+        of the process (unless `git_cache` is false), so that calling
+        afterwards any of the two functions above does not launch git.
+    """
+    pname = kw.get('pname')
+    basepath = kw.get('basepath')
+
+    if not pname:
+        pname = _caller_module_name()
+
+    if not basepath:
+        basepath = _caller_basepath()
+        if not basepath:
+            basepath = '.'
+
+    info = _read_version_module(pname, basepath)
+    if info:
+        return info._replace(cdate=info.cdate or rfc2822_tstamp())
+
+    version = pkg_metadata_version(pname, basepath)
+    if version:
+        return PolyInfo(pname, version, None, None, rfc2822_tstamp())
+
+    pvtag, version, descid, cdate = _polyversion_from_git(pname, basepath, kw)
+    if not cdate:
+        cdate = _polytime_from_git(pname, basepath, kw) or rfc2822_tstamp()
+
+    return PolyInfo(pname, version, pvtag, descid, cdate)
+
+
 def _init_logging():
     level = os.environ.get('POLYVERSION_LOG_LEVEL')
     if level:
@@ -646,8 +1738,31 @@ def _init_logging():
 if 'POLYVERSION_LOG_LEVEL' in os.environ:
     _init_logging()
 
-__version__ = polyversion(default_version='0.0.0')
-__updated__ = polytime(no_raise=True)
+
+#: Engraved with static values on releases, else computed lazily by :func:`__getattr__()`.
+__version__ = None
+__updated__ = None
+
+
+def __getattr__(name):
+    """Compute version-attributes on first access, not on import (:pep:`562`)."""
+    if name == '__version__':
+        value = polyversion(default_version='0.0.0')
+    elif name == '__updated__':
+        value = polytime(no_raise=True)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+
+    return value
+
+
+for _name in ('__version__', '__updated__'):
+    if globals()[_name] is None:  # not engraved
+        del globals()[_name]
+        if sys.version_info < (3, 7):  # no module `__getattr__()`
+            __getattr__(_name)
+del _name
 
 
 def run(*args):
@@ -656,11 +1771,15 @@ def run(*args):
 
     USAGE:
         %(prog)s [-t] [PROJ-1] ...
+        %(prog)s build-all [-j N] [SETUP-DIR ...] [-- SETUP-CMD ...]
         %(prog)s [-v | -V ]     # print my version information
 
     - See http://polyvers.readthedocs.io
     - In order to set cmd-line arguments, invoke directly the function above.
     - With a single project, it raises any problems (e.g. no tags).
+    - Many projects are all resolved in a single git pass.
+    - The ``build-all`` sub-command builds all sub-projects with their versions
+      precomputed from a single git pass (see :mod:`polyversion.buildall`).
     - Use env-var[POLYVERSION_LOG_LEVEL] to control verbosity
       (0: show all, 10: DEBUG, 30: INFO, 40: WARN, 50: ERROR, 60=FATAL).
 
@@ -679,12 +1798,13 @@ def run(*args):
             print(doc % {'prog': cmdname})
             return
 
+    me = sys.modules[__name__]  # lazy version-attributes
     if '-v' in args:
-        print(__version__, end='')
+        print(me.__version__, end='')
         return
     if '-V' in args:
         print("version: %s\nupdated: %s\nfile: %s" % (
-            __version__, __updated__, __file__))
+            me.__version__, me.__updated__, __file__))
         return
 
     print_tag = None
@@ -695,6 +1815,11 @@ def run(*args):
 
     _init_logging()
 
+    if args and args[0] == 'build-all':
+        from . import buildall
+
+        return buildall.run(*args[1:])
+
     if len(args) == 1:
         res = polyversion(pname=args[0], basepath=os.curdir,
                           return_all=print_tag)
@@ -702,17 +1827,18 @@ def run(*args):
         if print_tag:
             res = res[0]
 
-    else:
-        versions = [(pname, polyversion(pname=pname,
-                                        default_version='',
-                                        basepath=os.curdir,
-                                        return_all=print_tag))
-                    for pname in args]
+    elif args:
+        versions = polyversions(pnames=args,
+                                default_version='',
+                                basepath=os.curdir,
+                                return_all=print_tag).items()
 
         if print_tag:
             versions = [(pname, ver[0]) for pname, ver in versions]
 
         res = '\n'.join('%s: %s' % (pname, ver or '') for pname, ver in versions)
+    else:
+        res = None
 
     if res:
         print(res)
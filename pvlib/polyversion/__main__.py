@@ -15,7 +15,7 @@ import sys
 
 def main():
     import polyversion
-    polyversion.run(*sys.argv[1:])
+    return polyversion.run(*sys.argv[1:])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+"""
+Build all sub-projects of a monorepo, deriving their versions from a single tag-scan.
+
+Launched with ``polyversion build-all ...`` (see :func:`run()`), it discovers
+the ``setup.py`` files of the sub-projects, and computes the versions and
+:term:`release tag` checks of all of them from one listing of the tags
+and one history-stream per git repo (see :func:`polyversion.polyversions()`).
+
+The results reach each ``setup.py`` process through env-vars:
+
+- the version through the ``<pname>_VERSION`` env-var (or any other
+  `default_version_env_var`) of each project, and
+- the *pvtag*, descid, commit-date & r-tag check of each project through
+  the JSON in :data:`build_all_envvar`;  the :term:`setuptools plugin` trusts
+  the version env-var only for the projects listed there, without launching git.
+
+Projects whose ``setup()`` keywords are not python literals (or not in a git repo)
+are built as usual, deriving their versions by themselves.
+
+- Python-2.7-safe, no-deps, like the rest of `polyversion` library.
+"""
+from __future__ import print_function
+
+from collections import namedtuple
+import logging
+import os
+import sys
+
+import os.path as osp
+
+from polyversion import (_env_default_version, _git_state, _my_run,
+                         _pvtag_parsed, _tag_matchers,
+                         decide_vprefixes, describe_many, is_python_git_engine,
+                         pkg_metadata_version,
+                         pvtag_format, pvtag_regex, vtag_format, vtag_regex)
+
+
+log = logging.getLogger(__name__)
+
+#: The env-var with the JSON ``{pname: [pvtag, descid, cdate, rtag_err]}``
+#: passed to the builds; `rtag_err` is false when on a :term:`release tag`.
+build_all_envvar = 'POLYVERSION_BUILD_ALL'
+
+#: Dirs never searched for ``setup.py`` files (apart from hidden ones).
+skip_dirs = ('build', 'dist', 'node_modules', '__pycache__')
+
+_Project = namedtuple('_Project', 'setup_dir pname basepath pvargs default_version')
+
+
+def prebuilt_results():
+    """
+    :return:
+        the dict passed by a build-all driver in :data:`build_all_envvar`,
+        or empty
+    """
+    import json
+
+    text = os.environ.get(build_all_envvar)
+    if text:
+        try:
+            return json.loads(text)
+        except Exception as ex:
+            log.warning("Ignoring invalid `%s` env-var due to: %s",
+                        build_all_envvar, ex)
+
+    return {}
+
+
+def find_setup_dirs(rootdir):
+    ":return: a sorted list of dirs below `rootdir` containing a ``setup.py`` file"
+    setup_dirs = []
+    for dirpath, dirnames, filenames in os.walk(rootdir):
+        dirnames[:] = sorted(d for d in dirnames
+                             if not d.startswith('.') and
+                             d not in skip_dirs and
+                             not d.endswith('.egg-info'))
+        if 'setup.py' in filenames:
+            setup_dirs.append(dirpath)
+
+    return setup_dirs
+
+
+def _literal(node, names):
+    "Evaluate a python-literal `node`, or a name in `names`."
+    import ast
+
+    if isinstance(node, ast.Name) and node.id in names:
+        return names[node.id]
+    return ast.literal_eval(node)
+
+
+def _module_literals(tree):
+    ":return: a dict with the module-level names assigned to python literals"
+    import ast
+
+    names = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and
+                isinstance(node.targets[0], ast.Name)):
+            try:
+                names[node.targets[0].id] = _literal(node.value, names)
+            except (ValueError, TypeError, SyntaxError):
+                pass
+
+    return names
+
+
+def _setup_kwds(setup_py):
+    """
+    Statically read the literal keywords of the ``setup()`` call in `setup_py`.
+
+    Values assigned to module-level names are resolved, as long as
+    they are python literals.
+
+    :return:
+        the kwds-dict, or `None` if no ``setup()`` call found
+    """
+    import ast
+    import io
+
+    with io.open(setup_py, 'rb') as fp:
+        tree = ast.parse(fp.read(), setup_py)
+
+    names = _module_literals(tree)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            if getattr(func, 'id', getattr(func, 'attr', None)) == 'setup':
+                kwds = {}
+                for kw in node.keywords:
+                    if kw.arg:  # not ``**kwds``
+                        try:
+                            kwds[kw.arg] = _literal(kw.value, names)
+                        except (ValueError, TypeError, SyntaxError):
+                            pass
+
+                return kwds
+
+
+def _read_project(setup_dir):
+    """
+    :return:
+        a :class:`_Project`, or `None` if its version cannot be precomputed
+    """
+    setup_py = osp.join(setup_dir, 'setup.py')
+    try:
+        kwds = _setup_kwds(setup_py)
+    except Exception as ex:
+        log.warning("Cannot parse '%s' due to: %s", setup_py, ex)
+        return
+
+    if not kwds:
+        return
+
+    pname = kwds.get('name')
+    pvargs = kwds.get('polyversion')
+    if not isinstance(pname, str) or not pvargs:
+        return
+    if pvargs is True:
+        pvargs = {}
+    if not isinstance(pvargs, dict) or pvargs.get('git_options'):
+        return
+
+    package_dir = kwds.get('package_dir')
+    basepath = (pvargs.get('basepath') or
+                (isinstance(package_dir, dict) and package_dir.get('')) or
+                '.')
+    basepath = osp.join(setup_dir, basepath)
+
+    ## Versions from metadata are cheap, and left to the build itself.
+    if pkg_metadata_version(pname, basepath):
+        return
+
+    return _Project(setup_dir, pname, basepath, pvargs, kwds.get('version'))
+
+
+def _project_matchers(proj, is_release):
+    pvargs = proj.pvargs
+    mono_project = pvargs.get('mono_project')
+    tag_format = pvargs.get('tag_format')
+    tag_regex = pvargs.get('tag_regex')
+    if tag_format is None:
+        tag_format = vtag_format if mono_project else pvtag_format
+    if tag_regex is None:
+        tag_regex = vtag_regex if mono_project else pvtag_regex
+    vprefixes = decide_vprefixes(pvargs.get('vprefixes'), is_release)
+
+    return _tag_matchers(proj.pname, tag_format, tag_regex, vprefixes)
+
+
+def _defver_envvar(proj):
+    return proj.pvargs.get('default_version_env_var', '%s_VERSION' % proj.pname)
+
+
+def _head_commit_date(basepath):
+    ":return: the HEAD's commit-date (like ``%cD``), or `None` on errors"
+    try:
+        return _my_run(['git', 'log', '-n1', '--format=format:%cD'], cwd=basepath)
+    except Exception as ex:
+        log.warning("Cannot read HEAD's commit-date due to: %s", ex)
+
+
+def _project_result(proj, pvtag, rtag, tag_regexes, cdate):
+    """
+    :param pvtag, rtag:
+        the *pvtags* described for `proj`, or the exceptions raised
+    :return:
+        a 2-tuple ``(version, [pvtag, descid, cdate, rtag_err])``,
+        or `None` if the project must derive its own version
+    """
+    pname = proj.pname
+    defver = _env_default_version(pname, proj.default_version, proj.pvargs)
+    version = descid = None
+    try:
+        if isinstance(pvtag, Exception):
+            raise pvtag
+        version, descid = _pvtag_parsed(pname, pvtag, tag_regexes)
+    except Exception as ex:
+        if not defver:
+            log.info("Project '%s' to derive its own version, due to: %s",
+                     pname, ex)
+            return None
+        version, pvtag = defver, None
+
+    ## Any user-set version env-var bypasses r-tag check, like `setup.py` does.
+    rtag_err = False
+    if (isinstance(rtag, Exception) and
+            not _env_default_version(pname, None, proj.pvargs)):
+        rtag_err = str(rtag)
+
+    return version, [pvtag, descid, cdate, rtag_err]
+
+
+def precompute_versions(projects):
+    """
+    Describe the version & r-tag of all `projects`, with a single tag-scan per git repo.
+
+    :param projects:
+        a list of :class:`_Project` instances
+    :return:
+        a dict ``{pname: (version, [pvtag, descid, cdate, rtag_err])}``,
+        for the projects whose version could be derived
+    """
+    use_pygit = is_python_git_engine(None)
+
+    ## {gitdir: [proj, ...]}
+    repos = {}
+    for proj in projects:
+        gitdir = _git_state(proj.basepath)[0]
+        if gitdir:
+            repos.setdefault(gitdir, []).append(proj)
+
+    results = {}
+    for repo_projects in repos.values():
+        matchers = [_project_matchers(p, is_release)
+                    for p in repo_projects
+                    for is_release in (None, True)]
+        basepath = repo_projects[0].basepath
+        pvtags = describe_many(basepath, [m[0] for m in matchers], None, use_pygit)
+
+        cdate = None
+        if any(p.pvargs.get('version_module') for p in repo_projects):
+            cdate = _head_commit_date(basepath)
+
+        for i, proj in enumerate(repo_projects):
+            pvtag, rtag = pvtags[2 * i:2 * i + 2]
+            res = _project_result(proj, pvtag, rtag, matchers[2 * i][1], cdate)
+            if res:
+                results[proj.pname] = res
+
+    return results
+
+
+def _launch_builds(setup_dirs, setup_cmds, env, jobs):
+    """
+    Run ``python setup.py <setup_cmds>`` in each dir, at most `jobs` at a time.
+
+    :return:
+        a list with the dirs that failed
+    """
+    import subprocess as sbp
+    import tempfile
+    import time
+
+    pending = list(reversed(setup_dirs))
+    running = []  # [(setup_dir, proc, outfile), ...]
+    failed = []
+    while pending or running:
+        while pending and len(running) < jobs:
+            setup_dir = pending.pop()
+            outfile = tempfile.TemporaryFile()
+            cmd = [sys.executable, 'setup.py'] + list(setup_cmds)
+            log.info("Building '%s': %s", setup_dir, ' '.join(cmd[1:]))
+            proc = sbp.Popen(cmd, cwd=setup_dir, env=env,
+                             stdout=outfile, stderr=sbp.STDOUT)
+            running.append((setup_dir, proc, outfile))
+
+        for item in list(running):
+            setup_dir, proc, outfile = item
+            if proc.poll() is None:
+                continue
+
+            running.remove(item)
+            outfile.seek(0)
+            out = outfile.read().decode('utf-8', 'replace')
+            outfile.close()
+            if proc.returncode:
+                failed.append(setup_dir)
+                log.error("Build of '%s' failed(%s):\n%s",
+                          setup_dir, proc.returncode, out)
+            else:
+                log.info("Built '%s'.", setup_dir)
+                log.debug("Build output of '%s':\n%s", setup_dir, out)
+
+        if running:
+            time.sleep(0.05)
+
+    return failed
+
+
+def build_all(setup_dirs=None, setup_cmds=('bdist_wheel', ), jobs=None):
+    """
+    Precompute versions of all `setup_dirs` and build them in a bounded pool of processes.
+
+    :param setup_dirs:
+        dirs containing ``setup.py`` files; if not given, found below current dir
+        (see :func:`find_setup_dirs()`)
+    :param setup_cmds:
+        the ``setup.py`` commands & options to run in each dir
+    :param jobs:
+        the maximum number of builds running in parallel;
+        if not given, the number of CPUs
+    :return:
+        a list with the dirs whose builds failed
+    """
+    import json
+
+    if setup_dirs is None:
+        setup_dirs = find_setup_dirs(os.curdir)
+    if not jobs:
+        import multiprocessing
+
+        jobs = multiprocessing.cpu_count()
+
+    projects = [p for p in (_read_project(d) for d in setup_dirs) if p]
+    results = precompute_versions(projects)
+
+    env = os.environ.copy()
+    prebuilt = {}
+    for proj in projects:
+        if proj.pname in results:
+            version, prebuilt[proj.pname] = results[proj.pname]
+            env[_defver_envvar(proj)] = version
+    env[build_all_envvar] = json.dumps(prebuilt)
+    log.info("Precomputed versions for %s out of %s projects: %s",
+             len(prebuilt), len(setup_dirs),
+             ', '.join('%s=%s' % (p, results[p][0]) for p in prebuilt))
+
+    return _launch_builds(setup_dirs, setup_cmds, env, jobs)
+
+
+def run(*args):
+    """
+    Build all sub-projects of a monorepo, sharing a single git tag-scan.
+
+    USAGE:
+        %(prog)s build-all [-j N] [SETUP-DIR ...] [-- SETUP-CMD ...]
+
+    - Without any SETUP-DIR, all ``setup.py`` files below current dir are built.
+    - The SETUP-CMDs default to ``bdist_wheel``.
+    - Use ``-j N`` to limit the builds running in parallel (default: CPU count).
+
+    :return:
+        the process exit-code
+    """
+    setup_cmds = ['bdist_wheel']
+    args = list(args)
+    if '--' in args:
+        i = args.index('--')
+        args, setup_cmds = args[:i], args[i + 1:]
+
+    jobs = None
+    setup_dirs = []
+    it = iter(args)
+    for arg in it:
+        if arg in ('-j', '--jobs'):
+            arg = next(it, '')
+        elif arg.startswith(('-j', '--jobs=')):
+            arg = arg.split('=', 1)[-1] if '=' in arg else arg[2:]
+        else:
+            setup_dirs.append(arg)
+            continue
+        try:
+            jobs = int(arg)
+        except ValueError:
+            raise ValueError("Expected an integer for `-j` option, got: %r" % arg)
+
+    failed = build_all(setup_dirs or None, setup_cmds, jobs)
+    if failed:
+        log.error("Failed %s builds: %s", len(failed), ', '.join(failed))
+        return 1
+
+    return 0
@@ -0,0 +1,728 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+"""
+A subprocess-free, pure-python reader of git repos, just enough to emulate ``git describe``.
+
+It reads directly ``HEAD``, loose & packed refs, and loose & packed
+(possibly deltified) objects, to compute the same ``<tag>-<N>-g<sha>`` descriptions
+and last-commit dates as the `git` commands launched by :func:`polyversion.polyversion()`
+and :func:`polyversion.polytime()`.
+
+- Python-2.7-safe, no-deps, like the rest of `polyversion` library.
+- It raises :class:`PyGitError` for anything it cannot handle (e.g. *sha256* repos,
+  replace-refs, grafts, alternates, a ``core.abbrev`` config), and callers
+  are expected to fall back to the `git` command.
+"""
+from __future__ import print_function
+
+import binascii
+import fnmatch
+import heapq
+import itertools as itt
+import os
+import re
+import struct
+import zlib
+
+import os.path as osp
+
+from polyversion import _read_text, find_git_dirs
+
+
+class PyGitError(Exception):
+    "A repo-feature not supported by the pure-python engine; use the `git` command."
+    pass
+
+
+_OBJ_TYPES = {1: 'commit', 2: 'tree', 3: 'blob', 4: 'tag'}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+
+_WEEKDAYS = 'Mon Tue Wed Thu Fri Sat Sun'.split()
+_MONTHS = 'Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec'.split()
+
+#: Config-keys that alter the results and are not emulated.
+_unsupported_config_regex = re.compile(
+    r'^\s*(abbrev|objectformat)\s*=|^\s*\[\s*include', re.I | re.M)
+_unsupported_envvars = ('GIT_CONFIG_PARAMETERS', 'GIT_CONFIG_COUNT',
+                        'GIT_OBJECT_DIRECTORY', 'GIT_ALTERNATE_OBJECT_DIRECTORIES',
+                        'GIT_REPLACE_REF_BASE')
+_sha_regex = re.compile('^[0-9a-f]{40}$')
+
+
+def _is_sha(text):
+    return bool(text and _sha_regex.match(text))
+
+
+def _common_hex_prefix(sha1, sha2):
+    i = 0
+    for c1, c2 in zip(sha1, sha2):
+        if c1 != c2:
+            break
+        i += 1
+
+    return i
+
+
+def _parse_signature_date(line):
+    """
+    Parse the date-part of ``committer``/``tagger`` lines: ``... <email> 1525100000 +0300``
+
+    :return:
+        a 2-tuple (unix-timestamp, tz as signed int like ``+300``)
+    """
+    tstamp, tz = line.rsplit(None, 2)[-2:]
+    return int(tstamp), int(tz)
+
+
+def rfc2822_date(tstamp, tz):
+    """
+    Format a commit-date like git's ``--format=%cD`` (e.g. ``Thu, 1 Mar 2018 09:46:47 +0200``).
+
+    :param tz:
+        a signed int, like ``+200`` for `+0200`
+    """
+    import time
+
+    minutes = abs(tz) // 100 * 60 + abs(tz) % 100
+    if tz < 0:
+        minutes = -minutes
+    tm = time.gmtime(tstamp + minutes * 60)
+
+    return '%s, %d %s %d %02d:%02d:%02d %+05d' % (
+        _WEEKDAYS[tm.tm_wday], tm.tm_mday, _MONTHS[tm.tm_mon - 1], tm.tm_year,
+        tm.tm_hour, tm.tm_min, tm.tm_sec, tz)
+
+
+def _delta_varint(delta, i):
+    ":return: the 2-tuple ``(size, next_i)`` of the size-varint at `delta[i]`"
+    n = shift = 0
+    while True:
+        c = delta[i]
+        i += 1
+        n |= (c & 0x7f) << shift
+        shift += 7
+        if not c & 0x80:
+            return n, i
+
+
+def _delta_copy_args(delta, c, i):
+    ":return: the 3-tuple ``(offset, size, next_i)`` of the copy-opcode `c`"
+    cp_off = cp_size = 0
+    for bit in range(4):
+        if c & (1 << bit):
+            cp_off |= delta[i] << (8 * bit)
+            i += 1
+    for bit in range(3):
+        if c & (0x10 << bit):
+            cp_size |= delta[i] << (8 * bit)
+            i += 1
+
+    return cp_off, cp_size or 0x10000, i
+
+
+def _apply_delta(base, delta):
+    "Patch `base` bytes with a git *delta* (copy/insert opcodes)."
+    delta = bytearray(delta)
+
+    src_size, i = _delta_varint(delta, 0)
+    dst_size, i = _delta_varint(delta, i)
+    if src_size != len(base):
+        raise PyGitError("Delta expected %i-bytes base, got %i!" % (src_size, len(base)))
+
+    chunks = []
+    nbytes = len(delta)
+    while i < nbytes:
+        c = delta[i]
+        i += 1
+        if c & 0x80:
+            cp_off, cp_size, i = _delta_copy_args(delta, c, i)
+            chunks.append(base[cp_off:cp_off + cp_size])
+        elif c:
+            chunks.append(bytes(delta[i:i + c]))
+            i += c
+        else:
+            raise PyGitError("Invalid delta opcode 0!")
+
+    result = b''.join(chunks)
+    if len(result) != dst_size:
+        raise PyGitError("Delta produced %i-bytes, expected %i!" %
+                         (len(result), dst_size))
+
+    return result
+
+
+class _Pack(object):
+    """A packfile with its *v2* index, read lazily."""
+
+    def __init__(self, idx_fpath):
+        with open(idx_fpath, 'rb') as fp:
+            idx = fp.read()
+        if idx[:4] != b'\377tOc' or struct.unpack('>I', idx[4:8])[0] != 2:
+            raise PyGitError("Unsupported pack-index '%s'!" % idx_fpath)
+
+        self._idx = idx
+        self.fanout = struct.unpack('>256I', idx[8:8 + 1024])
+        self.nobjects = n = self.fanout[255]
+        self._shas_start = 8 + 1024
+        self._offsets_start = self._shas_start + 24 * n  # skip also CRCs
+        self._large_offsets_start = self._offsets_start + 4 * n
+        self.pack_fpath = idx_fpath[:-len('.idx')] + '.pack'
+        self._fp = None
+
+    def close(self):
+        if self._fp:
+            self._fp.close()
+            self._fp = None
+
+    def _sha_at(self, i):
+        start = self._shas_start + 20 * i
+        return self._idx[start:start + 20]
+
+    def _bisect(self, bsha):
+        "The insertion-index of the binary `bsha` in the sorted index."
+        first = bytearray(bsha)[0]
+        lo = self.fanout[first - 1] if first else 0
+        hi = self.fanout[first]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._sha_at(mid) < bsha:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def find_offset(self, bsha):
+        i = self._bisect(bsha)
+        if i < self.nobjects and self._sha_at(i) == bsha:
+            start = self._offsets_start + 4 * i
+            offset = struct.unpack('>I', self._idx[start:start + 4])[0]
+            if offset & 0x80000000:
+                start = self._large_offsets_start + 8 * (offset & 0x7fffffff)
+                offset = struct.unpack('>Q', self._idx[start:start + 8])[0]
+
+            return offset
+
+    def min_unique_len(self, bsha):
+        "The hex-length needed to disambiguate `bsha` from its neighbors in this pack."
+        i = self._bisect(bsha)
+        hexsha = binascii.hexlify(bsha)
+        neighbors = [i - 1, i + 1 if self._sha_at(i) == bsha else i]
+        length = 0
+        for j in neighbors:
+            if 0 <= j < self.nobjects:
+                other = binascii.hexlify(self._sha_at(j))
+                length = max(length, _common_hex_prefix(hexsha, other) + 1)
+
+        return length
+
+    def _read_entry(self, offset):
+        """
+        :return:
+            a 3-tuple ``(type-num, inflated-bytes, delta-base)`` where
+            base is a pack-offset (ofs-delta) or a hex-sha (ref-delta) or `None`
+        """
+        if not self._fp:
+            self._fp = open(self.pack_fpath, 'rb')
+        fp = self._fp
+        fp.seek(offset)
+        hdr = bytearray(fp.read(48))
+
+        c = hdr[0]
+        otype = (c >> 4) & 7
+        size = c & 0x0f
+        shift = 4
+        i = 1
+        while c & 0x80:
+            c = hdr[i]
+            i += 1
+            size |= (c & 0x7f) << shift
+            shift += 7
+
+        base = None
+        if otype == _OFS_DELTA:
+            c = hdr[i]
+            i += 1
+            rel = c & 0x7f
+            while c & 0x80:
+                c = hdr[i]
+                i += 1
+                rel = ((rel + 1) << 7) | (c & 0x7f)
+            base = offset - rel
+        elif otype == _REF_DELTA:
+            base = binascii.hexlify(bytes(hdr[i:i + 20])).decode('ascii')
+            i += 20
+
+        fp.seek(offset + i)
+        inflater = zlib.decompressobj()
+        chunks = []
+        nbytes = 0
+        while nbytes < size or not chunks:
+            buf = fp.read(max(4096, size - nbytes))
+            if not buf:
+                break
+            chunk = inflater.decompress(buf)
+            chunks.append(chunk)
+            nbytes += len(chunk)
+            if inflater.unused_data:
+                break
+        data = b''.join(chunks)
+        if len(data) != size:
+            raise PyGitError("Pack entry @%i in '%s' inflated to %i-bytes, expected %i!" %
+                             (offset, self.pack_fpath, len(data), size))
+
+        return otype, data, base
+
+    def read_object(self, offset, repo):
+        "Resolve any delta-chain iteratively; ref-deltas delegate their base to `repo`."
+        deltas = []
+        while True:
+            otype, data, base = self._read_entry(offset)
+            if otype == _OFS_DELTA:
+                deltas.append(data)
+                offset = base
+            elif otype == _REF_DELTA:
+                deltas.append(data)
+                otype, data = repo.read_object(base)
+                break
+            elif otype in _OBJ_TYPES:
+                otype = _OBJ_TYPES[otype]
+                break
+            else:
+                raise PyGitError("Unknown pack-entry type %i @%i in '%s'!" %
+                                 (otype, offset, self.pack_fpath))
+
+        for delta in reversed(deltas):
+            data = _apply_delta(data, delta)
+
+        return otype, data
+
+
+def best_names(tag_infos, patterns=()):
+    """
+    Map commits to the "best" tag-name, like `git describe` does.
+
+    :param tag_infos:
+        4-tuples ``(tagname, commit-sha, is_annotated, tag-tstamp)``
+        sorted by tagname, like :meth:`PyGit.tag_infos()` returns
+    :param patterns:
+        glob-patterns to filter tag-names; all tags if empty
+    :return:
+        ``{commit-sha: (prio, tag-tstamp, tagname)}`` where `prio` is
+        2 for annotated tags, 1 for lightweight ones
+    """
+    names = {}
+    for tagname, commit, is_annotated, tag_tstamp in tag_infos:
+        if patterns and not any(fnmatch.fnmatchcase(tagname, p)
+                                for p in patterns):
+            continue
+
+        prio = 2 if is_annotated else 1
+        old = names.get(commit)
+        ## Prefer annotated, and newer among annotated.
+        if (old is None or old[0] < prio or
+                (old[0] == prio == 2 and old[1] < tag_tstamp)):
+            names[commit] = (prio, tag_tstamp, tagname)
+
+    return names
+
+
+class _DescribeWalk(object):
+    """The commits queued by commit-date, and their flags, while walking history."""
+
+    SEEN = 1
+
+    def __init__(self, head, commit):
+        self.commit = commit
+        self.flags = {head: self.SEEN}
+        self.queue = []
+        self._seq = itt.count()
+        self.push(head)
+
+    def push(self, sha):
+        heapq.heappush(self.queue, (-self.commit(sha)[1], next(self._seq), sha))
+
+    def pop(self):
+        return heapq.heappop(self.queue)[2]
+
+    def push_parents(self, sha, cflags):
+        flags = self.flags
+        for parent in self.commit(sha)[0]:
+            pflags = flags.get(parent, 0)
+            if not pflags & self.SEEN:
+                self.push(parent)
+            flags[parent] = pflags | cflags
+
+    def covered_by_best(self, matches, cflags):
+        "Whether the last remaining path is already covered by the best candidate(s)."
+        best_depth = min(m[0] for m in matches)
+        best_within = 0
+        for m in matches:
+            if m[0] == best_depth:
+                best_within |= m[2]
+
+        return (cflags & best_within) == best_within
+
+    def finish_depth(self, best):
+        "Finish depth computation of `best` candidate."
+        flags, queue = self.flags, self.queue
+        best_flag = best[2]
+        while queue:
+            sha = self.pop()
+            cflags = flags[sha]
+            if cflags & best_flag:
+                if all(flags[q[2]] & best_flag for q in queue):
+                    break
+            else:
+                best[0] += 1
+            self.push_parents(sha, cflags)
+
+
+def walk_describe(head, names, commit, abbrev, tags=False, max_candidates=10):
+    """
+    A port of the candidates-walk in git's ``builtin/describe.c``.
+
+    It walks history by commit-date, to produce results identical to `git`,
+    and reads commits only through the `commit` callable, so the same
+    (cached) history may be walked for many `names` maps.
+
+    :param head:
+        the commit-sha to describe
+    :param names:
+        as returned by :func:`best_names()`
+    :param commit:
+        a callable ``(sha) -> (parent-shas, committer-tstamp, ...)``
+    :param abbrev:
+        a callable ``(sha) -> short-sha``, invoked only when not an exact match
+    :param tags:
+        when true, consider also lightweight tags (like ``--tags``)
+    :raise PyGitError:
+        when no tag can describe `head`
+    """
+    name = names.get(head)
+    if name and (tags or name[0] == 2):
+        return name[2]
+
+    walk = _DescribeWalk(head, commit)
+    flags = walk.flags
+
+    ## Candidates as ``[depth, found_order, flag_within, tagname]``.
+    matches = []
+    annotated_cnt = 0
+    seen_commits = 0
+    gave_up_on = None
+    while walk.queue:
+        sha = walk.pop()
+        seen_commits += 1
+        name = names.get(sha)
+        ## Skip unannotated tags, unless `tags` (git would hint about them).
+        if name and (tags or name[0] == 2):
+            if len(matches) >= max_candidates:
+                gave_up_on = sha
+                break
+            flag = 1 << (len(matches) + 1)
+            matches.append([seen_commits - 1, len(matches) + 1, flag, name[2]])
+            flags[sha] |= flag
+            if name[0] == 2:
+                annotated_cnt += 1
+
+        cflags = flags[sha]
+        for m in matches:
+            if not cflags & m[2]:
+                m[0] += 1
+
+        if annotated_cnt and not walk.queue and walk.covered_by_best(matches, cflags):
+            break
+        walk.push_parents(sha, cflags)
+
+    if not matches:
+        raise PyGitError("No %stags can describe '%s'." %
+                         ('' if tags else 'annotated ', head))
+
+    matches.sort(key=lambda m: m[:2])
+    best = matches[0]
+    if gave_up_on:
+        walk.push(gave_up_on)
+    walk.finish_depth(best)
+
+    return '%s-%i-g%s' % (best[3], best[0], abbrev(head))
+
+
+class PyGit(object):
+    """
+    Read-only access to a git repo, enough to emulate ``git describe`` & ``git log -1``.
+
+    Use it as a context-manager, to close any open pack-files::
+
+        with PyGit('.') as repo:
+            repo.describe(['proj-v*'])
+    """
+
+    def __init__(self, basepath='.'):
+        git_dirs = find_git_dirs(basepath)
+        if not git_dirs:
+            raise PyGitError("No git-repo found above '%s' (or GIT_DIR set)!" % basepath)
+        self.gitdir, self.commondir = git_dirs
+        self.objdir = osp.join(self.commondir, 'objects')
+        self._check_supported()
+
+        self._packs = None
+        #: {sha: (parents, tstamp, tz)}
+        self._commits = {}
+        shallow = _read_text(osp.join(self.commondir, 'shallow'))
+        self._shallow = set(shallow.split()) if shallow else set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+    def close(self):
+        for pack in self._packs or ():
+            pack.close()
+
+    def _check_supported(self):
+        for var in _unsupported_envvars:
+            if os.environ.get(var):
+                raise PyGitError("Env-var %s not supported!" % var)
+
+        for fpath in (osp.join(self.commondir, 'objects', 'info', 'alternates'),
+                      osp.join(self.commondir, 'info', 'grafts')):
+            if osp.exists(fpath):
+                raise PyGitError("Unsupported '%s' exists!" % fpath)
+
+        replace_dir = osp.join(self.commondir, 'refs', 'replace')
+        if osp.isdir(replace_dir) and os.listdir(replace_dir):
+            raise PyGitError("Replace-refs not supported!")
+
+        home = osp.expanduser('~')
+        xdg_home = os.environ.get('XDG_CONFIG_HOME') or osp.join(home, '.config')
+        for fpath in (osp.join(self.commondir, 'config'),
+                      osp.join(self.gitdir, 'config.worktree'),
+                      osp.join(home, '.gitconfig'),
+                      osp.join(xdg_home, 'git', 'config'),
+                      '/etc/gitconfig'):
+            config = _read_text(fpath)
+            if config and _unsupported_config_regex.search(config):
+                raise PyGitError("Unsupported settings in config '%s'!" % fpath)
+
+    def _get_packs(self):
+        if self._packs is None:
+            pack_dir = osp.join(self.objdir, 'pack')
+            fnames = os.listdir(pack_dir) if osp.isdir(pack_dir) else ()
+            self._packs = [_Pack(osp.join(pack_dir, f))
+                           for f in sorted(fnames)
+                           if f.endswith('.idx')]
+
+        return self._packs
+
+    ##########
+    ## REFS ##
+    ##########
+
+    def _packed_refs(self):
+        ":return: a ``{refname: sha}`` dict, ignoring *peeled* lines"
+        refs = {}
+        content = _read_text(osp.join(self.commondir, 'packed-refs'))
+        for line in (content or '').splitlines():
+            if line and line[0] not in '#^':
+                sha, refname = line.split(None, 1)
+                refs[refname.strip()] = sha
+
+        if any(r.startswith('refs/replace/') for r in refs):
+            raise PyGitError("Replace-refs not supported!")
+
+        return refs
+
+    def tag_refs(self):
+        ":return: a ``{refname: sha}`` dict of packed & loose ``refs/tags/*``"
+        refs = dict((refname, sha)
+                    for refname, sha in self._packed_refs().items()
+                    if refname.startswith('refs/tags/'))
+
+        tags_dir = osp.join(self.commondir, 'refs', 'tags')
+        for dirpath, _dirnames, fnames in os.walk(tags_dir):
+            for fname in fnames:
+                if fname.endswith('.lock'):
+                    continue
+                fpath = osp.join(dirpath, fname)
+                sha = _read_text(fpath)
+                if not _is_sha(sha):
+                    raise PyGitError("Unexpected loose tag-ref '%s': %s" % (fpath, sha))
+                refname = osp.relpath(fpath, tags_dir).replace(os.sep, '/')
+                refs['refs/tags/' + refname] = sha
+
+        return refs
+
+    def head_sha(self):
+        "Resolve (possibly symbolic) HEAD into a commit-sha."
+        ref = _read_text(osp.join(self.gitdir, 'HEAD'))
+        for _ in range(5):  # Symbolic-ref chains are rare.
+            if _is_sha(ref):
+                return ref
+            if not ref or not ref.startswith('ref:'):
+                break
+
+            refname = ref[4:].strip()
+            ref = (_read_text(osp.join(self.commondir, refname)) or
+                   self._packed_refs().get(refname))
+
+        raise PyGitError("Cannot resolve HEAD (unborn branch?), got: %s" % ref)
+
+    #############
+    ## OBJECTS ##
+    #############
+
+    def read_object(self, sha):
+        ":return: a 2-tuple ``(type-name, content-bytes)``"
+        fpath = osp.join(self.objdir, sha[:2], sha[2:])
+        if osp.isfile(fpath):
+            with open(fpath, 'rb') as fp:
+                raw = zlib.decompress(fp.read())
+            header, _, content = raw.partition(b'\0')
+            return header.split(b' ')[0].decode('ascii'), content
+
+        bsha = binascii.unhexlify(sha)
+        for pack in self._get_packs():
+            offset = pack.find_offset(bsha)
+            if offset is not None:
+                return pack.read_object(offset, self)
+
+        raise PyGitError("Object %s not found!" % sha)
+
+    def _parse_commit(self, sha, content):
+        parents = []
+        tstamp = tz = None
+        for line in content.split(b'\n'):
+            if not line:  # headers end
+                break
+            if line.startswith(b'parent '):
+                parents.append(line[7:].decode('ascii'))
+            elif line.startswith(b'committer '):
+                tstamp, tz = _parse_signature_date(line)
+        if sha in self._shallow:
+            parents = []
+
+        info = self._commits[sha] = (parents, tstamp or 0, tz or 0)
+
+        return info
+
+    def commit(self, sha):
+        ":return: a 3-tuple ``(parent-shas, committer-tstamp, tz)``"
+        info = self._commits.get(sha)
+        if info is None:
+            otype, content = self.read_object(sha)
+            if otype != 'commit':
+                raise PyGitError("Object %s is a %s, not a commit!" % (sha, otype))
+            info = self._parse_commit(sha, content)
+
+        return info
+
+    def peel(self, sha):
+        """
+        Follow (nested) tag-objects until a non-tag object.
+
+        :return:
+            a 3-tuple ``(commit-sha or None, is_annotated, tagger-tstamp)``,
+            where the tstamp is that of the outermost tag (0 if lightweight)
+        """
+        is_annotated = False
+        tag_tstamp = 0
+        for _ in range(16):
+            if sha in self._commits:
+                return sha, is_annotated, tag_tstamp
+
+            otype, content = self.read_object(sha)
+            if otype == 'commit':
+                self._parse_commit(sha, content)
+                return sha, is_annotated, tag_tstamp
+            if otype != 'tag':
+                return None, is_annotated, tag_tstamp
+
+            target = None
+            for line in content.split(b'\n'):
+                if not line:
+                    break
+                if line.startswith(b'object '):
+                    target = line[7:].decode('ascii')
+                elif line.startswith(b'tagger ') and not is_annotated:
+                    tag_tstamp = _parse_signature_date(line)[0]
+            is_annotated = True
+            sha = target
+
+        raise PyGitError("Too deeply nested tags: %s" % sha)
+
+    def abbrev(self, sha):
+        """
+        Shorten `sha` like git's auto ``core.abbrev`` does.
+
+        Length scales with the number of packed objects (min 7),
+        extended until unique among all loose & packed objects.
+        """
+        packs = self._get_packs()
+        count = sum(p.nobjects for p in packs)
+        nbits = 0
+        while count:
+            nbits += 1
+            count >>= 1
+        length = max(7, (nbits + 1) // 2)
+
+        bsha = binascii.unhexlify(sha)
+        for pack in packs:
+            length = max(length, pack.min_unique_len(bsha))
+
+        loose_dir = osp.join(self.objdir, sha[:2])
+        if osp.isdir(loose_dir):
+            tail = sha[2:]
+            for fname in os.listdir(loose_dir):
+                if len(fname) == 38 and fname != tail:
+                    length = max(length, 2 + _common_hex_prefix(tail, fname) + 1)
+
+        return sha[:length]
+
+    ##############
+    ## COMMANDS ##
+    ##############
+
+    def tag_infos(self):
+        """
+        List all tags peeled to their commits, sorted by name, for :func:`best_names()`.
+
+        :return:
+            a list of 4-tuples ``(tagname, commit-sha, is_annotated, tag-tstamp)``
+        """
+        infos = []
+        for refname, sha in sorted(self.tag_refs().items()):
+            commit, is_annotated, tag_tstamp = self.peel(sha)
+            if commit is not None:
+                infos.append((refname[len('refs/tags/'):], commit,
+                              is_annotated, tag_tstamp))
+
+        return infos
+
+    def describe(self, patterns=(), tags=False, max_candidates=10):
+        """
+        Emulate ``git describe [--tags] [--match=<pattern>...]`` for HEAD.
+
+        :param patterns:
+            glob-patterns to match tag-names (without ``refs/tags/``)
+        :param tags:
+            when true, consider also lightweight tags (like ``--tags``)
+        :raise PyGitError:
+            when no tag can describe HEAD, or for unsupported repo-features
+        """
+        names = best_names(self.tag_infos(), patterns)
+        return walk_describe(self.head_sha(), names, self.commit, self.abbrev,
+                             tags, max_candidates)
+
+    def describe_dated(self, patterns=(), tags=False):
+        ":return: a 2-tuple of :meth:`describe()` & :meth:`head_commit_date()` results"
+        return self.describe(patterns, tags=tags), self.head_commit_date()
+
+    def head_commit_date(self):
+        "Emulate ``git log -n1 --format=format:%cD``."
+        _parents, tstamp, tz = self.commit(self.head_sha())
+        return rfc2822_date(tstamp, tz)
@@ -8,7 +8,9 @@ A *setuptools* plugin with x2 ``setup()`` kwds and monkeypatch all ``bdist...``
   Set `envvar[DISTUTILS_DEBUG]` to debug it.
   From https://docs.python.org/3.7/distutils/setupscript.html#debugging-the-setup-script
 """
-from polyversion import polyversion, pkg_metadata_version
+from polyversion import (PolyInfo, polyversion, polyinfo, pkg_metadata_version,
+                         rfc2822_tstamp, version_module_fname)
+from polyversion.buildall import prebuilt_results
 
 
 __all__ = 'init_plugin_kw check_bdist_kw'.split()
@@ -17,7 +19,8 @@ __all__ = 'init_plugin_kw check_bdist_kw'.split()
 def _parse_kw_content(attr, kw_value):
     good_keys = set('mono_project tag_format tag_regex '
                     'vprefixes basepath git_options '
-                    'default_version_env_var'.split())
+                    'default_version_env_var git_cache git_engine '
+                    'version_module'.split())
 
     try:
         pvargs = dict(kw_value)
@@ -37,7 +40,117 @@ def _parse_kw_content(attr, kw_value):
     return pvargs
 
 
-def _establish_setup_py_version(dist, basepath=None, **pvargs):
+def _version_module_text(info):
+    lines = ['# -*- coding: utf-8 -*-',
+             '## Generated by `polyversion` setuptools-plugin while building; DO NOT EDIT!',
+             '']
+    lines.extend('%s = %r' % (field, value)
+                 for field, value in zip(info._fields, info))
+
+    return '\n'.join(lines) + '\n'
+
+
+def _install_version_module_cmds(dist, info):
+    """
+    Subclass `build_py` & `sdist` cmds to write a `version_module_fname` in all top-packages.
+
+    Written only in build-dirs & sdist release-trees, never in the sources.
+    """
+    import io
+    import os
+    import os.path as osp
+
+    top_packages = [p for p in (dist.packages or ()) if '.' not in p]
+    if not top_packages:
+        return
+
+    text = _version_module_text(info)
+
+    def write_version_modules(cmd, pkg_dirs):
+        for pkg_dir in pkg_dirs:
+            fpath = osp.join(pkg_dir, version_module_fname)
+            cmd.announce('writing version-module %s' % fpath, level=2)
+            if cmd.dry_run:
+                continue
+            ## Release-trees may hard-link files from sources.
+            if osp.lexists(fpath):
+                os.remove(fpath)
+            with io.open(fpath, 'wt', encoding='utf-8') as fp:
+                fp.write(text)
+
+    build_py = dist.get_command_class('build_py')
+    sdist = dist.get_command_class('sdist')
+
+    class build_py_polyversion(build_py):
+        def run(self):
+            build_py.run(self)
+            write_version_modules(self, [osp.join(self.build_lib, *p.split('.'))
+                                         for p in top_packages])
+
+    class sdist_polyversion(sdist):
+        def make_release_tree(self, base_dir, files):
+            sdist.make_release_tree(self, base_dir, files)
+            build_py_cmd = self.get_finalized_command('build_py')
+            write_version_modules(self, [osp.join(base_dir,
+                                                  build_py_cmd.get_package_dir(p))
+                                         for p in top_packages])
+
+    dist.cmdclass['build_py'] = build_py_polyversion
+    dist.cmdclass['sdist'] = sdist_polyversion
+
+
+def _derive_version(dist, env_ver, version_module, pvargs):
+    """
+    Derive the version from any `polyversion build-all` results, or from git.
+
+    :param env_ver:
+        the version env-var, trusted if precomputed by `polyversion build-all`
+    :param version_module:
+        if true, generate also the :data:`polyversion.version_module_fname`
+    """
+    pname = pvargs['pname']
+    prebuilt = env_ver and prebuilt_results().get(pname)
+    if prebuilt:
+        pvtag, descid, cdate, dist.polyversion_rtag_err = prebuilt
+        version = env_ver
+        if version_module:
+            _install_version_module_cmds(dist, PolyInfo(
+                pname, version, pvtag, descid, cdate or rfc2822_tstamp()))
+    elif version_module:
+        info = polyinfo(no_raise=True, **pvargs)
+        version = info.version
+        if version:
+            _install_version_module_cmds(dist, info)
+    else:
+        version = polyversion(**pvargs)
+
+    return version
+
+
+def _patch_run_command(dist, defver_envvar):
+    ## NOTE: PY2 `type(dist)` is `<type 'instance'>` on PY2,
+    #  which does not have the method to patch.
+    DistClass = dist.__class__
+    if not hasattr(DistClass, '_polyversion_orig_run_cmd'):
+        try:
+            from functools import partialmethod
+        except ImportError:
+            ## From https://gist.github.com/carymrobbins/8940382
+            from functools import partial
+
+            class partialmethod(partial):
+                def __get__(self, instance, owner):
+                    if instance is None:
+                        return self
+                    return partial(self.func, instance,
+                                   *(self.args or ()), **(self.keywords or {}))
+
+        DistClass._polyversion_orig_run_cmd = DistClass.run_command
+        DistClass.run_command = partialmethod(_monkeypathed_run_command,
+                                              defver_envvar=defver_envvar)
+
+
+def _establish_setup_py_version(dist, basepath=None, version_module=None, **pvargs):
     "Derive version from PKG-INFO or Git rtags, and trigger bdist-check in later case."
     pname = dist.metadata.name
 
@@ -60,23 +173,22 @@ def _establish_setup_py_version(dist, basepath=None, **pvargs):
 
         ## Respect version env-var both if default-version empty/none.
         #
-        defver_envvar = pvargs.get('default_version_env_var', '%s_VERSION' % pname)
-        if not default_version:
-            import os
+        import os
 
-            ## Ignore empty/none envvars
-            #  to preserve empty (but not none) `default-version` kwd.
-            #
-            env_ver = os.environ.get(defver_envvar)
-            if env_ver:
-                default_version = env_ver
+        defver_envvar = pvargs.get('default_version_env_var', '%s_VERSION' % pname)
+        ## Ignore empty/none envvars
+        #  to preserve empty (but not none) `default-version` kwd.
+        #
+        env_ver = os.environ.get(defver_envvar)
+        if not default_version and env_ver:
+            default_version = env_ver
 
         pvargs['default_version'] = default_version
 
         ## Store `pvargs` so bdist-check can rerun `polyversion()` for r-tags.
         dist.polyversion_args = pvargs
 
-        version = polyversion(**pvargs)
+        version = _derive_version(dist, env_ver, version_module, pvargs)
 
         ## Monkeypatch `Distribution.run_cmd()` only if not inside a package,
         #  and only once per dist-instance
@@ -85,26 +197,7 @@ def _establish_setup_py_version(dist, basepath=None, **pvargs):
         #  NOTE: We monekypatch even if user has disabled check,
         #  bc we can't now the kw order.
         #
-        ## NOTE: PY2 `type(dist)` is `<type 'instance'>` on PY2,
-        #  which does not have the method to patch.
-        DistClass = dist.__class__
-        if not hasattr(DistClass, '_polyversion_orig_run_cmd'):
-            try:
-                from functools import partialmethod
-            except ImportError:
-                ## From https://gist.github.com/carymrobbins/8940382
-                from functools import partial
-
-                class partialmethod(partial):
-                    def __get__(self, instance, owner):
-                        if instance is None:
-                            return self
-                        return partial(self.func, instance,
-                                       *(self.args or ()), **(self.keywords or {}))
-
-            DistClass._polyversion_orig_run_cmd = DistClass.run_command
-            DistClass.run_command = partialmethod(_monkeypathed_run_command,
-                                                  defver_envvar=defver_envvar)
+        _patch_run_command(dist, defver_envvar)
 
     if version:
         dist.metadata.version = version
@@ -142,6 +235,12 @@ def init_plugin_kw(dist, attr, kw_value):
         :param basepath:
             if not given, derived from ``setup(package_dirs={...})`` keyword
             or '.' (and never from caller-stack).
+        :param version_module:
+            (extra key) when true, write a :data:`polyversion.version_module_fname`
+            with the version, *pvtag*, descid & commit-date derived from git,
+            into all top-packages of built & sdist archives, to be read first by
+            :func:`polyversion()` & :func:`polytime()` when running
+            from installed packages, without probing metadata nor launching git.
 
         See :func:`polyversion()` for keyword-dict's content.
 
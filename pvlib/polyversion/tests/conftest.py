@@ -15,6 +15,15 @@ def _exec_cmds(cmds):
             sbp.check_call(c.split())
 
 
+@pytest.fixture()
+def no_git():
+    """A stub for :func:`polyversion._my_run()`, failing if git gets forked."""
+    def no_git(*args, **kw):
+        raise AssertionError("Forked git: %s, %s" % (args, kw))
+
+    return no_git
+
+
 @pytest.fixture()
 def today():
     """A :rfc:`2822` formated timestamp: ``Thu, 01 Mar 2018 09:46:47 +0000`` """
@@ -123,3 +132,23 @@ def empty_repo(tmpdir_factory):
 @pytest.fixture(scope='session')
 def no_repo(tmpdir_factory):
     return tmpdir_factory.mktemp('norepo')
+
+
+####################
+## MUTABLE REPOS  ##
+####################
+
+@pytest.fixture()
+def mutable_repo(tmpdir_factory):
+    repo_dir = tmpdir_factory.mktemp('mutable')
+    repo_dir.chdir()
+    _exec_cmds("""
+    git init
+    git config user.email "test@example.com"
+    git config user.name "Testing Bot"
+    git commit --allow-empty  --no-edit -m some_msg
+    git tag proj1-v0.0.0 -m annotated
+    git commit --allow-empty  --no-edit -m some_msg
+    """)
+
+    return repo_dir
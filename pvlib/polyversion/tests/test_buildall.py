@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+import json
+import logging
+import sys
+
+import pytest
+import setuptools
+
+import polyversion as pvlib
+
+from polyversion import buildall
+
+from .conftest import _exec_cmds
+
+
+## A `setup()` printing what the driver passes to the build.
+_fake_setup_py = """
+import os
+
+def setup(**kw):
+    envvar = 'POLYVERSION_BUILD_ALL'
+    print('%%s: %%s, %%s' %% (kw['name'], os.environ.get('%(envvar)s'),
+                            os.environ.get(envvar)))
+
+setup(name=%(pname)r, polyversion=%(pvargs)r)
+"""
+
+
+@pytest.fixture()
+def monorepo(tmpdir):
+    repo = tmpdir / 'monorepo'
+    repo.ensure_dir().chdir()
+    _exec_cmds("""
+    git init -q
+    git config user.email "test@example.com"
+    git config user.name "Testing Bot"
+    git commit -q --allow-empty  --no-edit -m c1
+    git tag proj1-v0.0.1 -m annotated
+    git tag proj1-r0.0.1 -m annotated
+    git tag proj2-v0.2.0 -m annotated
+    git commit -q --allow-empty  --no-edit -m c2
+    """)
+    for pname, pvargs, envvar in [('proj1', True, 'proj1_VERSION'),
+                                  ('proj2', {'default_version_env_var': 'P2_VER'},
+                                   'P2_VER'),
+                                  ('proj3', True, 'proj3_VERSION')]:
+        (repo / pname / 'setup.py').write(_fake_setup_py % locals(), ensure=True)
+
+    ## Not literal `setup()` kwds.
+    (repo / 'proj4' / 'setup.py').write(
+        "def setup(**kw):\n    print(kw['name'] + ': built')\n\n"
+        "setup(name='proj' + str(4), polyversion=True)\n",
+        ensure=True)
+    (repo / 'build' / 'setup.py').write("raise SystemExit(1)", ensure=True)
+
+    return repo
+
+
+def test_precompute_versions(monorepo, monkeypatch):
+    monkeypatch.delenv('proj3_VERSION', raising=False)
+    setup_dirs = buildall.find_setup_dirs('.')
+    assert [d.replace('\\', '/') for d in setup_dirs] == [
+        './proj1', './proj2', './proj3', './proj4']
+
+    projects = [p for p in (buildall._read_project(d) for d in setup_dirs) if p]
+    assert [p.pname for p in projects] == ['proj1', 'proj2', 'proj3']
+
+    res = buildall.precompute_versions(projects)
+    assert sorted(res) == ['proj1', 'proj2']
+    version, (pvtag, descid, cdate, rtag_err) = res['proj1']
+    assert version.startswith('0.0.1+1.g')
+    assert pvtag.startswith('proj1-') and descid
+    assert rtag_err is False
+
+    version, (pvtag, descid, cdate, rtag_err) = res['proj2']
+    assert version.startswith('0.2.0+1.g')
+    assert 'proj2-r*' in rtag_err
+
+    ## User-set version env-var bypasses r-tag check, like `setup.py`.
+    monkeypatch.setenv('P2_VER', '1.2.3')
+    monkeypatch.setenv('proj3_VERSION', '3.3.3')
+    res = buildall.precompute_versions(projects)
+    assert res['proj2'][1][3] is False
+    assert res['proj3'] == ('3.3.3', [None, None, None, False])
+
+
+def test_build_all(monorepo, monkeypatch, caplog):
+    monkeypatch.delenv('proj3_VERSION', raising=False)
+    caplog.set_level(logging.DEBUG)
+
+    assert pvlib.run('build-all', '-j', '2', '--', 'bdist_wheel') == 0
+
+    outs = {r.args[0]: r.args[1] for r in caplog.records
+            if r.msg.startswith('Build output')}
+    assert sorted(outs) == ['./proj1', './proj2', './proj3', './proj4']
+    assert 'proj1: 0.0.1+1.g' in outs['./proj1']
+    assert 'proj2: 0.2.0+1.g' in outs['./proj2']
+    assert 'proj3: None' in outs['./proj3']
+    prebuilt = json.loads(outs['./proj3'].split(', ', 1)[1])
+    assert sorted(prebuilt) == ['proj1', 'proj2']
+
+    assert 'proj4: built' in outs['./proj4']
+
+    assert pvlib.run('build-all', 'build') == 1
+
+
+def test_plugin_trusts_prebuilt(vtags_repo, monkeypatch, no_git):
+    vtags_repo.chdir()
+
+    monkeypatch.setattr(pvlib, '_my_run', no_git)
+    monkeypatch.setattr(sys, 'argv', ('setup.py', 'bdist_dumb'))
+    monkeypatch.setenv('pname_VERSION', '1.2.3')
+    monkeypatch.setenv(buildall.build_all_envvar,
+                       json.dumps({'pname': ['v1.2.3', None, None, 'No rtag!']}))
+
+    with pytest.raises(SystemExit, match="No rtag!"):
+        setuptools.setup(
+            name='pname',
+            version='0.0.0',
+            polyversion={'mono_project': True},
+            polyversion_check_bdist_enabled=True,
+            setup_requires=['polyversion'],
+            py_modules=['pypak'],
+        )
@@ -71,11 +71,72 @@ def test_caller_fpath():
     assert os.stat(caller_dir) == os.stat(exp)
 
 
+def test_caller_fpath_fast(monkeypatch):
+    import inspect
+
+    def scream(*args):
+        raise AssertionError("Slow: %s" % args)
+
+    monkeypatch.setattr(inspect, 'getmodule', scream)
+    exp = pvlib._caller_basepath(1)
+    monkeypatch.setattr(pvlib, '_package_basepath', scream)
+    assert pvlib._caller_basepath(1) == exp  # memoized
+    assert pvlib._caller_basepaths[__name__.split('.')[0]][1] == exp
+
+
 def test_caller_module():
     caller_mod = pvlib._caller_module_name(1)
     assert caller_mod == __name__.split('.')[-1]
 
 
+def test_pkg_metadata_version(tmpdir, monkeypatch, caplog):
+    site = tmpdir.mkdir('site-packages')
+    pkgdir = site.mkdir('foo')
+    for i in range(20):
+        site.mkdir('other%i-1.0.dist-info' % i).join('METADATA').write(
+            'Name: other%i\nVersion: 1.0\n' % i)
+
+    assert pvlib.pkg_metadata_version('foo', pkgdir) is None
+
+    metadata = site.mkdir('foo-0.1.0.dist-info').join('METADATA')
+    metadata.write('Name: foo\nVersion: 0.1.0\n')
+    assert pvlib.pkg_metadata_version('foo', pkgdir) == '0.1.0'
+    assert pvlib.pkg_metadata_version('foo-bar', pkgdir) is None
+
+    ## Memoized: no dir-scans nor re-parsing.
+    #
+    def no_scan(*args):
+        raise AssertionError("Rescanned: %s" % args)
+
+    monkeypatch.setattr(os, 'scandir', no_scan, raising=False)
+    monkeypatch.setattr(os, 'listdir', no_scan)
+    monkeypatch.setattr(pvlib, '_parse_metadata', no_scan)
+    assert pvlib.pkg_metadata_version('foo', pkgdir) == '0.1.0'
+    with pkgdir.as_cwd():
+        assert pvlib.pkg_metadata_version('foo') == '0.1.0'
+    monkeypatch.undo()
+
+    ## Invalidated when dir or files change.
+    #
+    st = metadata.stat()
+    metadata.write('Name: foo\nVersion: 0.2.0\n')
+    metadata.setmtime(st.mtime + 2)
+    assert pvlib.pkg_metadata_version('foo', pkgdir) == '0.2.0'
+
+    site.mkdir('foo-0.3.0.egg-info').join('PKG-INFO').write(
+        'Name: foo\nVersion: 0.3.0\n')
+    site.mkdir('foo-0.3.0.dist-info').join('METADATA').write(
+        'Name: foo\nVersion: 0.3.0\n')
+    site.setmtime(site.mtime() + 2)
+    assert pvlib.pkg_metadata_version('foo', pkgdir) == '0.3.0'  # from egg
+    assert 'Many matches' in caplog.text
+
+    pkgdir.join('PKG-INFO').write('Name: bar\nVersion: 1.2.3\n')
+    assert pvlib.pkg_metadata_version('bar', pkgdir) == '1.2.3'
+    assert pvlib.pkg_metadata_version('baz', pkgdir) is None
+    assert 'foreign project' in caplog.text
+
+
 ##############
 ## DESCRIBE ##
 ##############
@@ -201,6 +262,126 @@ def test_polyversion_BAD_no_git_cmd(ok_repo, monkeypatch):
     assert v == '0.1.1'
 
 
+def test_polyversion_git_cache(mutable_repo, monkeypatch, no_git):
+    v = pvlib.polyversion(pname=proj1, basepath=mutable_repo)
+    assert v.startswith('0.0.0+1.g')
+    assert mutable_repo.join('.git', 'polyversion').listdir()
+
+    with monkeypatch.context() as mp:
+        mp.setattr(pvlib, '_my_run', no_git)
+        assert pvlib.polyversion(pname=proj1, basepath=mutable_repo) == v
+        with pytest.raises(AssertionError, match='Forked git'):
+            pvlib.polyversion(pname=proj1, basepath=mutable_repo, git_cache=False)
+        with pytest.raises(AssertionError, match='Forked git'):
+            pvlib.polyversion(pname=proj1, basepath=mutable_repo,
+                              git_options='--tags')
+
+        mp.setenv(pvlib.git_cache_envvar, '0')
+        with pytest.raises(AssertionError, match='Forked git'):
+            pvlib.polyversion(pname=proj1, basepath=mutable_repo)
+
+    ## New tags & commits invalidate cache.
+    #
+    mutable_repo.chdir()
+    sbp.check_call('git tag proj1-v0.0.1 -m annotated'.split())
+    assert pvlib.polyversion(pname=proj1, basepath=mutable_repo) == '0.0.1'
+    sbp.check_call('git commit --allow-empty --no-edit -m msg'.split())
+    v = pvlib.polyversion(pname=proj1, basepath=mutable_repo)
+    assert v.startswith('0.0.1+1.g')
+
+
+@pytest.mark.parametrize('git_engine', ['git', 'python'])
+@pytest.mark.parametrize('kw', [
+    {},
+    {'is_release': True},
+    {'git_options': '--tags'},
+    {'git_options': '--tags --long'},
+    {'tag_format': '{pname}-V{version}', 'git_options': '--tags',
+     'tag_regex': r"^(?P<pname>{pname})-V(?P<version>\d[^-]*)"
+                  r"(?:-(?P<descid>\d+-g[a-f\d]+))?$"},
+])
+def test_polyversions_like_polyversion(ok_repo, rtagged_vtags_repo, git_engine, kw):
+    pnames = [proj1, proj2, 'foo']
+    kw = dict(kw, git_cache=False, git_engine=git_engine,
+              default_version='<unused>', return_all=True)
+    for repo in (ok_repo, rtagged_vtags_repo):
+        exp = [(p, pvlib.polyversion(pname=p, basepath=repo, **kw))
+               for p in pnames]
+        got = pvlib.polyversions(pnames=pnames, basepath=repo, **kw)
+        assert list(got.items()) == exp
+
+
+def test_polyversions_forks(ok_repo, untagged_repo, no_repo, monkeypatch):
+    pnames = [proj1, proj2, 'foo', 'bar']
+    forks = []
+    popen = sbp.Popen
+
+    def counting_popen(cmd, *args, **kw):
+        if cmd[1] != 'version':
+            forks.append(cmd[1])
+        return popen(cmd, *args, **kw)
+
+    monkeypatch.setattr(pvlib.sbp, 'Popen', counting_popen)
+
+    ## Just for-each-ref, rev-list & rev-parse,
+    #  and git-describe only for the failed `foo` & `bar`.
+    vers = pvlib.polyversions(pnames=[proj1, 'foo', 'bar'], basepath=ok_repo,
+                              default_version='', git_cache=False)
+    assert list(vers) == [proj1, 'foo', 'bar']
+    assert vers[proj1].startswith(proj1_ver)
+    assert sorted(forks) == ['describe', 'describe',
+                             'for-each-ref', 'rev-list', 'rev-parse']
+
+    with pytest.raises(sbp.CalledProcessError, match='No names found'):
+        pvlib.polyversions(pnames=pnames, basepath=untagged_repo,
+                           git_cache=False, default_version=None)
+    vers = pvlib.polyversions(pnames=pnames, basepath=no_repo, default_version='')
+    assert vers == dict.fromkeys(pnames, '')
+
+    with pytest.raises(ValueError, match='non-empty list-of-str'):
+        pvlib.polyversions(pnames=proj1)
+
+
+def test_polyinfo(mutable_repo, untagged_repo, monkeypatch, today):
+    forks = []
+    popen = sbp.Popen
+
+    def counting_popen(cmd, *args, **kw):
+        forks.append(cmd[1])
+        return popen(cmd, *args, **kw)
+
+    monkeypatch.setattr(pvlib.sbp, 'Popen', counting_popen)
+
+    info = pvlib.polyinfo(pname=proj1, basepath=mutable_repo, git_cache=False)
+    assert forks == ['log']
+    assert info.pname == proj1
+    assert info.version.startswith('0.0.0+1.g')
+    assert info.pvtag.startswith('proj1-v0.0.0-1-g')
+    assert info.descid.startswith('1-g')
+    assert info.cdate.startswith(today)
+    assert info.cdate == pvlib.polytime(pname=proj1, basepath=mutable_repo,
+                                        git_cache=False)
+
+    ## Memoized per process.
+    #
+    del forks[:]
+    assert pvlib.polyinfo(pname=proj1, basepath=mutable_repo) == info
+    assert forks == ['log']
+    assert pvlib.polyversion(pname=proj1, basepath=mutable_repo) == info.version
+    assert pvlib.polytime(pname=proj1, basepath=mutable_repo) == info.cdate
+    assert forks == ['log']
+
+    ## Failed describes still report commit-date.
+    #
+    info = pvlib.polyinfo(pname=proj1, basepath=untagged_repo,
+                          default_version='1.2.3', git_cache=False)
+    assert info.version == '1.2.3'
+    assert info.pvtag is None
+    assert info.cdate.startswith(today)
+    with pytest.raises(sbp.CalledProcessError):
+        pvlib.polyinfo(pname=proj1, basepath=untagged_repo, git_cache=False)
+
+
 def test_polytime_p1(ok_repo, untagged_repo, no_repo, today):
     ## OK REPO
 
@@ -240,11 +421,26 @@ def test_polytime_BAD_no_git_cmd(ok_repo, monkeypatch, today):
     monkeypatch.setenv('PATH', '')
 
     with pytest.raises(FileNotFoundError):
-        pvlib.polytime(basepath=ok_repo)
-    d = pvlib.polytime(no_raise=True, basepath=ok_repo)
+        pvlib.polytime(basepath=ok_repo, git_cache=False)
+    d = pvlib.polytime(no_raise=True, basepath=ok_repo, git_cache=False)
     assert d.startswith(today)
 
 
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason="No module `__getattr__()` before PY37.")
+def test_lazy_version_attrs(monkeypatch):
+    monkeypatch.setenv('PYTHONPATH', osp.dirname(osp.dirname(pvlib.__file__)))
+    code = ("import polyversion as pv; "
+            "assert '__version__' not in vars(pv); "
+            "assert pv.__version__ is vars(pv)['__version__']; "
+            "print(pv.__version__, pv.__updated__)")
+    out = sbp.check_output([sys.executable, '-c', code]).decode('utf-8')
+    assert out.split()[0] == pvlib.__version__
+
+    with pytest.raises(AttributeError, match="has no attribute 'foo'"):
+        pvlib.foo
+
+
 ##############
 ##   MAIN   ##
 ##############
@@ -313,3 +509,26 @@ def test_MAIN_polyversions(ok_repo, untagged_repo, no_repo, capsys, caplog):
     out, err = capsys.readouterr()
     assert out == 'foo: \nbar: \n'
     #assert caplog.records()
+
+
+def test_git_capabilities(tmpdir, monkeypatch, no_git):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+    monkeypatch.setattr(pvlib, '_git_caps_memo', {})
+
+    caps = pvlib.git_capabilities()
+    assert caps.version == pvlib._git_version()
+    assert caps.multi_match == (caps.version[:2] >= (2, 15))
+    assert caps.path and caps.mtime and caps.size
+    assert pvlib.git_capabilities() is caps
+    assert (tmpdir / 'polyversion' / 'git-caps').check()
+
+    ## Cached on disk.
+    monkeypatch.setattr(pvlib, '_my_run', no_git)
+    monkeypatch.setattr(pvlib, '_git_caps_memo', {})
+    assert pvlib.git_capabilities() == caps
+
+    ## Keyed by binary-identity.
+    monkeypatch.setattr(pvlib, '_git_caps_memo', {})
+    monkeypatch.setattr(pvlib, '_which_git', lambda: str(tmpdir / 'polyversion'))
+    with pytest.raises(AssertionError, match='Forked git'):
+        pvlib.git_capabilities()
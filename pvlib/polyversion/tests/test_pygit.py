@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+import pytest
+
+import polyversion as pvlib
+import subprocess as sbp
+
+from polyversion import pygit
+
+from .conftest import _exec_cmds
+
+
+def _git(*args):
+    return sbp.check_output(('git', ) + args).decode('utf-8').strip()
+
+
+@pytest.fixture(scope='module')
+def merges_repo(tmpdir_factory):
+    """A repo with branches, merges, same-commit & lightweight tags."""
+    repo_dir = tmpdir_factory.mktemp('merges')
+    repo_dir.chdir()
+    _exec_cmds("""
+    git init
+    git config user.email "test@example.com"
+    git config user.name "Testing Bot"
+    git commit --allow-empty  --no-edit -m c1
+    git tag proj-v0.0.0 -m annotated
+    git tag other-v1.0.0 -m annotated
+    git commit --allow-empty  --no-edit -m c2
+    git checkout -b feat
+    git commit --allow-empty  --no-edit -m f1
+    git tag proj-v0.1.0 -m annotated
+    git commit --allow-empty  --no-edit -m f2
+    git tag proj-v0.1.1
+    git checkout -
+    git commit --allow-empty  --no-edit -m c3
+    git tag proj-v0.0.1 -m annotated
+    git tag proj-r0.0.1 -m annotated
+    git merge --no-ff --no-edit feat
+    git commit --allow-empty  --no-edit -m c4
+    """)
+
+    return repo_dir
+
+
+def _assert_same_as_git(repo, patterns, tags=False):
+    repo.chdir()
+    cmd = ['describe'] + ['--match=%s' % p for p in patterns]
+    if tags:
+        cmd.append('--tags')
+    exp = _git(*cmd)
+    with pygit.PyGit(repo) as pg:
+        assert pg.describe(patterns, tags=tags) == exp
+
+    return exp
+
+
+@pytest.mark.parametrize('patterns, tags', [
+    (['proj-v*'], False),
+    (['proj-v*'], True),
+    (['proj-r*'], False),
+    (['proj-v*', 'proj-r*'], False),
+    (['other-v*'], False),
+    ([], False),
+    ([], True),
+])
+def test_describe_like_git(merges_repo, patterns, tags):
+    _assert_same_as_git(merges_repo, patterns, tags)
+
+    ## Again, after packing refs & objects (with deltas).
+    #
+    clone = merges_repo.dirpath() / ('packed-%s-%s' % (len(patterns), tags))
+    if not clone.check():
+        merges_repo.chdir()
+        _exec_cmds("""
+        git clone -q --no-local . %s
+        git -C %s gc -q --aggressive
+        """ % (clone, clone))
+    _assert_same_as_git(clone, patterns, tags)
+
+
+def test_describe_exact_and_dates(merges_repo):
+    merges_repo.chdir()
+    _exec_cmds("git checkout -q proj-v0.1.0")
+    try:
+        assert _assert_same_as_git(merges_repo, ['proj-v*']) == 'proj-v0.1.0'
+        exp = _git('log', '-n1', '--format=format:%cD')
+        with pygit.PyGit(merges_repo) as pg:
+            assert pg.head_commit_date() == exp
+    finally:
+        _exec_cmds("git checkout -q -")
+
+
+def test_describe_no_tags(merges_repo):
+    with pygit.PyGit(merges_repo) as pg:
+        with pytest.raises(pygit.PyGitError, match='No annotated tags'):
+            pg.describe(['foo-v*'])
+
+
+@pytest.mark.parametrize('tz, exp', [
+    (0, 'Thu, 1 Mar 2018 09:46:47 +0000'),
+    (200, 'Thu, 1 Mar 2018 11:46:47 +0200'),
+    (-1030, 'Wed, 28 Feb 2018 23:16:47 -1030'),
+])
+def test_rfc2822_date(tz, exp):
+    assert pygit.rfc2822_date(1519897607, tz) == exp
+
+
+def test_polyversion_engine(ok_repo, no_repo, monkeypatch, today, no_git):
+    exp = pvlib.polyversion(pname='proj1', basepath=ok_repo, git_cache=False)
+    monkeypatch.setattr(pvlib, '_my_run', no_git)
+
+    got = pvlib.polyversion(pname='proj1', basepath=ok_repo,
+                            git_cache=False, git_engine='python')
+    assert got == exp
+    got = pvlib.polytime(pname='proj1', basepath=ok_repo, git_engine='python')
+    assert got.startswith(today)
+
+    monkeypatch.setenv(pvlib.git_engine_envvar, 'python')
+    got = pvlib.polyversion(pname='proj1', basepath=ok_repo, git_cache=False)
+    assert got == exp
+
+    ## Fallback to `git` cmd.
+    #
+    with pytest.raises(AssertionError, match='Forked git'):
+        pvlib.polyversion(pname='proj1', basepath=no_repo, default_version=None)
+    with pytest.raises(AssertionError, match='Forked git'):
+        pvlib.polyversion(pname='proj1', basepath=ok_repo, git_cache=False,
+                          git_options='--all', default_version=None)
+
+    with pytest.raises(ValueError, match='Invalid `git_engine`'):
+        pvlib.polyversion(pname='proj1', basepath=ok_repo, git_engine='bad')
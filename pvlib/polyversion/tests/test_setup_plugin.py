@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 #
 import re
+import subprocess as sbp
 import sys
 
 import pytest
@@ -124,3 +125,34 @@ def test_build_on_release_check(cmd, check_enabled, rtagged, ex,
         out, err = capsys.readouterr()
         assert 'running %s' % cmd in out.strip()
         assert not err
+
+
+def test_version_module(vtags_repo, tmpdir, monkeypatch, no_git):
+    import polyversion as pvlib
+
+    repo = tmpdir / 'repo'
+    vtags_repo.chdir()
+    sbp.check_call(['git', 'clone', '-q', '.', str(repo)])
+    pkg_dir = repo / 'pypkg'
+    pkg_dir.ensure_dir()
+    (pkg_dir / '__init__.py').write('')
+    repo.chdir()
+
+    monkeypatch.setattr(sys, 'argv', ('setup.py', 'build_py'))
+    setuptools.setup(
+        name='pypkg',
+        polyversion={'mono_project': True, 'version_module': True},
+        setup_requires=['polyversion'],
+        packages=['pypkg'],
+    )
+    assert not (pkg_dir / pvlib.version_module_fname).check()
+
+    built_pkg = repo / 'build' / 'lib' / 'pypkg'
+    assert (built_pkg / pvlib.version_module_fname).check()
+
+    monkeypatch.setattr(pvlib, '_my_run', no_git)
+    info = pvlib.polyinfo(pname='pypkg', basepath=built_pkg)
+    assert info.version.startswith('0.0.1+1.g')
+    assert info.pvtag.startswith('v0.0.1-1-g')
+    assert pvlib.polyversion(pname='pypkg', basepath=built_pkg) == info.version
+    assert pvlib.polytime(pname='pypkg', basepath=built_pkg) == info.cdate